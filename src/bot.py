@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+import sys
+from collections.abc import Awaitable
+from typing import Any
+
+from telegram.ext import (
+    AIORateLimiter,
+    Application,
+    BaseUpdateProcessor,
+    CommandHandler,
+    MessageHandler,
+    filters,
+)
 
 from handlers.admin import broadcast_command, debug_command, stats_command
 from handlers.channel_info import channelid_command
@@ -35,6 +46,10 @@ from handlers.verification import add_channel_command, channel_post_handler
 
 logger = logging.getLogger(__name__)
 
+# Updates processed at once across all chats. Handlers mostly wait on SQLite
+# and the Bot API, so this only needs to cover the chats active at any moment.
+MAX_CONCURRENT_UPDATES = 32
+
 
 def _safe_update_meta(update: object) -> dict[str, object]:
     """Extract minimal, non-content metadata for logging."""
@@ -65,18 +80,87 @@ async def error_handler(update: object, context) -> None:  # type: ignore[no-unt
     )
 
 
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """Process updates concurrently across chats, in order within a chat.
+
+    A slow handler in one chat no longer holds up every other chat, while
+    conversation state and selection context for a single chat still see
+    their updates one at a time.
+    """
+
+    __slots__ = ("_chat_locks", "_update_slots")
+
+    def __init__(self, max_concurrent_updates: int) -> None:
+        if max_concurrent_updates < 1:
+            raise ValueError("`max_concurrent_updates` must be a positive integer!")
+        # PTB's own semaphore is acquired before do_process_update, i.e. before
+        # the chat lock, so one flooding chat could fill it with updates queued
+        # on that chat. Leave it unbounded and apply the cap after the lock.
+        super().__init__(sys.maxsize)
+        self._update_slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        # chat key -> (lock, number of updates holding or waiting on it)
+        self._chat_locks: dict[object, tuple[asyncio.Lock, int]] = {}
+
+    @staticmethod
+    def _chat_key(update: object) -> object:
+        chat = getattr(update, "effective_chat", None)
+        if chat is not None:
+            return ("chat", chat.id)
+        user = getattr(update, "effective_user", None)
+        if user is not None:
+            return ("user", user.id)
+        return None
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = self._chat_key(update)
+        lock, users = self._chat_locks.get(key) or (asyncio.Lock(), 0)
+        self._chat_locks[key] = (lock, users + 1)
+        try:
+            async with lock, self._update_slots:
+                await coroutine
+        finally:
+            lock, users = self._chat_locks[key]
+            if users == 1:
+                del self._chat_locks[key]
+            else:
+                self._chat_locks[key] = (lock, users - 1)
+
+    async def initialize(self) -> None:
+        """Nothing to set up."""
+
+    async def shutdown(self) -> None:
+        """Nothing to tear down."""
+
+
 def create_application() -> Application:
     """Create and configure the Telegram Application."""
     token = os.getenv("TELEGRAM_BOT_TOKEN")
     if not token:
         raise RuntimeError("TELEGRAM_BOT_TOKEN not set")
 
-    application = Application.builder().token(token).build()
+    # Throttle all outgoing Bot API calls (command replies, scheduled posts,
+    # broadcasts) to Telegram's global and per-group limits.
+    # Updates from different chats run concurrently; see PerChatUpdateProcessor.
+    # All Bot API calls, including the scheduler's (main passes it
+    # application.bot), share this one bot and its pooled keep-alive HTTPX
+    # client, so sends reuse open TLS connections. Don't create other Bot
+    # instances for sending.
+    application = (
+        Application.builder()
+        .token(token)
+        .rate_limiter(AIORateLimiter())
+        .concurrent_updates(PerChatUpdateProcessor(MAX_CONCURRENT_UPDATES))
+        .build()
+    )
+
+    # Read-only replies don't need to hold up later updates from the same chat,
+    # so they run with block=False. Conversations and anything that writes
+    # selection/schedule state keep the default blocking dispatch.
 
     # Core user commands
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("gettimezone", gettimezone_command))
+    application.add_handler(CommandHandler("start", start_command, block=False))
+    application.add_handler(CommandHandler("help", help_command, block=False))
+    application.add_handler(CommandHandler("gettimezone", gettimezone_command, block=False))
     application.add_handler(CommandHandler("settimezone", settimezone_command))
 
     # Channel verification and management
@@ -86,7 +170,7 @@ def create_application() -> Application:
     application.add_handler(CommandHandler("removechannel", remove_channel_command))
 
     # Selection helpers
-    application.add_handler(CommandHandler("selection", selection_command))
+    application.add_handler(CommandHandler("selection", selection_command, block=False))
     application.add_handler(CommandHandler("selectchannel", selectchannel_command))
     application.add_handler(CommandHandler("selectschedule", selectschedule_command))
     application.add_handler(CommandHandler("clearselection", clearselection_command))
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import sqlite3
 from contextlib import asynccontextmanager
@@ -10,6 +11,9 @@ from typing import AsyncIterator
 
 import aiosqlite
 
+# Parent directories already created by get_database_path (one mkdir per path).
+_READY_DIRS: set[Path] = set()
+
 
 def get_database_path() -> Path:
     """Get the SQLite DB path (ensuring parent directory exists)."""
@@ -19,10 +23,25 @@ def get_database_path() -> Path:
         # Interpret relative paths as relative to project working directory.
         path = Path.cwd() / path
 
-    path.parent.mkdir(parents=True, exist_ok=True)
+    parent = path.parent
+    if parent not in _READY_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _READY_DIRS.add(parent)
     return path
 
 
+@functools.lru_cache(maxsize=8)
+def _extra_pragmas(raw: str) -> tuple[str, ...]:
+    """Turn "name=value;name=value" into PRAGMA statements."""
+    statements = []
+    for item in raw.split(";"):
+        name, sep, value = item.partition("=")
+        name, value = name.strip(), value.strip()
+        if sep and name and value:
+            statements.append(f"PRAGMA {name} = {value};")
+    return tuple(statements)
+
+
 @asynccontextmanager
 async def get_db() -> AsyncIterator[aiosqlite.Connection]:
     """Yield a DB connection with foreign keys enabled."""
@@ -30,6 +49,9 @@ async def get_db() -> AsyncIterator[aiosqlite.Connection]:
     try:
         async with aiosqlite.connect(db_path) as db:
             await db.execute("PRAGMA foreign_keys = ON;")
+            # Optional non-durable settings for tests/local dev (e.g. synchronous=OFF).
+            for statement in _extra_pragmas(os.getenv("SQLITE_PRAGMAS", "")):
+                await db.execute(statement)
             db.row_factory = aiosqlite.Row
             yield db
     except sqlite3.OperationalError as e:
@@ -10,6 +10,8 @@ import secrets
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
+import aiosqlite
+
 from .connection import get_db, transaction
 from .time import to_sqlite_timestamp
 
@@ -31,7 +33,11 @@ async def upsert_user(
     last_name: str | None,
     is_admin: bool = False,
 ) -> dict[str, Any]:
-    """Insert user if missing; otherwise update metadata and last_active_at."""
+    """Insert user if missing; otherwise update metadata and last_active_at.
+
+    The returned row also carries `has_selection` (whether a channel or
+    schedule is selected), so callers can skip a selection lookup.
+    """
     async with transaction() as db:
         await db.execute(
             """
@@ -46,10 +52,23 @@ async def upsert_user(
             (user_id, username, first_name, last_name, int(is_admin)),
         )
 
-        cursor = await db.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+        cursor = await db.execute(
+            """
+            SELECT u.*,
+                   EXISTS(
+                       SELECT 1 FROM user_context uc
+                       WHERE uc.user_id = u.id
+                         AND (uc.selected_channel_id IS NOT NULL OR uc.selected_schedule_id IS NOT NULL)
+                   ) AS has_selection
+            FROM users u
+            WHERE u.id = ?
+            """,
+            (user_id,),
+        )
         row = await cursor.fetchone()
         user = _row_to_dict(row)
         assert user is not None
+        user["has_selection"] = bool(user["has_selection"])
         return user
 
 
@@ -135,36 +154,49 @@ async def get_user_context(user_id: int) -> dict[str, Any]:
         return dict(row)
 
 
+_USER_CONTEXT_DETAILS_SQL = """
+    SELECT
+      uc.selected_channel_id,
+      uc.selected_schedule_id,
+      c.channel_id AS telegram_channel_id,
+      c.channel_name AS channel_name,
+      s.name AS schedule_name,
+      s.state AS schedule_state
+    FROM user_context uc
+    LEFT JOIN channels c ON uc.selected_channel_id = c.id
+    LEFT JOIN schedules s ON uc.selected_schedule_id = s.id
+    WHERE uc.user_id = ?
+"""
+
+_UPSERT_USER_CONTEXT_SQL = """
+    INSERT INTO user_context (user_id, selected_channel_id, selected_schedule_id)
+    VALUES (?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+      selected_channel_id = excluded.selected_channel_id,
+      selected_schedule_id = excluded.selected_schedule_id,
+      updated_at = CURRENT_TIMESTAMP
+"""
+
+
+async def _fetch_user_context_details(db: aiosqlite.Connection, user_id: int) -> dict[str, Any]:
+    cursor = await db.execute(_USER_CONTEXT_DETAILS_SQL, (user_id,))
+    row = await cursor.fetchone()
+    if row is None:
+        return {
+            "selected_channel_id": None,
+            "selected_schedule_id": None,
+            "telegram_channel_id": None,
+            "channel_name": None,
+            "schedule_name": None,
+            "schedule_state": None,
+        }
+    return dict(row)
+
+
 async def get_user_context_details(user_id: int) -> dict[str, Any]:
     """Get per-user selection context with display details (best-effort)."""
     async with get_db() as db:
-        cursor = await db.execute(
-            """
-            SELECT
-              uc.selected_channel_id,
-              uc.selected_schedule_id,
-              c.channel_id AS telegram_channel_id,
-              c.channel_name AS channel_name,
-              s.name AS schedule_name,
-              s.state AS schedule_state
-            FROM user_context uc
-            LEFT JOIN channels c ON uc.selected_channel_id = c.id
-            LEFT JOIN schedules s ON uc.selected_schedule_id = s.id
-            WHERE uc.user_id = ?
-            """,
-            (user_id,),
-        )
-        row = await cursor.fetchone()
-        if row is None:
-            return {
-                "selected_channel_id": None,
-                "selected_schedule_id": None,
-                "telegram_channel_id": None,
-                "channel_name": None,
-                "schedule_name": None,
-                "schedule_state": None,
-            }
-        return dict(row)
+        return await _fetch_user_context_details(db, user_id)
 
 
 async def set_user_context(
@@ -172,25 +204,21 @@ async def set_user_context(
     user_id: int,
     selected_channel_id: int | None,
     selected_schedule_id: int | None,
-) -> None:
-    """Upsert per-user selection context."""
+) -> dict[str, Any]:
+    """Upsert per-user selection context and return the new selection details.
+
+    The details are read back on the same connection, so callers rendering a
+    selection footer don't need a separate get_user_context_details call.
+    """
     async with transaction() as db:
-        await db.execute(
-            """
-            INSERT INTO user_context (user_id, selected_channel_id, selected_schedule_id)
-            VALUES (?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET
-              selected_channel_id = excluded.selected_channel_id,
-              selected_schedule_id = excluded.selected_schedule_id,
-              updated_at = CURRENT_TIMESTAMP
-            """,
-            (user_id, selected_channel_id, selected_schedule_id),
-        )
+        await db.execute(_UPSERT_USER_CONTEXT_SQL, (user_id, selected_channel_id, selected_schedule_id))
+        return await _fetch_user_context_details(db, user_id)
 
 
 async def clear_user_context(user_id: int) -> None:
     """Clear current channel/schedule selection for a user."""
-    await set_user_context(user_id=user_id, selected_channel_id=None, selected_schedule_id=None)
+    async with transaction() as db:
+        await db.execute(_UPSERT_USER_CONTEXT_SQL, (user_id, None, None))
 
 
 # --- Forwarding allowlist ----------------------------------------------------
@@ -343,6 +371,36 @@ async def create_schedule(
         return schedule
 
 
+async def create_and_select_schedule(
+    *,
+    user_id: int,
+    channel_db_id: int,
+    name: str,
+    pattern: dict[str, Any],
+    timezone_name: str = "UTC",
+    state: str = "paused",
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Create a schedule and make it the user's selection in one transaction.
+
+    Returns (schedule, selection details).
+    """
+    async with transaction() as db:
+        cursor = await db.execute(
+            """
+            INSERT INTO schedules (channel_id, name, pattern, timezone, state)
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING *
+            """,
+            (channel_db_id, name, json.dumps(pattern), timezone_name, state),
+        )
+        rows = await cursor.fetchall()
+        schedule = dict(rows[0])
+        schedule["pattern"] = json.loads(schedule["pattern"])
+        await db.execute(_UPSERT_USER_CONTEXT_SQL, (user_id, channel_db_id, int(schedule["id"])))
+        details = await _fetch_user_context_details(db, user_id)
+        return schedule, details
+
+
 async def get_schedule(schedule_id: int) -> dict[str, Any] | None:
     """Get schedule by ID with parsed JSON pattern."""
     async with get_db() as db:
@@ -484,6 +542,66 @@ async def delete_schedule(schedule_id: int) -> None:
         await db.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
 
 
+async def update_schedule_state_for_user(
+    user_id: int,
+    schedule_id: int,
+    state: str,
+    *,
+    select: bool = False,
+) -> dict[str, Any] | None:
+    """Update state of a schedule owned by user_id in a single transaction.
+
+    If select is true, the schedule also becomes the user's selection.
+    Returns the user's selection details afterwards, or None if the schedule
+    does not exist or is not owned by user_id.
+    """
+    async with transaction() as db:
+        cursor = await db.execute(
+            """
+            UPDATE schedules
+            SET state = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND channel_id IN (SELECT id FROM channels WHERE user_id = ?)
+            RETURNING channel_id
+            """,
+            (state, schedule_id, user_id),
+        )
+        rows = await cursor.fetchall()
+        if not rows:
+            return None
+        if select:
+            await db.execute(_UPSERT_USER_CONTEXT_SQL, (user_id, int(rows[0]["channel_id"]), schedule_id))
+        return await _fetch_user_context_details(db, user_id)
+
+
+async def delete_schedule_for_user(
+    user_id: int,
+    schedule_id: int,
+    *,
+    select: bool = False,
+) -> dict[str, Any] | None:
+    """Delete a schedule owned by user_id in a single transaction.
+
+    If select is true, the schedule's channel becomes the user's selection.
+    Returns the user's selection details afterwards, or None if the schedule
+    does not exist or is not owned by user_id.
+    """
+    async with transaction() as db:
+        cursor = await db.execute(
+            """
+            DELETE FROM schedules
+            WHERE id = ? AND channel_id IN (SELECT id FROM channels WHERE user_id = ?)
+            RETURNING channel_id
+            """,
+            (schedule_id, user_id),
+        )
+        rows = await cursor.fetchall()
+        if not rows:
+            return None
+        if select:
+            await db.execute(_UPSERT_USER_CONTEXT_SQL, (user_id, int(rows[0]["channel_id"]), None))
+        return await _fetch_user_context_details(db, user_id)
+
+
 # --- Queue ------------------------------------------------------------------
 
 
@@ -643,19 +761,91 @@ async def get_next_queued_post(schedule_id: int) -> dict[str, Any] | None:
         return _row_to_dict(row)
 
 
-async def get_queued_posts(schedule_id: int, *, limit: int = 10, offset: int = 0) -> list[dict[str, Any]]:
-    """Get posts from queue in FIFO order."""
+# Stay well under SQLite's bound-parameter limit on older builds (999).
+_IN_CLAUSE_CHUNK = 500
+
+# Every character str.isspace() accepts, so SQL TRIM(x, _WHITESPACE) matches
+# Python's str.strip() (plain TRIM only removes ASCII spaces).
+_WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004"
+    "\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
+
+async def get_next_queued_posts_bulk(schedule_ids: list[int]) -> dict[int, dict[str, Any]]:
+    """Get the next post (lowest position) for each schedule, keyed by schedule id.
+
+    Schedules with an empty queue are absent from the result.
+    """
+    posts: dict[int, dict[str, Any]] = {}
+    if not schedule_ids:
+        return posts
+    async with get_db() as db:
+        for start in range(0, len(schedule_ids), _IN_CLAUSE_CHUNK):
+            chunk = schedule_ids[start : start + _IN_CLAUSE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await db.execute(
+                f"""
+                SELECT q.*
+                FROM queued_posts q
+                JOIN (
+                    SELECT schedule_id, MIN(position) AS position
+                    FROM queued_posts
+                    WHERE schedule_id IN ({placeholders})
+                    GROUP BY schedule_id
+                ) m ON q.schedule_id = m.schedule_id AND q.position = m.position
+                ORDER BY q.id ASC
+                """,
+                chunk,
+            )
+            for row in await cursor.fetchall():
+                posts.setdefault(int(row["schedule_id"]), dict(row))
+    return posts
+
+
+async def get_queued_posts(
+    schedule_id: int,
+    *,
+    limit: int = 10,
+    offset: int = 0,
+    caption_preview_len: int | None = None,
+) -> list[dict[str, Any]]:
+    """Get posts from queue in FIFO order.
+
+    If caption_preview_len is set, `caption` is stripped (same whitespace as
+    str.strip()) and cut to that many characters in SQL, and `caption_length`
+    holds the full stripped length.
+    """
     async with get_db() as db:
-        cursor = await db.execute(
-            """
-            SELECT *
-            FROM queued_posts
-            WHERE schedule_id = ?
-            ORDER BY position ASC
-            LIMIT ? OFFSET ?
-            """,
-            (schedule_id, limit, offset),
-        )
+        if caption_preview_len is None:
+            cursor = await db.execute(
+                """
+                SELECT *
+                FROM queued_posts
+                WHERE schedule_id = ?
+                ORDER BY position ASC
+                LIMIT ? OFFSET ?
+                """,
+                (schedule_id, limit, offset),
+            )
+        else:
+            cursor = await db.execute(
+                """
+                SELECT
+                    id, schedule_id, file_id, file_path, media_type,
+                    SUBSTR(TRIM(caption, ?), 1, ?) AS caption,
+                    LENGTH(TRIM(caption, ?)) AS caption_length,
+                    caption_parse_mode, caption_entities,
+                    forward_from_chat_id, forward_from_message_id,
+                    forward_origin_chat_id, forward_origin_message_id,
+                    media_group_data, position, retry_count, scheduled_for, created_at
+                FROM queued_posts
+                WHERE schedule_id = ?
+                ORDER BY position ASC
+                LIMIT ? OFFSET ?
+                """,
+                (_WHITESPACE, caption_preview_len, _WHITESPACE, schedule_id, limit, offset),
+            )
         rows = await cursor.fetchall()
         return [dict(r) for r in rows]
 
@@ -677,6 +867,40 @@ async def get_queued_posts_unscheduled(schedule_id: int, *, limit: int) -> list[
         return [dict(r) for r in rows]
 
 
+async def get_queued_posts_unscheduled_bulk(
+    schedule_ids: list[int], *, per_schedule_limit: int
+) -> dict[int, list[dict[str, Any]]]:
+    """Get up to `per_schedule_limit` unscheduled queued posts per schedule, in FIFO order.
+
+    Keyed by schedule id; schedules without such posts are absent.
+    """
+    posts: dict[int, list[dict[str, Any]]] = {}
+    if not schedule_ids or per_schedule_limit <= 0:
+        return posts
+    async with get_db() as db:
+        for start in range(0, len(schedule_ids), _IN_CLAUSE_CHUNK):
+            chunk = schedule_ids[start : start + _IN_CLAUSE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await db.execute(
+                f"""
+                SELECT *
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY schedule_id ORDER BY position ASC) AS rn
+                    FROM queued_posts
+                    WHERE schedule_id IN ({placeholders}) AND scheduled_for IS NULL
+                )
+                WHERE rn <= ?
+                ORDER BY schedule_id, rn
+                """,
+                (*chunk, per_schedule_limit),
+            )
+            for row in await cursor.fetchall():
+                post = dict(row)
+                del post["rn"]
+                posts.setdefault(int(post["schedule_id"]), []).append(post)
+    return posts
+
+
 async def get_queue_count(schedule_id: int) -> int:
     """Count posts in a schedule queue."""
     async with get_db() as db:
@@ -805,25 +1029,45 @@ async def create_verification_code(*, user_id: int, telegram_channel_id: str) ->
 
 async def verify_code(*, code: str, telegram_channel_id: str) -> int | None:
     """Verify code and mark as used. Returns user_id if valid."""
+    matched = await verify_codes_bulk([code], telegram_channel_id=telegram_channel_id)
+    return matched[1] if matched is not None else None
+
+
+async def verify_codes_bulk(codes: list[str], *, telegram_channel_id: str) -> tuple[str, int] | None:
+    """Verify the first valid code among candidates and mark it as used.
+
+    Returns (code, user_id) for the earliest candidate in `codes` that is a
+    live code for the channel, or None. One query regardless of how many
+    candidates are given.
+    """
+    if not codes:
+        return None
+    # Candidates carry their position so SQLite picks the earliest match;
+    # repeated candidates are harmless.
+    values = ",".join("(?, ?)" for _ in codes)
+    params = [p for i, code in enumerate(codes) for p in (code, i)]
     async with transaction() as db:
         cursor = await db.execute(
-            """
-            SELECT user_id
-            FROM verification_codes
-            WHERE code = ?
-              AND channel_id = ?
-              AND used = FALSE
-              AND expires_at > CURRENT_TIMESTAMP
+            f"""
+            WITH candidates(code, ord) AS (VALUES {values})
+            SELECT v.code, v.user_id
+            FROM verification_codes v
+            JOIN candidates c ON c.code = v.code
+            WHERE v.channel_id = ?
+              AND v.used = FALSE
+              AND v.expires_at > CURRENT_TIMESTAMP
+            ORDER BY c.ord
+            LIMIT 1
             """,
-            (code, telegram_channel_id),
+            (*params, telegram_channel_id),
         )
         row = await cursor.fetchone()
         if row is None:
             return None
 
-        user_id = int(row[0])  # type: ignore[index]
+        code, user_id = str(row[0]), int(row[1])
         await db.execute("UPDATE verification_codes SET used = TRUE WHERE code = ?", (code,))
-        return user_id
+        return code, user_id
 
 
 async def cleanup_expired_codes() -> None:
@@ -17,6 +17,11 @@ from handlers.common import ensure_user_record, get_admin_user_id
 
 logger = logging.getLogger(__name__)
 
+# Broadcast sends in flight at once. Throughput is still capped by the
+# application's AIORateLimiter (Telegram's ~30 msg/s global limit); this
+# only lets network round-trips overlap instead of running back to back.
+BROADCAST_CONCURRENCY = 25
+
 
 def _utf16_len(text: str) -> int:
     # Telegram entity offsets/lengths are in UTF-16 code units.
@@ -201,21 +206,24 @@ async def broadcast_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         f"Broadcasting to {len(users)} users (active since {since.date().isoformat()} UTC)..."
     )
 
-    ok = 0
-    failed = 0
-    for u in users:
-        user_id = int(u["id"])
-        try:
-            await context.bot.send_message(
-                chat_id=user_id,
-                text=payload_text,
-                entities=payload_entities,
-            )
-            ok += 1
-        except Exception as e:
-            failed += 1
-            logger.error("Broadcast failed for user_id=%s: %s", user_id, e, exc_info=True)
-        await asyncio.sleep(0.05)
+    limit = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+    async def send_one(user_id: int) -> bool:
+        async with limit:
+            try:
+                await context.bot.send_message(
+                    chat_id=user_id,
+                    text=payload_text,
+                    entities=payload_entities,
+                )
+                return True
+            except Exception as e:
+                logger.error("Broadcast failed for user_id=%s: %s", user_id, e, exc_info=True)
+                return False
+
+    results = await asyncio.gather(*(send_one(int(u["id"])) for u in users))
+    ok = sum(results)
+    failed = len(results) - ok
 
     await update.message.reply_text(f"Broadcast complete. Success: {ok}. Failed: {failed}.")
 
@@ -18,7 +18,7 @@ from telegram.ext import (
 )
 
 from database import queries as db
-from handlers.common import ensure_user_record
+from handlers.common import ensure_user_record_cached, parse_int
 from handlers.selection import selection_segments
 from utils.tg_text import Segment, render
 
@@ -27,6 +27,11 @@ logger = logging.getLogger(__name__)
 
 SELECTING_CAPTION_MODE, WAITING_SINGLE_CAPTION, COLLECTING_MEDIA, CONFIRMING = range(4)
 
+_CAPTION_MODES = frozenset({"preserve", "remove", "single"})
+# Backwards-compatible aliases for "single" (older prompts used these).
+_SINGLE_CAPTION_ALIASES = frozenset({"markdown", "markdownv2", "md", "md2", "html"})
+_CONFIRM_ANSWERS = frozenset({"yes", "no"})
+
 
 @dataclass(frozen=True)
 class _CollectedItem:
@@ -50,7 +55,7 @@ def _state_clear(context: ContextTypes.DEFAULT_TYPE) -> None:
 
 def _get_caption_mode(context: ContextTypes.DEFAULT_TYPE) -> str | None:
     mode = context.user_data.get("bulk_caption_mode")
-    if mode in {"preserve", "remove", "single"}:
+    if mode in _CAPTION_MODES:
         return str(mode)
     return None
 
@@ -349,7 +354,7 @@ def _finalize_media_group_items(
 
 async def bulk_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Entry point for /bulk <schedule_id>."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
 
     if update.message is None or update.effective_user is None:
         return ConversationHandler.END
@@ -360,15 +365,17 @@ async def bulk_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
     schedule_id: int | None = None
     used_selected = False
+    # Selection details come from the lookup (no id given) or from
+    # set_user_context (explicit id) and are reused for the footer.
+    details: dict = {}
     if context.args and len(context.args) == 1:
-        try:
-            schedule_id = int(context.args[0])
-        except ValueError:
+        schedule_id = parse_int(context.args[0])
+        if schedule_id is None:
             await update.message.reply_text("Invalid schedule id.")
             return ConversationHandler.END
     else:
-        user_ctx = await db.get_user_context(update.effective_user.id)
-        raw = user_ctx.get("selected_schedule_id")
+        details = await db.get_user_context_details(update.effective_user.id)
+        raw = details.get("selected_schedule_id")
         schedule_id = int(raw) if raw is not None else None
         used_selected = True
 
@@ -385,7 +392,7 @@ async def bulk_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         return ConversationHandler.END
 
     if not used_selected:
-        await db.set_user_context(
+        details = await db.set_user_context(
             user_id=update.effective_user.id,
             selected_channel_id=int(schedule["channel_id"]),
             selected_schedule_id=schedule_id,
@@ -394,7 +401,6 @@ async def bulk_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     _state_clear(context)
     context.user_data["bulk_schedule_id"] = schedule_id
 
-    details = await db.get_user_context_details(update.effective_user.id)
     segments = [
         Segment("Bulk upload started for schedule "),
         Segment(str(schedule_id), code=True),
@@ -418,15 +424,15 @@ async def bulk_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 async def bulk_set_caption_mode(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
     raw = (update.message.text or "").strip().lower()
     # Backwards-compatible aliases (older prompts used these).
-    if raw in {"markdown", "markdownv2", "md", "md2", "html"}:
+    if raw in _SINGLE_CAPTION_ALIASES:
         raw = "single"
-    if raw not in {"preserve", "remove", "single"}:
+    if raw not in _CAPTION_MODES:
         await update.message.reply_text("Invalid caption mode. Reply with: preserve, remove, single")
         return SELECTING_CAPTION_MODE
 
@@ -444,7 +450,7 @@ async def bulk_set_caption_mode(update: Update, context: ContextTypes.DEFAULT_TY
 
 
 async def bulk_set_single_caption(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
@@ -478,7 +484,7 @@ async def bulk_set_single_caption(update: Update, context: ContextTypes.DEFAULT_
 
 async def bulk_collect_media(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Collect media messages into an in-memory list until /done."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
 
     if update.message is None or update.effective_user is None:
         return ConversationHandler.END
@@ -611,7 +617,7 @@ async def _flush_media_group(context: ContextTypes.DEFAULT_TYPE, *, group_id: st
 
 async def bulk_done(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Finalize collection and ask for confirmation."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
@@ -648,12 +654,12 @@ async def bulk_done(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 async def bulk_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None or update.effective_user is None:
         return ConversationHandler.END
 
     text = (update.message.text or "").strip().lower()
-    if text not in {"yes", "no"}:
+    if text not in _CONFIRM_ANSWERS:
         await update.message.reply_text("Reply 'yes' to confirm or 'no' to cancel.")
         return CONFIRMING
 
@@ -698,7 +704,7 @@ async def bulk_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
 
 async def bulk_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     _state_clear(context)
     if update.message:
         await update.message.reply_text("Cancelled.")
@@ -2,17 +2,44 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
-from typing import TYPE_CHECKING
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from database import queries as db
+from utils.tg_text import Segment, render
 
 logger = logging.getLogger(__name__)
 
+# Re-upsert a user at most this often from cached call sites, so
+# last_active_at/profile fields stay reasonably fresh without a write per command.
+ENSURE_USER_TTL_SECONDS = 300.0
+_ENSURED_USERS_MAX = 4096
+
+_ensured_user_ids: OrderedDict[int, float] = OrderedDict()
+
+# Timezone arguments that mean "fall back to the default", for /settimezone and /setscheduletimezone.
+RESET_TIMEZONE_WORDS = frozenset({"default", "reset", "clear"})
+
+# Reply shared by /settimezone and the schedule timezone steps: prefix + code(name) + suffix.
+UNKNOWN_TIMEZONE = render([Segment("Unknown timezone: ")])
+UNKNOWN_TIMEZONE_SUFFIX = render(
+    [
+        Segment("\nUse an IANA timezone name like "),
+        Segment("Europe/Amsterdam", code=True),
+        Segment(", "),
+        Segment("UTC", code=True),
+        Segment("."),
+    ]
+)
+
 
 def get_admin_user_id() -> int | None:
     """Get the configured admin user id, if present."""
@@ -26,6 +53,16 @@ def get_admin_user_id() -> int | None:
         return None
 
 
+def parse_int(text: str) -> int | None:
+    """Parse an optionally signed integer argument, or None if it isn't one."""
+    # Validate up front so mistyped input doesn't pay for a raised ValueError.
+    s = text.strip()
+    body = s[1:] if s[:1] in ("+", "-") else s
+    if not body.isdecimal():
+        return None
+    return int(s)
+
+
 async def ensure_user_record(update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
     """Upsert the current user and mark last_active_at."""
     user = update.effective_user
@@ -44,6 +81,40 @@ async def ensure_user_record(update: Update, context: ContextTypes.DEFAULT_TYPE)
     )
 
 
+async def ensure_user_record_cached(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Like ensure_user_record, but skip the upsert if it ran for this user within ENSURE_USER_TTL_SECONDS."""
+    user = update.effective_user
+    if user is None:
+        return
+
+    now = time.monotonic()
+    ensured_at = _ensured_user_ids.get(user.id)
+    if ensured_at is not None and now - ensured_at < ENSURE_USER_TTL_SECONDS:
+        return
+
+    await ensure_user_record(update, context)
+    _ensured_user_ids[user.id] = now
+    _ensured_user_ids.move_to_end(user.id)
+    while len(_ensured_user_ids) > _ENSURED_USERS_MAX:
+        _ensured_user_ids.popitem(last=False)
+
+
+def requires_user(
+    handler: Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[Any]],
+) -> Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[Any]]:
+    """Decorate a command handler: require a message and user, and ensure the user record (cached)."""
+
+    @functools.wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+        if update.message is None or update.effective_user is None:
+            return None
+
+        await ensure_user_record_cached(update, context)
+        return await handler(update, context)
+
+    return wrapper
+
+
 if TYPE_CHECKING:  # pragma: no cover
     # For type-checkers only; avoids unused import warnings at runtime.
     _ = ContextTypes.DEFAULT_TYPE
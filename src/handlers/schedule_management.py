@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-import os
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 
 from telegram import Update
 from telegram.ext import (
@@ -17,11 +20,22 @@ from telegram.ext import (
 
 from database import access as db_access
 from database import queries as db
-from handlers.common import ensure_user_record
-from handlers.selection import selection_segments
+from handlers.common import (
+    RESET_TIMEZONE_WORDS,
+    UNKNOWN_TIMEZONE,
+    UNKNOWN_TIMEZONE_SUFFIX,
+    ensure_user_record_cached,
+    parse_int,
+)
+from handlers.selection import selection_segments, selection_segments_from
 from handlers.verification import resolve_channel_id
-from scheduler.timing import WEEKDAY_NAME_TO_INT, parse_time_string, validate_schedule_pattern
-from utils.tg_text import Segment, render
+from scheduler.timing import (
+    WEEKDAY_NAME_TO_INT,
+    default_timezone_name,
+    is_valid_timezone,
+    validate_schedule_pattern,
+)
+from utils.tg_text import Segment, render, render_after
 
 logger = logging.getLogger(__name__)
 
@@ -46,94 +60,252 @@ logger = logging.getLogger(__name__)
     ES_WAIT_WEEKLY_TIMES,
 ) = range(7)
 
+# Conversation keys in context.user_data (cleared on finish/cancel).
+_NS_KEYS = ("ns_channel_db_id", "ns_channel_name", "ns_timezone", "ns_name", "ns_type", "ns_days")
+_ES_KEYS = ("es_schedule_id", "es_current_name", "es_current_pattern", "es_timezone", "es_type", "es_days")
 
-def _default_timezone_name() -> str:
-    return os.getenv("DEFAULT_TIMEZONE", "UTC") or "UTC"
 
+_INTERVAL_RE = re.compile(r"(\d+)([hm]?)")
 
-async def _effective_user_timezone_name(user_id: int) -> str:
-    tz = await db.get_user_timezone(user_id)
-    return tz or _default_timezone_name()
 
+def _csv_list_re(item: str) -> re.Pattern[str]:
+    """Regex for a comma-separated list of `item` (blank entries allowed)."""
+    entry = rf"\s*(?:(?:{item})\s*)?"
+    return re.compile(rf"{entry}(?:,{entry})*", re.ASCII | re.IGNORECASE)
 
-def _is_valid_timezone_name(tz_name: str) -> bool:
-    if tz_name.upper() in {"UTC", "ETC/UTC"}:
-        return True
-    try:
-        ZoneInfo(tz_name)
-        return True
-    except ZoneInfoNotFoundError:
-        return False
-    except Exception:
-        return False
 
+# Whole-input validators (fullmatch) plus item extractors (finditer); no split lists.
+_TIME_RE = re.compile(r"(\d{1,2})\s*:\s*(\d{1,2})", re.ASCII)
+_TIMES_CSV_RE = _csv_list_re(_TIME_RE.pattern)
+_WEEKDAY_RE = re.compile("|".join(WEEKDAY_NAME_TO_INT), re.IGNORECASE)
+_WEEKDAYS_CSV_RE = _csv_list_re(_WEEKDAY_RE.pattern)
 
-def _parse_schedule_id(text: str) -> int | None:
-    try:
-        return int(text.strip())
-    except ValueError:
-        return None
+# Static reply text shared by both conversations and the schedule commands.
+_SELECT_CHANNEL_TIP = (
+    "Tip: select a default channel first:\n"
+    "- /listchannels\n"
+    "- /selectchannel <channel_id>"
+)
+_SELECT_SCHEDULE_TIP = "Tip: select a default schedule with /selectschedule <schedule_id>."
+_SELECTED_CHANNEL_MISSING = (
+    "Your selected channel is missing or not owned by you.\n"
+    "Use /listchannels and /selectchannel again."
+)
+_INVALID_SCHEDULE_ID = "Invalid schedule id."
+_SCHEDULE_NOT_FOUND = "Schedule not found or not owned by you."
+_INVALID_TYPE = "Invalid type. Reply with: interval, daily, weekly"
+_INTERVAL_PROMPT = "Enter interval (examples: 1h, 30m, 90)."
+_INVALID_INTERVAL = "Invalid interval. Try: 1h, 30m, or 90"
+_WEEKDAYS_PROMPT = (
+    "Enter weekdays separated by commas.\n"
+    "Example: monday,tuesday,wednesday,thursday,friday\n"
+    "Tip: add times (HH:MM) on a second line to skip the next step."
+)
+_INVALID_WEEKDAYS = "Invalid weekdays. Use names like: monday,tuesday,wednesday"
+# Templates formatted with the conversation's timezone.
+_INVALID_TIMES = "Invalid times. Use HH:MM separated by commas (interpreted in {tz_name})."
+_NS_DAILY_TIMES_PROMPT = (
+    "Enter times in {tz_name} (HH:MM) separated by commas.\n"
+    "Example: 09:00,16:00\n"
+    "Tip: change your default timezone with /settimezone."
+)
+_NS_WEEKLY_TIMES_PROMPT = (
+    "Enter times in {tz_name} (HH:MM) separated by commas.\n"
+    "Example: 12:00\n"
+    "Tip: change your default timezone with /settimezone."
+)
+_ES_DAILY_TIMES_PROMPT = (
+    "Enter times in {tz_name} (HH:MM) separated by commas.\n"
+    "Example: 09:00,16:00\n"
+    "Tip: schedule timezone is set when the schedule is created."
+)
+_ES_WEEKLY_TIMES_PROMPT = (
+    "Enter times in {tz_name} (HH:MM) separated by commas.\n"
+    "Example: 12:00\n"
+    "Tip: schedule timezone is set when the schedule is created."
+)
+
+# Schedule type -> (prompt template, next conversation state).
+_NS_TYPE_PROMPTS: dict[str, tuple[str, int]] = {
+    "interval": (_INTERVAL_PROMPT, NS_WAIT_INTERVAL),
+    "daily": (_NS_DAILY_TIMES_PROMPT, NS_WAIT_DAILY_TIMES),
+    "weekly": (_WEEKDAYS_PROMPT, NS_WAIT_WEEKLY_DAYS),
+}
+_ES_TYPE_PROMPTS: dict[str, tuple[str, int]] = {
+    "interval": (_INTERVAL_PROMPT, ES_WAIT_INTERVAL),
+    "daily": (_ES_DAILY_TIMES_PROMPT, ES_WAIT_DAILY_TIMES),
+    "weekly": (_WEEKDAYS_PROMPT, ES_WAIT_WEEKLY_DAYS),
+}
+
+_USAGE_NEWSCHEDULE = (
+    "Usage: /newschedule <channel_id>\n"
+    "Example: /newschedule -1001234567890\n\n" + _SELECT_CHANNEL_TIP
+)
+_USAGE_LISTSCHEDULES = (
+    "Usage: /listschedules <channel_id>\n"
+    "Example: /listschedules -1001234567890\n\n" + _SELECT_CHANNEL_TIP
+)
+_USAGE_PAUSESCHEDULE = "Usage: /pauseschedule <schedule_id>\n" + _SELECT_SCHEDULE_TIP
+_USAGE_RESUMESCHEDULE = "Usage: /resumeschedule <schedule_id>\n" + _SELECT_SCHEDULE_TIP
+_USAGE_DELETESCHEDULE = "Usage: /deleteschedule <schedule_id>\n" + _SELECT_SCHEDULE_TIP
+_USAGE_EDITSCHEDULE = "Usage: /editschedule <schedule_id>\n" + _SELECT_SCHEDULE_TIP
+
+# Constant segment runs; only the dynamic values are allocated per reply.
+# Segment is a frozen dataclass, so these are safe to share between replies.
+_SEG_SCHEDULE = Segment("Schedule ")
+_SEG_NL_NL = Segment("\n\n")
+_SEG_DOT_NL_NL = Segment(".\n\n")
+_SEG_ROW_BULLET = Segment("- ")
+_SEG_CREATED_ID = Segment("Schedule created.\nID: ")
+_SEG_CREATED_CHANNEL = Segment("\nChannel: ")
+_SEG_CREATED_PATTERN = Segment("\nPattern: ")
+_SEG_CREATED_NEXT = Segment("\nState: paused\nNext steps: /resumeschedule ")
+_SEG_CREATED_QUEUE = Segment("\nQueue: /viewqueue ")
+_SEG_CREATED_BULK = Segment("\nAdd posts: /bulk ")
+_SEG_LIST_HEADER = Segment("Schedules for channel '")
+_SEG_LIST_HEADER_ID = Segment("' (")
+_SEG_LIST_HEADER_END = Segment("):\n")
+_SEG_LIST_TIP = Segment("\nTip: set a default schedule with /selectschedule ")
+_SETSCHEDULETIMEZONE_USAGE_PREFIX = render(
+    [
+        Segment("Usage: "),
+        Segment("/setscheduletimezone"),
+        Segment(" "),
+        Segment("<schedule_id>", code=True),
+        Segment(" "),
+        Segment("<timezone>", code=True),
+        Segment("\nTip: if you have a selected schedule, you can omit <schedule_id>:\n"),
+        Segment("/setscheduletimezone"),
+        Segment(" "),
+    ]
+)
+_SCHEDULE_PREFIX = render([_SEG_SCHEDULE])
+_NO_SCHEDULES_PREFIX = render([Segment("No schedules for this channel yet. Use /newschedule to create one.\n\n")])
+_TIMEZONE_UPDATED_SUFFIX = render(
+    [
+        _SEG_DOT_NL_NL,
+        Segment("Note: daily/weekly schedule times are interpreted in the schedule timezone.\n"),
+        Segment("Preview with "),
+        Segment("/testschedule"),
+        Segment("."),
+    ]
+)
 
 
-def _parse_int(text: str) -> int | None:
-    try:
-        return int(text.strip())
-    except ValueError:
-        return None
+async def _effective_user_timezone_name(user_id: int) -> str:
+    tz = await db.get_user_timezone(user_id)
+    return tz or default_timezone_name()
 
 
+# The input parsers are memoized (users repeat common inputs like "1h" or
+# "09:00,16:00"), so they return immutable tuples rather than lists.
+@functools.lru_cache(maxsize=256)
 def _parse_interval_input(text: str) -> tuple[int, int] | None:
     """Parse an interval like '1h', '30m', or '90' (minutes)."""
-    raw = text.strip().lower().replace(" ", "")
-    if not raw:
+    match = _INTERVAL_RE.fullmatch(text.strip().lower().replace(" ", ""))
+    if match is None:
         return None
-
-    if raw.endswith("h"):
-        n = _parse_int(raw[:-1])
-        if n is None or n <= 0:
-            return None
-        return n, 0
-
-    if raw.endswith("m"):
-        n = _parse_int(raw[:-1])
-        if n is None or n <= 0:
-            return None
-        return 0, n
-
-    n = _parse_int(raw)
-    if n is None or n <= 0:
+    n = int(match.group(1))
+    if n <= 0:
         return None
-    return 0, n
+    return (n, 0) if match.group(2) == "h" else (0, n)
 
 
-def _parse_times_csv(text: str) -> list[str] | None:
-    parts = [p.strip() for p in text.split(",") if p.strip()]
-    if not parts:
-        return None
-    if not all(parse_time_string(p) for p in parts):
+@functools.lru_cache(maxsize=256)
+def _parse_times_csv(text: str) -> tuple[str, ...] | None:
+    # Validate the whole list, then normalize each H:MM to HH:MM; any invalid entry rejects the input.
+    if _TIMES_CSV_RE.fullmatch(text) is None:
         return None
-    # Normalize to HH:MM
     normalized: list[str] = []
-    for p in parts:
-        hour, minute = parse_time_string(p) or (0, 0)
+    for match in _TIME_RE.finditer(text):
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if hour > 23 or minute > 59:
+            return None
         normalized.append(f"{hour:02d}:{minute:02d}")
-    return normalized
+    return tuple(normalized) or None
 
 
-def _parse_weekdays_csv(text: str) -> list[str] | None:
-    parts = [p.strip().lower() for p in text.split(",") if p.strip()]
-    if not parts:
-        return None
-    if not all(p in WEEKDAY_NAME_TO_INT for p in parts):
+@functools.lru_cache(maxsize=256)
+def _parse_weekdays_csv(text: str) -> tuple[str, ...] | None:
+    if _WEEKDAYS_CSV_RE.fullmatch(text) is None:
         return None
     # Preserve user order but de-duplicate
-    seen: set[str] = set()
-    result: list[str] = []
-    for p in parts:
-        if p not in seen:
-            seen.add(p)
-            result.append(p)
-    return result
+    return tuple(dict.fromkeys(m.group(0).lower() for m in _WEEKDAY_RE.finditer(text))) or None
+
+
+async def _parse_times_or_reply(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, tz_key: str, text: str
+) -> tuple[str, ...] | None:
+    """Parse an HH:MM list; on failure, reply with the error and return None."""
+    times = _parse_times_csv(text)
+    if times is None:
+        tz_name = str(context.user_data.get(tz_key) or default_timezone_name())
+        await update.message.reply_text(_INVALID_TIMES.format(tz_name=tz_name))
+    return times
+
+
+def _split_weekdays_and_times(text: str) -> tuple[str, str]:
+    """Split a "days\ntimes" reply into (days, times); times is "" when there is no times line.
+
+    A reply that parses as weekdays as a whole ("monday,\nfriday") is all days. Otherwise the
+    last line is the times line whenever the lines above it are valid weekdays, so a bad times
+    line is reported as such rather than as invalid weekdays.
+    """
+    days_text, _, times_text = text.rpartition("\n")
+    if days_text and _parse_weekdays_csv(text) is None and _parse_weekdays_csv(days_text) is not None:
+        return days_text, times_text
+    return text, ""
+
+
+@dataclass(frozen=True)
+class _PatternStep:
+    """A conversation reply that completes the pattern: parse it, or re-prompt with the error."""
+
+    parse: Callable[[str], tuple | None]
+    error: str  # formatted with tz_name
+    build: Callable[[tuple, list], dict]  # (parsed reply, stored weekdays) -> pattern
+
+
+_PATTERN_STEPS: dict[str, _PatternStep] = {
+    "interval": _PatternStep(
+        _parse_interval_input,
+        _INVALID_INTERVAL,
+        lambda v, _days: {"type": "interval", "hours": v[0], "minutes": v[1]},
+    ),
+    "daily": _PatternStep(_parse_times_csv, _INVALID_TIMES, lambda v, _days: {"type": "daily", "times": list(v)}),
+    "weekly": _PatternStep(
+        _parse_times_csv,
+        _INVALID_TIMES,
+        lambda v, days: {"type": "weekly", "days": days, "times": list(v)},
+    ),
+}
+
+_Finalize = Callable[[Update, ContextTypes.DEFAULT_TYPE, dict], Awaitable[int]]
+
+
+async def _pattern_step(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    step_name: str,
+    *,
+    prefix: str,
+    wait_state: int,
+    finalize: _Finalize,
+) -> int:
+    """Shared body of the interval/daily/weekly-times steps of both conversations."""
+    await ensure_user_record_cached(update, context)
+    if update.message is None:
+        return ConversationHandler.END
+
+    step = _PATTERN_STEPS[step_name]
+    parsed = step.parse(update.message.text or "")
+    if parsed is None:
+        tz_name = str(context.user_data.get(f"{prefix}_timezone") or default_timezone_name())
+        await update.message.reply_text(step.error.format(tz_name=tz_name))
+        return wait_state
+
+    pattern = step.build(parsed, context.user_data.get(f"{prefix}_days") or [])
+    return await finalize(update, context, pattern)
 
 
 def _pattern_summary(pattern: dict, *, tz_name: str | None = None) -> str:
@@ -153,21 +325,35 @@ def _pattern_summary(pattern: dict, *, tz_name: str | None = None) -> str:
     return "unknown"
 
 
+def _schedule_row(schedule: dict) -> tuple[Segment, ...]:
+    """Segments for one /listschedules line; only the id is styled."""
+    pattern = schedule.get("pattern") or {}
+    tz_name = str(schedule.get("timezone") or default_timezone_name())
+    return (
+        _SEG_ROW_BULLET,
+        Segment(str(schedule["id"]), code=True),
+        Segment(f": {schedule['name']} [{schedule['state']}] {_pattern_summary(pattern, tz_name=tz_name)}\n"),
+    )
+
+
 # --- /newschedule conversation ----------------------------------------------
 
 
 async def newschedule_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Begin interactive schedule creation."""
-    await ensure_user_record(update, context)
-
     if update.message is None or update.effective_user is None:
         return ConversationHandler.END
 
     channel: dict | None = None
     telegram_channel_id: str | None = None
+    selected_schedule_id = None
 
     if context.args and len(context.args) == 1:
-        telegram_channel_id = await resolve_channel_id(context, context.args[0])
+        # The user upsert does not depend on channel resolution (which may call the Bot API).
+        _, telegram_channel_id = await asyncio.gather(
+            ensure_user_record_cached(update, context),
+            resolve_channel_id(context, context.args[0]),
+        )
         if telegram_channel_id is None:
             await update.message.reply_text(
                 "Could not resolve that channel. Use /listchannels and copy the channel id."
@@ -190,36 +376,38 @@ async def newschedule_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
     else:
         # No argument: fall back to selected channel.
-        user_ctx = await db.get_user_context(update.effective_user.id)
+        _, user_ctx = await asyncio.gather(
+            ensure_user_record_cached(update, context),
+            db.get_user_context(update.effective_user.id),
+        )
         selected_channel_id = user_ctx.get("selected_channel_id")
         if selected_channel_id is None:
-            await update.message.reply_text(
-                "Usage: /newschedule <channel_id>\n"
-                "Example: /newschedule -1001234567890\n\n"
-                "Tip: select a default channel first:\n"
-                "- /listchannels\n"
-                "- /selectchannel <channel_id>"
-            )
+            await update.message.reply_text(_USAGE_NEWSCHEDULE)
             return ConversationHandler.END
+        selected_schedule_id = user_ctx.get("selected_schedule_id")
 
         channel = await db_access.get_channel_by_id_for_user(update.effective_user.id, int(selected_channel_id))
         if channel is None:
-            await update.message.reply_text(
-                "Your selected channel is missing or not owned by you.\n"
-                "Use /listchannels and /selectchannel again."
-            )
+            await update.message.reply_text(_SELECTED_CHANNEL_MISSING)
             return ConversationHandler.END
 
         telegram_channel_id = str(channel["channel_id"])
 
+    # Remind which channel we are creating a schedule for. The footer only
+    # needs a details lookup when a schedule is selected too.
+    if selected_schedule_id is None:
+        tz_name = await _effective_user_timezone_name(update.effective_user.id)
+        header = selection_segments_from(channel)
+    else:
+        tz_name, details = await asyncio.gather(
+            _effective_user_timezone_name(update.effective_user.id),
+            db.get_user_context_details(update.effective_user.id),
+        )
+        header = selection_segments(details)
     context.user_data["ns_channel_db_id"] = int(channel["id"])
     context.user_data["ns_channel_name"] = str(channel["channel_name"])
-    context.user_data["ns_timezone"] = await _effective_user_timezone_name(update.effective_user.id)
+    context.user_data["ns_timezone"] = tz_name
 
-    # Remind which channel we are creating a schedule for.
-    details = await db.get_user_context_details(update.effective_user.id)
-    header = selection_segments(details)
-    tz_name = str(context.user_data.get("ns_timezone") or _default_timezone_name())
     msg_text, msg_entities = render(
         [
             *header,
@@ -235,7 +423,7 @@ async def newschedule_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def newschedule_set_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
@@ -253,118 +441,63 @@ async def newschedule_set_name(update: Update, context: ContextTypes.DEFAULT_TYP
 
 
 async def newschedule_set_type(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
     schedule_type = (update.message.text or "").strip().lower()
-    if schedule_type not in {"interval", "daily", "weekly"}:
-        await update.message.reply_text("Invalid type. Reply with: interval, daily, weekly")
+    entry = _NS_TYPE_PROMPTS.get(schedule_type)
+    if entry is None:
+        await update.message.reply_text(_INVALID_TYPE)
         return NS_WAIT_TYPE
 
     context.user_data["ns_type"] = schedule_type
-
-    if schedule_type == "interval":
-        await update.message.reply_text(
-            "Enter interval (examples: 1h, 30m, 90)."
-        )
-        return NS_WAIT_INTERVAL
-
-    if schedule_type == "daily":
-        tz_name = str(context.user_data.get("ns_timezone") or _default_timezone_name())
-        await update.message.reply_text(
-            f"Enter times in {tz_name} (HH:MM) separated by commas.\n"
-            "Example: 09:00,16:00\n"
-            "Tip: change your default timezone with /settimezone."
-        )
-        return NS_WAIT_DAILY_TIMES
-
-    if schedule_type == "weekly":
-        await update.message.reply_text(
-            "Enter weekdays separated by commas.\n"
-            "Example: monday,tuesday,wednesday,thursday,friday"
-        )
-        return NS_WAIT_WEEKLY_DAYS
-
-    await update.message.reply_text("Invalid type. Reply with: interval, daily, weekly")
-    return NS_WAIT_TYPE
+    prompt, next_state = entry
+    tz_name = str(context.user_data.get("ns_timezone") or default_timezone_name())
+    await update.message.reply_text(prompt.format(tz_name=tz_name))
+    return next_state
 
 
 async def newschedule_set_interval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
-    if update.message is None:
-        return ConversationHandler.END
-
-    parsed = _parse_interval_input(update.message.text or "")
-    if parsed is None:
-        await update.message.reply_text("Invalid interval. Try: 1h, 30m, or 90")
-        return NS_WAIT_INTERVAL
-
-    hours, minutes = parsed
-    pattern = {"type": "interval"}
-    if hours:
-        pattern["hours"] = hours
-    if minutes:
-        pattern["minutes"] = minutes
-
-    return await _newschedule_finalize(update, context, pattern)
+    return await _pattern_step(
+        update, context, "interval", prefix="ns", wait_state=NS_WAIT_INTERVAL, finalize=_newschedule_finalize
+    )
 
 
 async def newschedule_set_daily_times(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
-    if update.message is None:
-        return ConversationHandler.END
-
-    times = _parse_times_csv(update.message.text or "")
-    if times is None:
-        tz_name = str(context.user_data.get("ns_timezone") or _default_timezone_name())
-        await update.message.reply_text(
-            f"Invalid times. Use HH:MM separated by commas (interpreted in {tz_name})."
-        )
-        return NS_WAIT_DAILY_TIMES
-
-    pattern = {"type": "daily", "times": times}
-    return await _newschedule_finalize(update, context, pattern)
+    return await _pattern_step(
+        update, context, "daily", prefix="ns", wait_state=NS_WAIT_DAILY_TIMES, finalize=_newschedule_finalize
+    )
 
 
 async def newschedule_set_weekly_days(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
-    days = _parse_weekdays_csv(update.message.text or "")
+    # Days and times pasted together ("monday,friday\n09:00") finish in one step.
+    days_text, times_text = _split_weekdays_and_times(update.message.text or "")
+    days = _parse_weekdays_csv(days_text)
     if days is None:
-        await update.message.reply_text(
-            "Invalid weekdays. Use names like: monday,tuesday,wednesday"
-        )
+        await update.message.reply_text(_INVALID_WEEKDAYS)
         return NS_WAIT_WEEKLY_DAYS
 
-    context.user_data["ns_days"] = days
-    tz_name = str(context.user_data.get("ns_timezone") or _default_timezone_name())
-    await update.message.reply_text(
-        f"Enter times in {tz_name} (HH:MM) separated by commas.\n"
-        "Example: 12:00\n"
-        "Tip: change your default timezone with /settimezone."
-    )
+    context.user_data["ns_days"] = list(days)
+    if times_text.strip():
+        times = await _parse_times_or_reply(update, context, "ns_timezone", times_text)
+        if times is None:
+            return NS_WAIT_WEEKLY_TIMES
+        return await _newschedule_finalize(update, context, {"type": "weekly", "days": list(days), "times": list(times)})
+
+    tz_name = str(context.user_data.get("ns_timezone") or default_timezone_name())
+    await update.message.reply_text(_NS_WEEKLY_TIMES_PROMPT.format(tz_name=tz_name))
     return NS_WAIT_WEEKLY_TIMES
 
 
 async def newschedule_set_weekly_times(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
-    if update.message is None:
-        return ConversationHandler.END
-
-    times = _parse_times_csv(update.message.text or "")
-    if times is None:
-        tz_name = str(context.user_data.get("ns_timezone") or _default_timezone_name())
-        await update.message.reply_text(
-            f"Invalid times. Use HH:MM separated by commas (interpreted in {tz_name})."
-        )
-        return NS_WAIT_WEEKLY_TIMES
-
-    days = context.user_data.get("ns_days") or []
-    pattern = {"type": "weekly", "days": days, "times": times}
-    return await _newschedule_finalize(update, context, pattern)
+    return await _pattern_step(
+        update, context, "weekly", prefix="ns", wait_state=NS_WAIT_WEEKLY_TIMES, finalize=_newschedule_finalize
+    )
 
 
 async def _newschedule_finalize(update: Update, context: ContextTypes.DEFAULT_TYPE, pattern: dict) -> int:
@@ -378,9 +511,11 @@ async def _newschedule_finalize(update: Update, context: ContextTypes.DEFAULT_TY
 
     channel_db_id = int(context.user_data.get("ns_channel_db_id"))
     name = str(context.user_data.get("ns_name"))
-    timezone_name = str(context.user_data.get("ns_timezone") or _default_timezone_name())
+    timezone_name = str(context.user_data.get("ns_timezone") or default_timezone_name())
 
-    schedule = await db.create_schedule(
+    # Create and automatically select the new schedule.
+    schedule, details = await db.create_and_select_schedule(
+        user_id=update.effective_user.id,
         channel_db_id=channel_db_id,
         name=name,
         pattern=pattern,
@@ -390,30 +525,22 @@ async def _newschedule_finalize(update: Update, context: ContextTypes.DEFAULT_TY
 
     channel_name = str(context.user_data.get("ns_channel_name") or channel_db_id)
 
-    # Automatically select the new schedule.
-    await db.set_user_context(
-        user_id=update.effective_user.id,
-        selected_channel_id=channel_db_id,
-        selected_schedule_id=int(schedule["id"]),
-    )
-
+    schedule_id_seg = Segment(str(schedule["id"]), code=True)
     segments = [
-        Segment("Schedule created.\n"),
-        Segment("ID: "),
-        Segment(str(schedule["id"]), code=True),
-        Segment("\nChannel: "),
+        _SEG_CREATED_ID,
+        schedule_id_seg,
+        _SEG_CREATED_CHANNEL,
         Segment(channel_name),
-        Segment("\nPattern: "),
+        _SEG_CREATED_PATTERN,
         Segment(_pattern_summary(pattern, tz_name=timezone_name)),
-        Segment("\nState: paused\n"),
-        Segment("Next steps: /resumeschedule "),
-        Segment(str(schedule["id"]), code=True),
-        Segment("\nQueue: /viewqueue "),
-        Segment(str(schedule["id"]), code=True),
-        Segment("\nAdd posts: /bulk "),
-        Segment(str(schedule["id"]), code=True),
-        Segment("\n\n"),
-        *selection_segments(await db.get_user_context_details(update.effective_user.id)),
+        _SEG_CREATED_NEXT,
+        schedule_id_seg,
+        _SEG_CREATED_QUEUE,
+        schedule_id_seg,
+        _SEG_CREATED_BULK,
+        schedule_id_seg,
+        _SEG_NL_NL,
+        *selection_segments(details),
     ]
     text, entities = render(segments)
     await update.message.reply_text(text, entities=entities)
@@ -429,7 +556,7 @@ async def _newschedule_finalize(update: Update, context: ContextTypes.DEFAULT_TY
 
 
 async def schedule_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     _clear_new_schedule_state(context)
     _clear_edit_schedule_state(context)
     if update.message:
@@ -438,15 +565,13 @@ async def schedule_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 
 def _clear_new_schedule_state(context: ContextTypes.DEFAULT_TYPE) -> None:
-    for key in list(context.user_data.keys()):
-        if key.startswith("ns_"):
-            context.user_data.pop(key, None)
+    for key in _NS_KEYS:
+        context.user_data.pop(key, None)
 
 
 def _clear_edit_schedule_state(context: ContextTypes.DEFAULT_TYPE) -> None:
-    for key in list(context.user_data.keys()):
-        if key.startswith("es_"):
-            context.user_data.pop(key, None)
+    for key in _ES_KEYS:
+        context.user_data.pop(key, None)
 
 
 new_schedule_conversation_handler = ConversationHandler(
@@ -467,16 +592,18 @@ new_schedule_conversation_handler = ConversationHandler(
 
 
 async def list_schedules_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    await ensure_user_record(update, context)
-
     if update.message is None or update.effective_user is None:
         return
 
     channel: dict | None = None
     telegram_channel_id: str | None = None
+    selected_schedule_id = None
 
     if context.args and len(context.args) == 1:
-        telegram_channel_id = await resolve_channel_id(context, context.args[0])
+        _, telegram_channel_id = await asyncio.gather(
+            ensure_user_record_cached(update, context),
+            resolve_channel_id(context, context.args[0]),
+        )
         if telegram_channel_id is None:
             await update.message.reply_text("Could not resolve that channel.")
             return
@@ -492,64 +619,52 @@ async def list_schedules_command(update: Update, context: ContextTypes.DEFAULT_T
             selected_schedule_id=None,
         )
     else:
-        user_ctx = await db.get_user_context(update.effective_user.id)
+        _, user_ctx = await asyncio.gather(
+            ensure_user_record_cached(update, context),
+            db.get_user_context(update.effective_user.id),
+        )
         selected_channel_id = user_ctx.get("selected_channel_id")
         if selected_channel_id is None:
-            await update.message.reply_text(
-                "Usage: /listschedules <channel_id>\n"
-                "Example: /listschedules -1001234567890\n\n"
-                "Tip: select a default channel first:\n"
-                "- /listchannels\n"
-                "- /selectchannel <channel_id>"
-            )
+            await update.message.reply_text(_USAGE_LISTSCHEDULES)
             return
+        selected_schedule_id = user_ctx.get("selected_schedule_id")
 
         channel = await db_access.get_channel_by_id_for_user(update.effective_user.id, int(selected_channel_id))
         if channel is None:
-            await update.message.reply_text(
-                "Your selected channel is missing or not owned by you.\n"
-                "Use /listchannels and /selectchannel again."
-            )
+            await update.message.reply_text(_SELECTED_CHANNEL_MISSING)
             return
 
         telegram_channel_id = str(channel["channel_id"])
 
     schedules = await db.get_channel_schedules(int(channel["id"]))
+
+    # The selected schedule (if any) belongs to this channel, so the footer can
+    # come from the rows already fetched.
+    selected_schedule = None
+    if selected_schedule_id is not None:
+        selected_schedule = next((s for s in schedules if s["id"] == int(selected_schedule_id)), None)
+    if selected_schedule_id is None or selected_schedule is not None:
+        footer = selection_segments_from(channel, selected_schedule)
+    else:
+        footer = selection_segments(await db.get_user_context_details(update.effective_user.id))
+
     if not schedules:
-        details = await db.get_user_context_details(update.effective_user.id)
-        msg_text, msg_entities = render(
-            [
-                Segment("No schedules for this channel yet. Use /newschedule to create one.\n\n"),
-                *selection_segments(details),
-            ]
-        )
+        msg_text, msg_entities = render_after(_NO_SCHEDULES_PREFIX, footer)
         await update.message.reply_text(msg_text, entities=msg_entities)
         return
 
     segments: list[Segment] = [
-        Segment("Schedules for channel '"),
+        _SEG_LIST_HEADER,
         Segment(str(channel["channel_name"])),
-        Segment("' ("),
+        _SEG_LIST_HEADER_ID,
         Segment(str(telegram_channel_id), code=True),
-        Segment("):\n"),
+        _SEG_LIST_HEADER_END,
     ]
     for s in schedules:
-        pattern = s.get("pattern") or {}
-        tz_name = str(s.get("timezone") or _default_timezone_name())
-        segments += [
-            Segment("- "),
-            Segment(str(s["id"]), code=True),
-            Segment(": "),
-            Segment(str(s["name"])),
-            Segment(" ["),
-            Segment(str(s["state"])),
-            Segment("] "),
-            Segment(_pattern_summary(pattern, tz_name=tz_name)),
-            Segment("\n"),
-        ]
+        segments.extend(_schedule_row(s))
 
-    segments += [Segment("\nTip: set a default schedule with /selectschedule "), Segment(str(schedules[0]["id"]), code=True), Segment(".\n\n")]
-    segments += selection_segments(await db.get_user_context_details(update.effective_user.id))
+    segments += [_SEG_LIST_TIP, Segment(str(schedules[0]["id"]), code=True), _SEG_DOT_NL_NL]
+    segments += footer
 
     text, entities = render(segments)
     await update.message.reply_text(text, entities=entities)
@@ -557,7 +672,7 @@ async def list_schedules_command(update: Update, context: ContextTypes.DEFAULT_T
 
 async def setscheduletimezone_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Set a schedule's timezone (used for daily/weekly interpretation and display)."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
 
     if update.message is None or update.effective_user is None:
         return
@@ -568,7 +683,7 @@ async def setscheduletimezone_command(update: Update, context: ContextTypes.DEFA
     tz_arg: str | None = None
 
     if len(context.args) == 2:
-        schedule_id = _parse_schedule_id(context.args[0])
+        schedule_id = parse_int(context.args[0])
         tz_arg = context.args[1]
     elif len(context.args) == 1:
         tz_arg = context.args[0]
@@ -577,20 +692,7 @@ async def setscheduletimezone_command(update: Update, context: ContextTypes.DEFA
         schedule_id = int(raw) if raw is not None else None
     else:
         tz_default = await _effective_user_timezone_name(user_id)
-        text, entities = render(
-            [
-                Segment("Usage: "),
-                Segment("/setscheduletimezone"),
-                Segment(" "),
-                Segment("<schedule_id>", code=True),
-                Segment(" "),
-                Segment("<timezone>", code=True),
-                Segment("\nTip: if you have a selected schedule, you can omit <schedule_id>:\n"),
-                Segment("/setscheduletimezone"),
-                Segment(" "),
-                Segment(tz_default, code=True),
-            ]
-        )
+        text, entities = render_after(_SETSCHEDULETIMEZONE_USAGE_PREFIX, [Segment(tz_default, code=True)])
         await update.message.reply_text(text, entities=entities)
         return
 
@@ -604,7 +706,7 @@ async def setscheduletimezone_command(update: Update, context: ContextTypes.DEFA
 
     schedule = await db.get_schedule_for_user(user_id, schedule_id)
     if schedule is None:
-        await update.message.reply_text("Schedule not found or not owned by you.")
+        await update.message.reply_text(_SCHEDULE_NOT_FOUND)
         return
 
     raw_tz = (tz_arg or "").strip()
@@ -612,49 +714,35 @@ async def setscheduletimezone_command(update: Update, context: ContextTypes.DEFA
         await update.message.reply_text("Timezone cannot be empty.")
         return
 
-    if raw_tz.lower() in {"default", "reset", "clear"}:
+    if raw_tz.lower() in RESET_TIMEZONE_WORDS:
         tz_name = await _effective_user_timezone_name(user_id)
     else:
         tz_name = raw_tz
 
-    if not _is_valid_timezone_name(tz_name):
-        text, entities = render(
-            [
-                Segment("Unknown timezone: "),
-                Segment(tz_name, code=True),
-                Segment("\nUse an IANA timezone name like "),
-                Segment("Europe/Amsterdam", code=True),
-                Segment(", "),
-                Segment("UTC", code=True),
-                Segment("."),
-            ]
-        )
+    if not is_valid_timezone(tz_name):
+        text, entities = render_after(UNKNOWN_TIMEZONE, [Segment(tz_name, code=True)], UNKNOWN_TIMEZONE_SUFFIX)
         await update.message.reply_text(text, entities=entities)
         return
 
-    old_tz = str(schedule.get("timezone") or _default_timezone_name())
+    old_tz = str(schedule.get("timezone") or default_timezone_name())
     await db.update_schedule_timezone(schedule_id, timezone_name=tz_name)
 
-    text, entities = render(
+    text, entities = render_after(
+        _SCHEDULE_PREFIX,
         [
-            Segment("Schedule "),
             Segment(str(schedule_id), code=True),
             Segment(" timezone updated: "),
             Segment(old_tz, code=True),
             Segment(" → "),
             Segment(tz_name, code=True),
-            Segment(".\n\n"),
-            Segment("Note: daily/weekly schedule times are interpreted in the schedule timezone.\n"),
-            Segment("Preview with "),
-            Segment("/testschedule"),
-            Segment("."),
-        ]
+        ],
+        _TIMEZONE_UPDATED_SUFFIX,
     )
     await update.message.reply_text(text, entities=entities)
 
 
 async def pause_schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
 
     if update.message is None or update.effective_user is None:
         return
@@ -662,9 +750,9 @@ async def pause_schedule_command(update: Update, context: ContextTypes.DEFAULT_T
     schedule_id: int | None = None
     used_selected = False
     if context.args and len(context.args) == 1:
-        schedule_id = _parse_schedule_id(context.args[0])
+        schedule_id = parse_int(context.args[0])
         if schedule_id is None:
-            await update.message.reply_text("Invalid schedule id.")
+            await update.message.reply_text(_INVALID_SCHEDULE_ID)
             return
     else:
         user_ctx = await db.get_user_context(update.effective_user.id)
@@ -673,29 +761,20 @@ async def pause_schedule_command(update: Update, context: ContextTypes.DEFAULT_T
         used_selected = True
 
     if schedule_id is None:
-        await update.message.reply_text(
-            "Usage: /pauseschedule <schedule_id>\n"
-            "Tip: select a default schedule with /selectschedule <schedule_id>."
-        )
+        await update.message.reply_text(_USAGE_PAUSESCHEDULE)
         return
 
-    schedule = await db.get_schedule_for_user(update.effective_user.id, schedule_id)
-    if schedule is None:
-        await update.message.reply_text("Schedule not found or not owned by you.")
+    # Ownership check, selection update and the change itself share one transaction.
+    details = await db.update_schedule_state_for_user(
+        update.effective_user.id, schedule_id, "paused", select=not used_selected
+    )
+    if details is None:
+        await update.message.reply_text(_SCHEDULE_NOT_FOUND)
         return
 
-    if not used_selected:
-        await db.set_user_context(
-            user_id=update.effective_user.id,
-            selected_channel_id=int(schedule["channel_id"]),
-            selected_schedule_id=schedule_id,
-        )
-
-    await db.update_schedule_state(schedule_id, "paused")
-    details = await db.get_user_context_details(update.effective_user.id)
     text, entities = render(
         [
-            Segment("Schedule "),
+            _SEG_SCHEDULE,
             Segment(str(schedule_id), code=True),
             Segment(" paused.\n\n"),
             *selection_segments(details),
@@ -705,7 +784,7 @@ async def pause_schedule_command(update: Update, context: ContextTypes.DEFAULT_T
 
 
 async def resume_schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
 
     if update.message is None or update.effective_user is None:
         return
@@ -713,9 +792,9 @@ async def resume_schedule_command(update: Update, context: ContextTypes.DEFAULT_
     schedule_id: int | None = None
     used_selected = False
     if context.args and len(context.args) == 1:
-        schedule_id = _parse_schedule_id(context.args[0])
+        schedule_id = parse_int(context.args[0])
         if schedule_id is None:
-            await update.message.reply_text("Invalid schedule id.")
+            await update.message.reply_text(_INVALID_SCHEDULE_ID)
             return
     else:
         user_ctx = await db.get_user_context(update.effective_user.id)
@@ -724,29 +803,19 @@ async def resume_schedule_command(update: Update, context: ContextTypes.DEFAULT_
         used_selected = True
 
     if schedule_id is None:
-        await update.message.reply_text(
-            "Usage: /resumeschedule <schedule_id>\n"
-            "Tip: select a default schedule with /selectschedule <schedule_id>."
-        )
+        await update.message.reply_text(_USAGE_RESUMESCHEDULE)
         return
 
-    schedule = await db.get_schedule_for_user(update.effective_user.id, schedule_id)
-    if schedule is None:
-        await update.message.reply_text("Schedule not found or not owned by you.")
+    details = await db.update_schedule_state_for_user(
+        update.effective_user.id, schedule_id, "active", select=not used_selected
+    )
+    if details is None:
+        await update.message.reply_text(_SCHEDULE_NOT_FOUND)
         return
 
-    if not used_selected:
-        await db.set_user_context(
-            user_id=update.effective_user.id,
-            selected_channel_id=int(schedule["channel_id"]),
-            selected_schedule_id=schedule_id,
-        )
-
-    await db.update_schedule_state(schedule_id, "active")
-    details = await db.get_user_context_details(update.effective_user.id)
     text, entities = render(
         [
-            Segment("Schedule "),
+            _SEG_SCHEDULE,
             Segment(str(schedule_id), code=True),
             Segment(" resumed.\n\n"),
             *selection_segments(details),
@@ -756,7 +825,7 @@ async def resume_schedule_command(update: Update, context: ContextTypes.DEFAULT_
 
 
 async def delete_schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
 
     if update.message is None or update.effective_user is None:
         return
@@ -764,9 +833,9 @@ async def delete_schedule_command(update: Update, context: ContextTypes.DEFAULT_
     schedule_id: int | None = None
     used_selected = False
     if context.args and len(context.args) == 1:
-        schedule_id = _parse_schedule_id(context.args[0])
+        schedule_id = parse_int(context.args[0])
         if schedule_id is None:
-            await update.message.reply_text("Invalid schedule id.")
+            await update.message.reply_text(_INVALID_SCHEDULE_ID)
             return
     else:
         user_ctx = await db.get_user_context(update.effective_user.id)
@@ -775,29 +844,19 @@ async def delete_schedule_command(update: Update, context: ContextTypes.DEFAULT_
         used_selected = True
 
     if schedule_id is None:
-        await update.message.reply_text(
-            "Usage: /deleteschedule <schedule_id>\n"
-            "Tip: select a default schedule with /selectschedule <schedule_id>."
-        )
+        await update.message.reply_text(_USAGE_DELETESCHEDULE)
         return
 
-    schedule = await db.get_schedule_for_user(update.effective_user.id, schedule_id)
-    if schedule is None:
-        await update.message.reply_text("Schedule not found or not owned by you.")
+    details = await db.delete_schedule_for_user(
+        update.effective_user.id, schedule_id, select=not used_selected
+    )
+    if details is None:
+        await update.message.reply_text(_SCHEDULE_NOT_FOUND)
         return
 
-    if not used_selected:
-        await db.set_user_context(
-            user_id=update.effective_user.id,
-            selected_channel_id=int(schedule["channel_id"]),
-            selected_schedule_id=schedule_id,
-        )
-
-    await db.delete_schedule(schedule_id)
-    details = await db.get_user_context_details(update.effective_user.id)
     text, entities = render(
         [
-            Segment("Schedule "),
+            _SEG_SCHEDULE,
             Segment(str(schedule_id), code=True),
             Segment(" deleted.\n\n"),
             *selection_segments(details),
@@ -807,7 +866,7 @@ async def delete_schedule_command(update: Update, context: ContextTypes.DEFAULT_
 
 
 async def copy_schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
 
     if update.message is None or update.effective_user is None:
         return
@@ -816,7 +875,7 @@ async def copy_schedule_command(update: Update, context: ContextTypes.DEFAULT_TY
         await update.message.reply_text("Usage: /copyschedule <schedule_id> <target_channel_id>")
         return
 
-    source_id = _parse_schedule_id(context.args[0])
+    source_id = parse_int(context.args[0])
     if source_id is None:
         await update.message.reply_text("Invalid source schedule id.")
         return
@@ -840,7 +899,7 @@ async def copy_schedule_command(update: Update, context: ContextTypes.DEFAULT_TY
         channel_db_id=int(target_channel["id"]),
         name=str(source["name"]),
         pattern=dict(source["pattern"]),
-        timezone_name=str(source.get("timezone") or _default_timezone_name()),
+        timezone_name=str(source.get("timezone") or default_timezone_name()),
         state="paused",
     )
 
@@ -858,33 +917,33 @@ async def copy_schedule_command(update: Update, context: ContextTypes.DEFAULT_TY
 
 
 async def editschedule_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
     if update.message is None or update.effective_user is None:
         return ConversationHandler.END
 
     schedule_id: int | None = None
     used_selected = False
     if context.args and len(context.args) == 1:
-        schedule_id = _parse_schedule_id(context.args[0])
+        await ensure_user_record_cached(update, context)
+        schedule_id = parse_int(context.args[0])
         if schedule_id is None:
-            await update.message.reply_text("Invalid schedule id.")
+            await update.message.reply_text(_INVALID_SCHEDULE_ID)
             return ConversationHandler.END
     else:
-        user_ctx = await db.get_user_context(update.effective_user.id)
+        _, user_ctx = await asyncio.gather(
+            ensure_user_record_cached(update, context),
+            db.get_user_context(update.effective_user.id),
+        )
         raw = user_ctx.get("selected_schedule_id")
         schedule_id = int(raw) if raw is not None else None
         used_selected = True
 
     if schedule_id is None:
-        await update.message.reply_text(
-            "Usage: /editschedule <schedule_id>\n"
-            "Tip: select a default schedule with /selectschedule <schedule_id>."
-        )
+        await update.message.reply_text(_USAGE_EDITSCHEDULE)
         return ConversationHandler.END
 
     schedule = await db.get_schedule_for_user(update.effective_user.id, schedule_id)
     if schedule is None:
-        await update.message.reply_text("Schedule not found or not owned by you.")
+        await update.message.reply_text(_SCHEDULE_NOT_FOUND)
         return ConversationHandler.END
 
     if not used_selected:
@@ -897,15 +956,15 @@ async def editschedule_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
     context.user_data["es_schedule_id"] = schedule_id
     context.user_data["es_current_name"] = schedule.get("name")
     context.user_data["es_current_pattern"] = schedule.get("pattern")
-    context.user_data["es_timezone"] = str(schedule.get("timezone") or _default_timezone_name())
+    context.user_data["es_timezone"] = str(schedule.get("timezone") or default_timezone_name())
 
-    details = await db.get_user_context_details(update.effective_user.id)
+    # The schedule is now the selection; its row already carries the channel.
     text, entities = render(
         [
             Segment("Editing schedule "),
             Segment(str(schedule_id), code=True),
-            Segment(".\n\n"),
-            *selection_segments(details),
+            _SEG_DOT_NL_NL,
+            *selection_segments_from(None, schedule),
             Segment("\n\nWhat do you want to edit? Reply with: name or pattern\nOr /cancel to stop."),
         ]
     )
@@ -914,7 +973,7 @@ async def editschedule_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def editschedule_choose_field(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
@@ -934,7 +993,7 @@ async def editschedule_choose_field(update: Update, context: ContextTypes.DEFAUL
 
 
 async def editschedule_set_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
@@ -945,123 +1004,70 @@ async def editschedule_set_name(update: Update, context: ContextTypes.DEFAULT_TY
 
     schedule_id = int(context.user_data.get("es_schedule_id"))
     await db.update_schedule_name(schedule_id, name=name)
-    text, entities = render([Segment("Schedule "), Segment(str(schedule_id), code=True), Segment(" renamed.")])
+    text, entities = render([_SEG_SCHEDULE, Segment(str(schedule_id), code=True), Segment(" renamed.")])
     await update.message.reply_text(text, entities=entities)
     _clear_edit_schedule_state(context)
     return ConversationHandler.END
 
 
 async def editschedule_set_type(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
     schedule_type = (update.message.text or "").strip().lower()
-    if schedule_type not in {"interval", "daily", "weekly"}:
-        await update.message.reply_text("Invalid type. Reply with: interval, daily, weekly")
+    entry = _ES_TYPE_PROMPTS.get(schedule_type)
+    if entry is None:
+        await update.message.reply_text(_INVALID_TYPE)
         return ES_WAIT_TYPE
 
     context.user_data["es_type"] = schedule_type
-
-    if schedule_type == "interval":
-        await update.message.reply_text("Enter interval (examples: 1h, 30m, 90).")
-        return ES_WAIT_INTERVAL
-
-    if schedule_type == "daily":
-        tz_name = str(context.user_data.get("es_timezone") or _default_timezone_name())
-        await update.message.reply_text(
-            f"Enter times in {tz_name} (HH:MM) separated by commas.\n"
-            "Example: 09:00,16:00\n"
-            "Tip: schedule timezone is set when the schedule is created."
-        )
-        return ES_WAIT_DAILY_TIMES
-
-    if schedule_type == "weekly":
-        await update.message.reply_text(
-            "Enter weekdays separated by commas.\n"
-            "Example: monday,tuesday,wednesday,thursday,friday"
-        )
-        return ES_WAIT_WEEKLY_DAYS
-
-    await update.message.reply_text("Invalid type. Reply with: interval, daily, weekly")
-    return ES_WAIT_TYPE
+    prompt, next_state = entry
+    tz_name = str(context.user_data.get("es_timezone") or default_timezone_name())
+    await update.message.reply_text(prompt.format(tz_name=tz_name))
+    return next_state
 
 
 async def editschedule_set_interval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
-    if update.message is None:
-        return ConversationHandler.END
-
-    parsed = _parse_interval_input(update.message.text or "")
-    if parsed is None:
-        await update.message.reply_text("Invalid interval. Try: 1h, 30m, or 90")
-        return ES_WAIT_INTERVAL
-
-    hours, minutes = parsed
-    pattern: dict = {"type": "interval"}
-    if hours:
-        pattern["hours"] = hours
-    if minutes:
-        pattern["minutes"] = minutes
-
-    return await _editschedule_finalize(update, context, pattern)
+    return await _pattern_step(
+        update, context, "interval", prefix="es", wait_state=ES_WAIT_INTERVAL, finalize=_editschedule_finalize
+    )
 
 
 async def editschedule_set_daily_times(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
-    if update.message is None:
-        return ConversationHandler.END
-
-    times = _parse_times_csv(update.message.text or "")
-    if times is None:
-        tz_name = str(context.user_data.get("es_timezone") or _default_timezone_name())
-        await update.message.reply_text(
-            f"Invalid times. Use HH:MM separated by commas (interpreted in {tz_name})."
-        )
-        return ES_WAIT_DAILY_TIMES
-
-    pattern = {"type": "daily", "times": times}
-    return await _editschedule_finalize(update, context, pattern)
+    return await _pattern_step(
+        update, context, "daily", prefix="es", wait_state=ES_WAIT_DAILY_TIMES, finalize=_editschedule_finalize
+    )
 
 
 async def editschedule_set_weekly_days(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None:
         return ConversationHandler.END
 
-    days = _parse_weekdays_csv(update.message.text or "")
+    # Days and times pasted together ("monday,friday\n09:00") finish in one step.
+    days_text, times_text = _split_weekdays_and_times(update.message.text or "")
+    days = _parse_weekdays_csv(days_text)
     if days is None:
-        await update.message.reply_text(
-            "Invalid weekdays. Use names like: monday,tuesday,wednesday"
-        )
+        await update.message.reply_text(_INVALID_WEEKDAYS)
         return ES_WAIT_WEEKLY_DAYS
 
-    context.user_data["es_days"] = days
-    tz_name = str(context.user_data.get("es_timezone") or _default_timezone_name())
-    await update.message.reply_text(
-        f"Enter times in {tz_name} (HH:MM) separated by commas.\n"
-        "Example: 12:00\n"
-        "Tip: schedule timezone is set when the schedule is created."
-    )
+    context.user_data["es_days"] = list(days)
+    if times_text.strip():
+        times = await _parse_times_or_reply(update, context, "es_timezone", times_text)
+        if times is None:
+            return ES_WAIT_WEEKLY_TIMES
+        return await _editschedule_finalize(update, context, {"type": "weekly", "days": list(days), "times": list(times)})
+
+    tz_name = str(context.user_data.get("es_timezone") or default_timezone_name())
+    await update.message.reply_text(_ES_WEEKLY_TIMES_PROMPT.format(tz_name=tz_name))
     return ES_WAIT_WEEKLY_TIMES
 
 
 async def editschedule_set_weekly_times(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    await ensure_user_record(update, context)
-    if update.message is None:
-        return ConversationHandler.END
-
-    times = _parse_times_csv(update.message.text or "")
-    if times is None:
-        tz_name = str(context.user_data.get("es_timezone") or _default_timezone_name())
-        await update.message.reply_text(
-            f"Invalid times. Use HH:MM separated by commas (interpreted in {tz_name})."
-        )
-        return ES_WAIT_WEEKLY_TIMES
-
-    days = context.user_data.get("es_days") or []
-    pattern = {"type": "weekly", "days": days, "times": times}
-    return await _editschedule_finalize(update, context, pattern)
+    return await _pattern_step(
+        update, context, "weekly", prefix="es", wait_state=ES_WAIT_WEEKLY_TIMES, finalize=_editschedule_finalize
+    )
 
 
 async def _editschedule_finalize(update: Update, context: ContextTypes.DEFAULT_TYPE, pattern: dict) -> int:
@@ -1076,10 +1082,10 @@ async def _editschedule_finalize(update: Update, context: ContextTypes.DEFAULT_T
     schedule_id = int(context.user_data.get("es_schedule_id"))
     await db.update_schedule_pattern(schedule_id, pattern)
 
-    tz_name = str(context.user_data.get("es_timezone") or _default_timezone_name())
+    tz_name = str(context.user_data.get("es_timezone") or default_timezone_name())
     text, entities = render(
         [
-            Segment("Schedule "),
+            _SEG_SCHEDULE,
             Segment(str(schedule_id), code=True),
             Segment(" updated.\nPattern: "),
             Segment(_pattern_summary(pattern, tz_name=tz_name)),
@@ -6,6 +6,7 @@ currently selected channel/schedule.
 
 from __future__ import annotations
 
+import functools
 import logging
 
 from telegram import Update
@@ -13,22 +14,39 @@ from telegram.ext import ContextTypes
 
 from database import access as db_access
 from database import queries as db
-from handlers.common import ensure_user_record
+from handlers.common import ensure_user_record_cached, parse_int
 from handlers.verification import resolve_channel_id
 from utils.tg_text import Segment, render
 
 logger = logging.getLogger(__name__)
 
 
-def selection_segments(details: dict) -> list[Segment]:
-    channel_name = details.get("channel_name")
-    telegram_channel_id = details.get("telegram_channel_id")
-    schedule_id = details.get("selected_schedule_id")
-    schedule_name = details.get("schedule_name")
-    schedule_state = details.get("schedule_state")
+def _selection_key(details: dict) -> tuple:
+    return (
+        details.get("channel_name"),
+        details.get("telegram_channel_id"),
+        details.get("selected_schedule_id"),
+        details.get("schedule_name"),
+        details.get("schedule_state"),
+    )
+
 
+def selection_segments(details: dict) -> list[Segment]:
+    return list(_selection_segments_cached(*_selection_key(details)))
+
+
+# Keyed on every displayed field, so renames and state changes simply miss;
+# nothing needs invalidating.
+@functools.lru_cache(maxsize=4096)
+def _selection_segments_cached(
+    channel_name: object,
+    telegram_channel_id: object,
+    schedule_id: object,
+    schedule_name: object,
+    schedule_state: object,
+) -> tuple[Segment, ...]:
     if not telegram_channel_id and not schedule_id:
-        return [Segment("Current selection: none")]
+        return (Segment("Current selection: none"),)
 
     segments: list[Segment] = [Segment("Current selection:\n")]
 
@@ -52,19 +70,44 @@ def selection_segments(details: dict) -> list[Segment]:
             Segment(state_part),
         ]
 
-    return segments
+    return tuple(segments)
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_selection_cached(*key: object) -> tuple[str, object | None]:
+    return render(list(_selection_segments_cached(*key)))
+
+
+def selection_segments_from(channel: dict | None, schedule: dict | None = None) -> list[Segment]:
+    """Render the selection footer from rows the caller already holds.
+
+    `channel` is a channels row (telegram id in `channel_id`); `schedule` is a
+    schedules row. Without `channel`, the channel columns joined in by
+    get_schedule_with_channel are used. Saves a get_user_context_details round
+    trip when the handler knows what the selection is.
+    """
+    details: dict = {}
+    if channel is not None:
+        details["channel_name"] = channel.get("channel_name")
+        details["telegram_channel_id"] = channel.get("channel_id")
+    elif schedule is not None:
+        details["channel_name"] = schedule.get("channel_name")
+        details["telegram_channel_id"] = schedule.get("telegram_channel_id")
+    if schedule is not None:
+        details["selected_schedule_id"] = schedule.get("id")
+        details["schedule_name"] = schedule.get("name")
+        details["schedule_state"] = schedule.get("state")
+    return selection_segments(details)
 
 
 async def _selection_summary_for_user(user_id: int) -> tuple[str, object | None]:
     details = await db.get_user_context_details(user_id)
-    segments = selection_segments(details)
-    text, entities = render(segments)
-    return text, entities
+    return _render_selection_cached(*_selection_key(details))
 
 
 async def selection_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show current selection."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None or update.effective_user is None:
         return
 
@@ -74,7 +117,7 @@ async def selection_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 async def clearselection_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Clear current selection."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None or update.effective_user is None:
         return
 
@@ -84,7 +127,7 @@ async def clearselection_command(update: Update, context: ContextTypes.DEFAULT_T
 
 async def selectchannel_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Select a channel as the default target for channel-level operations."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None or update.effective_user is None:
         return
 
@@ -115,15 +158,14 @@ async def selectchannel_command(update: Update, context: ContextTypes.DEFAULT_TY
         selected_schedule_id=None,
     )
 
-    details = await db.get_user_context_details(update.effective_user.id)
-    segments = [Segment("Selected channel.\n\n"), *selection_segments(details)]
+    segments = [Segment("Selected channel.\n\n"), *selection_segments_from(channel)]
     text, entities = render(segments)
     await update.message.reply_text(text, entities=entities)
 
 
 async def selectschedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Select a schedule as the default target for schedule/queue operations."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None or update.effective_user is None:
         return
 
@@ -131,9 +173,8 @@ async def selectschedule_command(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("Usage: /selectschedule <schedule_id>\nTip: use /listschedules first.")
         return
 
-    try:
-        schedule_id = int(context.args[0])
-    except ValueError:
+    schedule_id = parse_int(context.args[0])
+    if schedule_id is None:
         await update.message.reply_text("Invalid schedule id.")
         return
 
@@ -148,8 +189,7 @@ async def selectschedule_command(update: Update, context: ContextTypes.DEFAULT_T
         selected_schedule_id=schedule_id,
     )
 
-    details = await db.get_user_context_details(update.effective_user.id)
-    segments = [Segment("Selected schedule.\n\n"), *selection_segments(details)]
+    segments = [Segment("Selected schedule.\n\n"), *selection_segments_from(None, schedule)]
     text, entities = render(segments)
     await update.message.reply_text(text, entities=entities)
 
@@ -3,135 +3,106 @@
 from __future__ import annotations
 
 import logging
-import os
 from datetime import timezone
-from zoneinfo import ZoneInfo
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from database import queries as db
-from handlers.common import ensure_user_record
-from utils.tg_text import Segment, render
+from handlers.common import RESET_TIMEZONE_WORDS, UNKNOWN_TIMEZONE, UNKNOWN_TIMEZONE_SUFFIX, ensure_user_record_cached
+from scheduler.timing import default_timezone_name, is_valid_timezone
+from utils.tg_text import Segment, render, render_after
 
 logger = logging.getLogger(__name__)
 
 
-def _default_timezone_name() -> str:
-    return os.getenv("DEFAULT_TIMEZONE", "UTC") or "UTC"
-
-
-def _is_valid_timezone(tz_name: str) -> bool:
-    if tz_name.upper() in {"UTC", "ETC/UTC"}:
-        return True
-    try:
-        ZoneInfo(tz_name)
-        return True
-    except Exception:
-        return False
+# Constant message parts, rendered once; handlers only render the
+# user-specific value between them.
+_YOUR_TIMEZONE = render([Segment("Your timezone: ")])
+_DEFAULT_TIMEZONE_SUFFIX = render(
+    [
+        Segment(" (default)\n"),
+        Segment("Set it with "),
+        Segment("/settimezone"),
+        Segment(" using an IANA timezone name like "),
+        Segment("Europe/Amsterdam", code=True),
+        Segment(", "),
+        Segment("UTC", code=True),
+        Segment(", or "),
+        Segment("UTC", code=True),
+        Segment("."),
+    ]
+)
+_CONFIGURED_TIMEZONE_SUFFIX = render(
+    [
+        Segment("\nChange it with "),
+        Segment("/settimezone"),
+        Segment(" or reset to default with "),
+        Segment("/settimezone default"),
+        Segment("."),
+    ]
+)
+_SETTIMEZONE_USAGE = render(
+    [
+        Segment("Usage: "),
+        Segment("/settimezone"),
+        Segment(" "),
+        Segment("<timezone>", code=True),
+        Segment("\nExample: "),
+        Segment("/settimezone"),
+        Segment(" "),
+        Segment("Europe/Amsterdam", code=True),
+        Segment("\nReset: "),
+        Segment("/settimezone default"),
+    ]
+)
+_TIMEZONE_CLEARED = render([Segment("Timezone cleared. Using default: ")])
+_PERIOD = render([Segment(".")])
+_TIMEZONE_SET = render([Segment("Timezone set to ")])
+_TIMEZONE_SET_SUFFIX = render([Segment(".\nThis will be used as the default timezone for new schedules.")])
 
 
 async def gettimezone_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show the user's configured timezone (or default)."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None or update.effective_user is None:
         return
 
     configured = await db.get_user_timezone(update.effective_user.id)
-    effective = configured or _default_timezone_name()
+    effective = configured or default_timezone_name()
 
-    segments: list[Segment] = [
-        Segment("Your timezone: "),
-        Segment(effective, code=True),
-    ]
-    if not configured:
-        segments += [
-            Segment(" (default)\n"),
-            Segment("Set it with "),
-            Segment("/settimezone"),
-            Segment(" using an IANA timezone name like "),
-            Segment("Europe/Amsterdam", code=True),
-            Segment(", "),
-            Segment("UTC", code=True),
-            Segment(", or "),
-            Segment("UTC", code=True),
-            Segment("."),
-        ]
-    else:
-        segments += [
-            Segment("\nChange it with "),
-            Segment("/settimezone"),
-            Segment(" or reset to default with "),
-            Segment("/settimezone default"),
-            Segment("."),
-        ]
-
-    text, entities = render(segments)
+    suffix = _CONFIGURED_TIMEZONE_SUFFIX if configured else _DEFAULT_TIMEZONE_SUFFIX
+    text, entities = render_after(_YOUR_TIMEZONE, [Segment(effective, code=True)], suffix)
     await update.message.reply_text(text, entities=entities)
 
 
 async def settimezone_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Set the user's default timezone for new schedules."""
-    await ensure_user_record(update, context)
+    await ensure_user_record_cached(update, context)
     if update.message is None or update.effective_user is None:
         return
 
     if not context.args or len(context.args) != 1:
-        text, entities = render(
-            [
-                Segment("Usage: "),
-                Segment("/settimezone"),
-                Segment(" "),
-                Segment("<timezone>", code=True),
-                Segment("\nExample: "),
-                Segment("/settimezone"),
-                Segment(" "),
-                Segment("Europe/Amsterdam", code=True),
-                Segment("\nReset: "),
-                Segment("/settimezone default"),
-            ]
-        )
+        text, entities = _SETTIMEZONE_USAGE
         await update.message.reply_text(text, entities=entities)
         return
 
     raw = (context.args[0] or "").strip()
     lowered = raw.lower()
-    if lowered in {"default", "clear", "reset"}:
+    if lowered in RESET_TIMEZONE_WORDS:
         await db.set_user_timezone(update.effective_user.id, None)
-        effective = _default_timezone_name()
-        text, entities = render(
-            [
-                Segment("Timezone cleared. Using default: "),
-                Segment(effective, code=True),
-                Segment("."),
-            ]
-        )
+        effective = default_timezone_name()
+        text, entities = render_after(_TIMEZONE_CLEARED, [Segment(effective, code=True)], _PERIOD)
         await update.message.reply_text(text, entities=entities)
         return
 
-    if not _is_valid_timezone(raw):
-        text, entities = render(
-            [
-                Segment("Unknown timezone: "),
-                Segment(raw, code=True),
-                Segment("\nUse an IANA timezone name like "),
-                Segment("Europe/Amsterdam", code=True),
-                Segment(", "),
-                Segment("UTC", code=True),
-                Segment("."),
-            ]
-        )
+    if not is_valid_timezone(raw):
+        text, entities = render_after(UNKNOWN_TIMEZONE, [Segment(raw, code=True)], UNKNOWN_TIMEZONE_SUFFIX)
         await update.message.reply_text(text, entities=entities)
         return
 
     await db.set_user_timezone(update.effective_user.id, raw)
-    text, entities = render(
-        [
-            Segment("Timezone set to "),
-            Segment(raw, code=True),
-            Segment(".\nThis will be used as the default timezone for new schedules."),
-        ]
-    )
+    text, entities = render_after(_TIMEZONE_SET, [Segment(raw, code=True)], _TIMEZONE_SET_SUFFIX)
     await update.message.reply_text(text, entities=entities)
-    logger.info("User %s set timezone to %r", update.effective_user.id, raw)
-
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("User %s set timezone to %r", update.effective_user.id, raw)
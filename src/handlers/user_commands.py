@@ -9,7 +9,8 @@ from telegram.ext import ContextTypes
 
 from database import queries as db
 from .common import ensure_user_record
-from utils.tg_text import Segment, render
+from .selection import selection_segments
+from utils.tg_text import Segment, render, render_after
 
 logger = logging.getLogger(__name__)
 
@@ -105,33 +106,40 @@ def _onboarding_segments() -> list[Segment]:
     ]
 
 
+# Both replies are constant apart from the optional selection footer, so
+# render them once at import time.
+_HELP_TEXT = _help_text()
+_HELP_PREFIX = render([Segment(_HELP_TEXT), Segment("\n\n")])
+_START_PREFIX = render(
+    [
+        Segment("Telegram Scheduler Bot is running.\n\n"),
+        *_onboarding_segments(),
+        Segment("\nType "),
+        Segment("/help"),
+        Segment(" to see all commands.\n"),
+    ]
+)
+
+
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Welcome message with command overview."""
-    await ensure_user_record(update, context)
+    user = await ensure_user_record(update, context)
 
     if update.message is None:
         return
 
     try:
-        details = await db.get_user_context_details(update.effective_user.id) if update.effective_user else {}
-
-        segments: list[Segment] = [
-            Segment("Telegram Scheduler Bot is running.\n\n"),
-            *_onboarding_segments(),
-            Segment("\nType "),
-            Segment("/help"),
-            Segment(" to see all commands.\n"),
-        ]
+        # New users and users without a selection need no details lookup.
+        details = await db.get_user_context_details(update.effective_user.id) if user.get("has_selection") else {}
 
+        text, entities = _START_PREFIX
         if details.get("telegram_channel_id") or details.get("selected_schedule_id"):
-            from handlers.selection import selection_segments  # local import
+            text, entities = render_after(_START_PREFIX, [Segment("\n"), *selection_segments(details)])
 
-            segments += [Segment("\n"), *selection_segments(details)]
-
-        text, entities = render(segments)
         await update.message.reply_text(text, entities=entities)
-        user_id = update.effective_user.id if update.effective_user else None
-        logger.info("Handled /start for user_id=%s", user_id)
+        if logger.isEnabledFor(logging.INFO):
+            user_id = update.effective_user.id if update.effective_user else None
+            logger.info("Handled /start for user_id=%s", user_id)
     except Exception as e:
         user_id = update.effective_user.id if update.effective_user else None
         logger.error("Error in start_command for user_id=%s: %s", user_id, e, exc_info=True)
@@ -140,21 +148,17 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show help text."""
-    await ensure_user_record(update, context)
+    user = await ensure_user_record(update, context)
 
     if update.message is None:
         return
 
-    help_text = _help_text()
-    details = await db.get_user_context_details(update.effective_user.id) if update.effective_user else {}
+    details = await db.get_user_context_details(update.effective_user.id) if user.get("has_selection") else {}
 
     if details.get("telegram_channel_id") or details.get("selected_schedule_id"):
-        from handlers.selection import selection_segments  # local import
-
-        segments = [Segment(help_text), Segment("\n\n"), *selection_segments(details)]
-        text, entities = render(segments)
+        text, entities = render_after(_HELP_PREFIX, selection_segments(details))
         await update.message.reply_text(text, entities=entities)
         return
 
-    await update.message.reply_text(help_text)
+    await update.message.reply_text(_HELP_TEXT)
 
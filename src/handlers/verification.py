@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
+from collections.abc import Iterator
 
 from telegram import Update
 from telegram.constants import ChatType
@@ -11,35 +13,87 @@ from telegram.ext import ContextTypes
 
 from database import queries as db
 
-from .common import ensure_user_record
+from .common import ensure_user_record, parse_int
 from utils.tg_text import Segment, render
 
 logger = logging.getLogger(__name__)
 
 
-_CODE_CANDIDATE_RE = re.compile(r"[A-Za-z0-9_-]{15,64}")
+_CODE_CANDIDATE_MIN_LEN = 15
+_CODE_CANDIDATE_MAX_LEN = 64
+_CODE_CANDIDATE_RE = re.compile(r"[A-Za-z0-9_-]{%d,%d}" % (_CODE_CANDIDATE_MIN_LEN, _CODE_CANDIDATE_MAX_LEN))
+_MAX_CODE_CANDIDATES = 10
+
+# Maps every ASCII character outside the code alphabet to a space, so that
+# str.translate + str.split cut ASCII text into code-character runs in C.
+_NON_CODE_ASCII_TO_SPACE = str.maketrans(
+    {c: " " for c in map(chr, range(128)) if not (c.isalnum() or c in "_-")}
+)
+
+
+def _iter_code_tokens(text: str) -> Iterator[str]:
+    """Yield the same tokens as _CODE_CANDIDATE_RE.finditer, in order."""
+    if not text.isascii():
+        # Non-ASCII letters aren't in the code alphabet; let the regex handle them.
+        for match in _CODE_CANDIDATE_RE.finditer(text):
+            yield match.group(0)
+        return
+    for run in text.translate(_NON_CODE_ASCII_TO_SPACE).split():
+        if len(run) < _CODE_CANDIDATE_MIN_LEN:
+            continue
+        if len(run) <= _CODE_CANDIDATE_MAX_LEN:
+            yield run
+        else:
+            # Over-long runs are chunked exactly as the regex would.
+            for match in _CODE_CANDIDATE_RE.finditer(run):
+                yield match.group(0)
+
+
+def _code_candidates(text: str, limit: int = _MAX_CODE_CANDIDATES) -> list[str]:
+    """Return up to `limit` distinct code-like tokens, in order of appearance."""
+    if len(text) < _CODE_CANDIDATE_MIN_LEN:
+        return []
+    seen: set[str] = set()
+    out: list[str] = []
+    for candidate in _iter_code_tokens(text):
+        if candidate in seen:
+            continue
+        seen.add(candidate)
+        out.append(candidate)
+        if len(out) >= limit:
+            break
+    return out
 
 
 async def _get_bot_id(context: ContextTypes.DEFAULT_TYPE) -> int:
-    bot_id = getattr(context.bot, "id", None)
-    if bot_id:
-        return int(bot_id)
+    # The bot's id never changes; resolve it once per application.
+    key = "bot_id"
+    cached = context.application.bot_data.get(key)
+    if isinstance(cached, int):
+        return cached
 
-    me = await context.bot.get_me()
-    return int(me.id)
+    bot_id = getattr(context.bot, "id", None)
+    if not bot_id:
+        me = await context.bot.get_me()
+        bot_id = me.id
+    context.application.bot_data[key] = int(bot_id)
+    return int(bot_id)
 
 
 async def resolve_channel_id(context: ContextTypes.DEFAULT_TYPE, raw: str) -> str | None:
     """Resolve a user-supplied channel identifier to a Telegram channel id string.
 
     If resolution fails (e.g. bot removed from channel), returns None.
+    Numeric ids are returned as-is without a Bot API call; only @usernames
+    need get_chat.
     """
+    numeric = parse_int(raw)
+    if numeric is not None:
+        return str(numeric)
+
     try:
         chat = await context.bot.get_chat(raw)
     except Exception:
-        # If it's already a numeric id, let the caller proceed with that.
-        if raw.lstrip("-").isdigit():
-            return raw
         return None
 
     return str(chat.id)
@@ -101,7 +155,11 @@ async def add_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     try:
         bot_id = await _get_bot_id(context)
-        bot_member = await context.bot.get_chat_member(chat.id, bot_id)
+        # Independent lookups: run both round-trips concurrently.
+        bot_member, user_member = await asyncio.gather(
+            context.bot.get_chat_member(chat.id, bot_id),
+            context.bot.get_chat_member(chat.id, user_id),
+        )
         if bot_member.status not in ("administrator", "creator"):
             await update.message.reply_text(
                 "I am not an admin in this channel.\n"
@@ -118,7 +176,6 @@ async def add_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE
                 )
                 return
 
-        user_member = await context.bot.get_chat_member(chat.id, user_id)
         if user_member.status not in ("administrator", "creator"):
             await update.message.reply_text(
                 "You are not an admin of this channel.\n"
@@ -148,30 +205,26 @@ async def add_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 async def channel_post_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Detect posted verification codes in channels and complete verification."""
     message = update.channel_post
-    if message is None:
+    if message is None or message.chat.type != ChatType.CHANNEL:
         # Filters should prevent this, but keep it safe.
         return
 
-    text = (message.text or message.caption or "").strip()
-    if not text:
+    # Posts too short to hold a code (most channel traffic) stop here,
+    # before stripping, regex scanning or any DB work.
+    raw_text = message.text or message.caption
+    if not raw_text or len(raw_text) < _CODE_CANDIDATE_MIN_LEN:
         return
+    text = raw_text.strip()
 
     telegram_channel_id = str(message.chat.id)
-    candidates = list(dict.fromkeys(_CODE_CANDIDATE_RE.findall(text)))
+    candidates = _code_candidates(text)
     if not candidates:
         return
 
-    matched_user_id: int | None = None
-    matched_code: str | None = None
-    for candidate in candidates[:10]:
-        user_id = await db.verify_code(code=candidate, telegram_channel_id=telegram_channel_id)
-        if user_id is not None:
-            matched_user_id = int(user_id)
-            matched_code = candidate
-            break
-
-    if matched_user_id is None:
+    matched = await db.verify_codes_bulk(candidates, telegram_channel_id=telegram_channel_id)
+    if matched is None:
         return
+    matched_code, matched_user_id = matched
 
     channel_name = message.chat.title or (f"@{message.chat.username}" if message.chat.username else telegram_channel_id)
 
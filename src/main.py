@@ -4,8 +4,11 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 from contextlib import suppress
 import logging
+import logging.handlers
+import queue
 import os
 import re
 import signal
@@ -24,17 +27,20 @@ logger = logging.getLogger(__name__)
 class _RedactingFormatter(logging.Formatter):
     """Logging formatter that redacts Telegram bot tokens in output."""
 
-    # Matches: bot<digits>:<token>
-    _BOT_PREFIX_TOKEN_RE = re.compile(r"bot\d{6,}:[A-Za-z0-9_-]{20,}")
+    # Matches: [bot]<digits>:<token> (token-like strings, optionally in a bot URL path)
+    _TOKEN_RE = re.compile(r"(bot)?\d{6,}:[A-Za-z0-9_-]{20,}")
 
-    # Matches: <digits>:<token> (token-like strings)
-    _TOKEN_RE = re.compile(r"\d{6,}:[A-Za-z0-9_-]{20,}")
+    @staticmethod
+    def _redact(match: re.Match[str]) -> str:
+        return "bot<redacted>" if match.group(1) else "<redacted>"
 
     def format(self, record: logging.LogRecord) -> str:
         text = super().format(record)
-        text = self._BOT_PREFIX_TOKEN_RE.sub("bot<redacted>", text)
-        text = self._TOKEN_RE.sub("<redacted>", text)
-        return text
+        # Every token contains a colon; most messages don't, so skip the regex.
+        # (The timestamp prefix always has colons, hence checking the parts.)
+        if ":" not in record.message and not record.exc_text and not record.stack_info:
+            return text
+        return self._TOKEN_RE.sub(self._redact, text)
 
 
 def _configure_logging() -> None:
@@ -46,10 +52,17 @@ def _configure_logging() -> None:
         _RedactingFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     )
 
+    # Handlers only enqueue records; a listener thread does the stdout
+    # writes so a slow stream never stalls the event loop.
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
     root = logging.getLogger()
     root.setLevel(level)
     root.handlers.clear()
-    root.addHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
 
     # Security + noise reduction:
     # httpx logs request URLs (which contain the bot token), so keep it quiet by default.
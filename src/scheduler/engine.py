@@ -3,27 +3,40 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import itertools
+import json
 import logging
 import os
+import random
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from telegram import MessageEntity
 from telegram.ext import ExtBot
 
 from database import queries as db
 from scheduler.executor import send_post
 from scheduler.rate_limiter import RateLimiter
-from scheduler.timing import calculate_next_run, validate_schedule_pattern
+from scheduler.timing import compile_pattern_json, iter_runs, validate_schedule_pattern
 from utils.tg_text import Segment, render
 
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
+# Retry delay in minutes (2, 4, 8, ...), indexed by retry number (index 0 unused).
+_BACKOFF_MINUTES: tuple[int, ...] = tuple(2**n for n in range(MAX_RETRIES + 1))
+# Up to this fraction of the delay is added at random, so posts that failed
+# together (e.g. during a Telegram outage) don't all retry in the same tick.
+_BACKOFF_JITTER = 0.1
 
 CATCHUP_SPACING_SECONDS = 10
 CATCHUP_MAX_RUNS_PER_SCHEDULE = 20
 CATCHUP_MAX_ITERATIONS = 5000
 
+# Channels processed concurrently per tick; bounds SQLite write contention.
+MAX_CONCURRENT_CHANNELS = 8
+
 def _parse_timestamp(value: Any) -> datetime | None:
     if value is None:
         return None
@@ -31,11 +44,7 @@ def _parse_timestamp(value: Any) -> datetime | None:
     if isinstance(value, datetime):
         dt = value
     elif isinstance(value, str):
-        # SQLite CURRENT_TIMESTAMP -> "YYYY-MM-DD HH:MM:SS"
-        try:
-            dt = datetime.fromisoformat(value)
-        except ValueError:
-            return None
+        return _parse_timestamp_str(value)
     else:
         return None
 
@@ -44,6 +53,122 @@ def _parse_timestamp(value: Any) -> datetime | None:
     return dt.astimezone(timezone.utc)
 
 
+@functools.lru_cache(maxsize=8192)
+def _parse_timestamp_str(value: str) -> datetime | None:
+    # Memoized: last_run_at/created_at strings are re-read unchanged every tick,
+    # and datetimes are immutable, so sharing the parsed value is safe.
+    # SQLite CURRENT_TIMESTAMP -> "YYYY-MM-DD HH:MM:SS"
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+# Due-ness checks re-run every tick on rows that rarely change; these memos
+# are keyed by every input (pattern JSON, timezone, base time), so edits
+# simply produce new keys and nothing needs invalidating.
+def _pattern_key(pattern: dict[str, Any]) -> str:
+    return json.dumps(pattern, sort_keys=True)
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_pattern_cached(pattern_key: str) -> tuple[bool, str]:
+    return validate_schedule_pattern(json.loads(pattern_key))
+
+
+@functools.lru_cache(maxsize=4096)
+def _next_run_cached(pattern_key: str, timezone_name: str | None, after: datetime) -> datetime:
+    # `after` is already aware UTC (_parse_timestamp or the tick's now).
+    return compile_pattern_json(pattern_key, timezone_name).next_after(after)
+
+
+# Owner notifications. The constant segments are built once; the factories
+# only splice in the per-schedule values.
+_SEG_SCHEDULE_QUOTE = Segment("Schedule '")
+_SEG_FOR_CHANNEL = Segment("' for channel '")
+_SEG_PERIOD = Segment(".")
+_SEG_INVALID_PATTERN = Segment("' was paused because its pattern is invalid.\n")
+_SEG_REASON = Segment("Reason: ")
+_SEG_FIX_WITH = Segment("\nFix it with /editschedule ")
+_SEG_OR_DELETE = Segment(" or delete it with /deleteschedule ")
+_SEG_QUEUE_EMPTY = Segment("' was paused because the queue is empty.\n")
+_SEG_ADD_POSTS = Segment("Add posts with /bulk ")
+_SEG_THEN_RESUME = Segment(", then resume with /resumeschedule ")
+_SEG_POSTING_FAILED = Segment("Posting failed for schedule '")
+_SEG_OPEN_CHANNEL = Segment("' (channel '")
+_SEG_AFTER_ATTEMPTS = Segment(f"') after {MAX_RETRIES} attempts.\n")
+_SEG_POST_ID = Segment("Post ID: ")
+_SEG_PAUSED_DELETEPOST = Segment("\nThe schedule has been paused.\nUse /deletepost ")
+_SEG_REMOVE_THEN_RESUME = Segment(" to remove the post, then /resumeschedule ")
+
+
+def _invalid_pattern_message(
+    schedule_id: int, schedule_name: str, channel_name: str, reason: str
+) -> tuple[str, list[MessageEntity] | None]:
+    sid = Segment(str(schedule_id), code=True)
+    return render(
+        [
+            _SEG_SCHEDULE_QUOTE,
+            Segment(schedule_name),
+            _SEG_FOR_CHANNEL,
+            Segment(channel_name),
+            _SEG_INVALID_PATTERN,
+            _SEG_REASON,
+            Segment(reason),
+            _SEG_FIX_WITH,
+            sid,
+            _SEG_OR_DELETE,
+            sid,
+            _SEG_PERIOD,
+        ]
+    )
+
+
+def _empty_queue_message(
+    schedule_id: int, schedule_name: str, channel_name: str
+) -> tuple[str, list[MessageEntity] | None]:
+    sid = Segment(str(schedule_id), code=True)
+    return render(
+        [
+            _SEG_SCHEDULE_QUOTE,
+            Segment(schedule_name),
+            _SEG_FOR_CHANNEL,
+            Segment(channel_name),
+            _SEG_QUEUE_EMPTY,
+            _SEG_ADD_POSTS,
+            sid,
+            _SEG_THEN_RESUME,
+            sid,
+            _SEG_PERIOD,
+        ]
+    )
+
+
+def _post_failed_message(
+    schedule_id: int, post_id: int, schedule_name: str, channel_name: str
+) -> tuple[str, list[MessageEntity] | None]:
+    pid = Segment(str(post_id), code=True)
+    return render(
+        [
+            _SEG_POSTING_FAILED,
+            Segment(schedule_name),
+            _SEG_OPEN_CHANNEL,
+            Segment(channel_name),
+            _SEG_AFTER_ATTEMPTS,
+            _SEG_POST_ID,
+            pid,
+            _SEG_PAUSED_DELETEPOST,
+            pid,
+            _SEG_REMOVE_THEN_RESUME,
+            Segment(str(schedule_id), code=True),
+            _SEG_PERIOD,
+        ]
+    )
+
+
 async def start_scheduler(bot: ExtBot) -> None:
     """Run the scheduler loop until cancelled."""
     check_interval = int(os.getenv("SCHEDULER_CHECK_INTERVAL", "60") or "60")
@@ -52,14 +177,16 @@ async def start_scheduler(bot: ExtBot) -> None:
     rate_limiter = RateLimiter(min_interval_seconds=3.0)
 
     logger.info("Scheduler started (check interval: %ss)", check_interval)
-    await _catch_up_missed_posts()
+    # The first tick reuses the rows catch-up just read instead of querying again.
+    schedules: list[dict[str, Any]] | None = await _catch_up_missed_posts()
 
     try:
         while True:
             try:
-                await _process_due_schedules(bot, rate_limiter=rate_limiter)
+                await _process_due_schedules(bot, rate_limiter=rate_limiter, schedules=schedules)
             except Exception as e:
                 logger.error("Error in scheduler tick: %s", e, exc_info=True)
+            schedules = None
 
             sleep_seconds = await _get_sleep_seconds(check_interval)
             await asyncio.sleep(sleep_seconds)
@@ -88,17 +215,12 @@ async def _get_sleep_seconds(default_seconds: int) -> float:
     return float(min(default_seconds, max(1.0, delta)))
 
 
-async def _catch_up_missed_posts() -> None:
-    """On startup, schedule missed posts for near-future execution.
+def _count_missed_runs(schedules: list[dict[str, Any]], now: datetime) -> dict[int, int]:
+    """Count pattern runs missed before `now`, per schedule id (capped).
 
-    This sets queued_posts.scheduled_for for the first N unscheduled queued posts per schedule.
-    The scheduler loop will then wake up in time to process these posts.
+    Pure CPU work; catch-up runs it in a worker thread.
     """
-    now = datetime.now(timezone.utc)
-    schedules = await db.get_active_schedules()
-
-    total_scheduled = 0
-
+    missed_by_schedule: dict[int, int] = {}
     for schedule in schedules:
         schedule_id = int(schedule["id"])
         try:
@@ -108,54 +230,113 @@ async def _catch_up_missed_posts() -> None:
             if base_after is None:
                 continue
 
-            cursor = base_after
             missed = 0
-
-            for _ in range(CATCHUP_MAX_ITERATIONS):
-                next_run = calculate_next_run(schedule, after=cursor)
-                if next_run <= now:
-                    missed += 1
-                    cursor = next_run
-                    if missed >= CATCHUP_MAX_RUNS_PER_SCHEDULE:
-                        break
-                else:
+            for next_run in itertools.islice(iter_runs(schedule, after=base_after), CATCHUP_MAX_ITERATIONS):
+                if next_run > now:
+                    break
+                missed += 1
+                if missed >= CATCHUP_MAX_RUNS_PER_SCHEDULE:
                     break
 
-            if missed <= 0:
-                continue
+            if missed > 0:
+                missed_by_schedule[schedule_id] = missed
+        except Exception as e:
+            logger.error("Catch-up failed for schedule id=%s: %s", schedule_id, e, exc_info=True)
+    return missed_by_schedule
 
-            candidates = await db.get_queued_posts_unscheduled(schedule_id, limit=missed)
-            if not candidates:
-                continue
 
-            updates: list[tuple[int, datetime]] = []
-            base_time = now
-            for i, post in enumerate(candidates[:missed]):
-                post_id = int(post["id"])
-                updates.append((post_id, base_time + timedelta(seconds=CATCHUP_SPACING_SECONDS * i)))
+async def _catch_up_missed_posts() -> list[dict[str, Any]]:
+    """On startup, schedule missed posts for near-future execution.
+
+    This sets queued_posts.scheduled_for for the first N unscheduled queued posts per schedule.
+    The scheduler loop will then wake up in time to process these posts.
+    Returns the active schedules it read (only queued posts were modified).
+    """
+    now = datetime.now(timezone.utc)
+    schedules = await db.get_active_schedules()
+
+    # Walking up to CATCHUP_MAX_ITERATIONS runs per schedule is CPU-bound;
+    # keep it off the event loop so updates are still handled meanwhile.
+    missed_by_schedule = await asyncio.to_thread(_count_missed_runs, schedules, now)
+    if not missed_by_schedule:
+        return schedules
 
-            await db.bulk_update_posts_scheduled_for(updates)
-            total_scheduled += len(updates)
+    unscheduled = await db.get_queued_posts_unscheduled_bulk(
+        list(missed_by_schedule), per_schedule_limit=max(missed_by_schedule.values())
+    )
 
-            logger.info(
-                "Catch-up scheduled %s posts for schedule id=%s",
-                len(updates),
-                schedule_id,
-            )
-        except Exception as e:
-            logger.error("Catch-up failed for schedule id=%s: %s", schedule_id, e, exc_info=True)
+    updates: list[tuple[int, datetime]] = []
+    scheduled_counts: dict[int, int] = {}
+    for schedule_id, missed in missed_by_schedule.items():
+        candidates = (unscheduled.get(schedule_id) or [])[:missed]
+        if not candidates:
+            continue
+        for i, post in enumerate(candidates):
+            updates.append((int(post["id"]), now + timedelta(seconds=CATCHUP_SPACING_SECONDS * i)))
+        scheduled_counts[schedule_id] = len(candidates)
+
+    if not updates:
+        return schedules
+
+    try:
+        await db.bulk_update_posts_scheduled_for(updates)
+    except Exception as e:
+        logger.error("Catch-up failed to schedule %s posts: %s", len(updates), e, exc_info=True)
+        return schedules
 
-    if total_scheduled:
-        logger.info("Catch-up scheduled %s posts total", total_scheduled)
+    for schedule_id, count in scheduled_counts.items():
+        logger.info("Catch-up scheduled %s posts for schedule id=%s", count, schedule_id)
+    logger.info("Catch-up scheduled %s posts total", len(updates))
 
+    return schedules
 
-async def _process_due_schedules(bot: ExtBot, *, rate_limiter: RateLimiter) -> None:
+
+async def _process_due_schedules(
+    bot: ExtBot,
+    *,
+    rate_limiter: RateLimiter,
+    schedules: list[dict[str, Any]] | None = None,
+) -> None:
     now = datetime.now(timezone.utc)
-    schedules = await db.get_active_schedules()
+    if schedules is None:
+        schedules = await db.get_active_schedules()
+    if not schedules:
+        return
+    next_posts = await db.get_next_queued_posts_bulk([int(s["id"]) for s in schedules])
 
+    # Schedules of one channel run in order; different channels run
+    # concurrently so a slow send doesn't hold up every other channel.
+    by_channel: dict[str, list[dict[str, Any]]] = {}
+    for schedule in schedules:
+        by_channel.setdefault(str(schedule["telegram_channel_id"]), []).append(schedule)
+
+    limit = asyncio.Semaphore(MAX_CONCURRENT_CHANNELS)
+    async with asyncio.TaskGroup() as tg:
+        for group in by_channel.values():
+            tg.create_task(
+                _process_channel_schedules(
+                    bot, group, next_posts=next_posts, now=now, rate_limiter=rate_limiter, limit=limit
+                )
+            )
+
+
+async def _process_channel_schedules(
+    bot: ExtBot,
+    schedules: list[dict[str, Any]],
+    *,
+    next_posts: dict[int, dict[str, Any]],
+    now: datetime,
+    rate_limiter: RateLimiter,
+    limit: asyncio.Semaphore,
+) -> None:
+    # The slot is taken per schedule, not for the whole group, so a channel
+    # with many due posts (each spaced by the rate limiter) doesn't keep
+    # other channels waiting for a slot until all of its sends are done.
     for schedule in schedules:
         try:
-            await _process_schedule(bot, schedule, now=now, rate_limiter=rate_limiter)
+            post = next_posts.get(int(schedule["id"]))
+            async with limit:
+                await _process_schedule(bot, schedule, post=post, now=now, rate_limiter=rate_limiter)
         except Exception as e:
             logger.error("Error processing schedule id=%s: %s", schedule.get("id"), e, exc_info=True)
 
@@ -164,43 +345,34 @@ async def _process_schedule(
     bot: ExtBot,
     schedule: dict[str, Any],
     *,
+    post: dict[str, Any] | None,
     now: datetime,
     rate_limiter: RateLimiter,
 ) -> None:
+    """Send the schedule's next post if due; `post` is its queue head, if any."""
     schedule_id = int(schedule["id"])
     telegram_channel_id = str(schedule["telegram_channel_id"])
     owner_user_id = int(schedule["owner_user_id"])
     schedule_name = schedule.get("name") or f"Schedule {schedule_id}"
     channel_name = schedule.get("channel_name") or telegram_channel_id
 
-    ok, reason = validate_schedule_pattern(schedule.get("pattern") or {})
+    pattern_key = _pattern_key(schedule.get("pattern") or {})
+    ok, reason = _validate_pattern_cached(pattern_key)
     if not ok:
         await db.update_schedule_state(schedule_id, "paused")
         await _notify_user(
             bot,
             owner_user_id,
-            *render(
-                [
-                    Segment("Schedule '"),
-                    Segment(schedule_name),
-                    Segment("' for channel '"),
-                    Segment(channel_name),
-                    Segment("' was paused because its pattern is invalid.\n"),
-                    Segment("Reason: "),
-                    Segment(str(reason)),
-                    Segment("\nFix it with /editschedule "),
-                    Segment(str(schedule_id), code=True),
-                    Segment(" or delete it with /deleteschedule "),
-                    Segment(str(schedule_id), code=True),
-                    Segment("."),
-                ]
-            ),
+            *_invalid_pattern_message(schedule_id, schedule_name, channel_name, str(reason)),
         )
         logger.warning("Paused schedule id=%s due to invalid pattern: %s", schedule_id, reason)
         return
 
-    post = await db.get_next_queued_post(schedule_id)
     if post is None:
+        # Same re-check as before a send: posts may have been queued since the
+        # tick's bulk fetch, and pausing on a stale snapshot would be wrong.
+        if await db.get_next_queued_post(schedule_id) is not None:
+            return
         await _handle_empty_queue(
             bot,
             schedule=schedule,
@@ -210,23 +382,24 @@ async def _process_schedule(
 
     post_id = int(post["id"])
     scheduled_for = _parse_timestamp(post.get("scheduled_for"))
-    if scheduled_for is not None and scheduled_for > now:
-        return
-
-    last_run_at = _parse_timestamp(schedule.get("last_run_at"))
-    created_at = _parse_timestamp(schedule.get("created_at"))
-    base_after = last_run_at or created_at or now
-
-    due_by_pattern = False
-    if scheduled_for is None:
-        next_run = calculate_next_run(schedule, after=base_after)
-        due_by_pattern = now >= next_run
-
-    due = (scheduled_for is not None and scheduled_for <= now) or due_by_pattern
-    if not due:
-        return
+    if scheduled_for is not None:
+        if scheduled_for > now:
+            return
+    else:
+        # Only pattern-driven posts need the schedule's base time.
+        last_run_at = _parse_timestamp(schedule.get("last_run_at"))
+        created_at = _parse_timestamp(schedule.get("created_at"))
+        base_after = last_run_at or created_at or now
+        if now < _next_run_cached(pattern_key, schedule.get("timezone"), base_after):
+            return
 
     await rate_limiter.wait_if_needed(telegram_channel_id)
+    # The head was bulk-fetched at the start of the tick; if it was deleted or
+    # reordered since (or during the rate-limit wait), leave it to the next tick.
+    head = await db.get_next_queued_post(schedule_id)
+    if head is None or int(head["id"]) != post_id:
+        return
+    post = head
     ok = await send_post(bot, telegram_channel_id=telegram_channel_id, post=post)
 
     if ok:
@@ -253,24 +426,7 @@ async def _handle_empty_queue(bot: ExtBot, *, schedule: dict[str, Any], owner_us
     channel_name = schedule.get("channel_name") or schedule.get("telegram_channel_id") or "channel"
     schedule_name = schedule.get("name") or f"Schedule {schedule_id}"
 
-    await _notify_user(
-        bot,
-        owner_user_id,
-        *render(
-            [
-                Segment("Schedule '"),
-                Segment(schedule_name),
-                Segment("' for channel '"),
-                Segment(channel_name),
-                Segment("' was paused because the queue is empty.\n"),
-                Segment("Add posts with /bulk "),
-                Segment(str(schedule_id), code=True),
-                Segment(", then resume with /resumeschedule "),
-                Segment(str(schedule_id), code=True),
-                Segment("."),
-            ]
-        ),
-    )
+    await _notify_user(bot, owner_user_id, *_empty_queue_message(schedule_id, schedule_name, channel_name))
 
 
 async def _handle_post_failure(
@@ -289,7 +445,8 @@ async def _handle_post_failure(
     await db.increment_delivery_stats_daily(day=now.date(), send_failures_delta=1)
 
     if retry_count <= MAX_RETRIES:
-        delay_minutes = 2 ** retry_count  # 2, 4, 8
+        delay_minutes = _BACKOFF_MINUTES[retry_count]
+        delay_minutes += random.uniform(0, delay_minutes * _BACKOFF_JITTER)
         retry_time = now + timedelta(minutes=delay_minutes)
         await db.update_post_retry(post_id, retry_count=retry_count, scheduled_for=retry_time)
         logger.warning(
@@ -310,22 +467,7 @@ async def _handle_post_failure(
     await _notify_user(
         bot,
         owner_user_id,
-        *render(
-            [
-                Segment("Posting failed for schedule '"),
-                Segment(schedule_name),
-                Segment("' (channel '"),
-                Segment(channel_name),
-                Segment(f"') after {MAX_RETRIES} attempts.\n"),
-                Segment("Post ID: "),
-                Segment(str(post_id), code=True),
-                Segment("\nThe schedule has been paused.\nUse /deletepost "),
-                Segment(str(post_id), code=True),
-                Segment(" to remove the post, then /resumeschedule "),
-                Segment(str(schedule_id), code=True),
-                Segment("."),
-            ]
-        ),
+        *_post_failed_message(schedule_id, post_id, schedule_name, channel_name),
     )
 
 
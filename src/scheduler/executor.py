@@ -2,23 +2,34 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
-import os
-import re
-import uuid
 from contextlib import ExitStack
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Any
 
-from telegram import InputMediaDocument, InputMediaPhoto, InputMediaVideo, MessageEntity
+from telegram import InputFile, InputMediaDocument, InputMediaPhoto, InputMediaVideo, MessageEntity
 from telegram.constants import ParseMode
-from telegram.error import BadRequest
+from telegram.error import TelegramError
 from telegram.ext import ExtBot
 
 logger = logging.getLogger(__name__)
 
-_FILE_ID_ERROR_RE = re.compile(r"(file[_ ]?id|file identifier|wrong file)", re.IGNORECASE)
+# Lowercase substrings of Telegram errors caused by a stale or invalid file_id.
+_FILE_ID_ERROR_TOKENS = ("file_id", "file id", "fileid", "file identifier", "wrong file")
+# media_type -> (ExtBot method name, media keyword argument) for single-file posts.
+_SENDERS: dict[str, tuple[str, str]] = {
+    "photo": ("send_photo", "photo"),
+    "video": ("send_video", "video"),
+    "document": ("send_document", "document"),
+}
+_INPUT_MEDIA: dict[str, type[InputMediaPhoto | InputMediaVideo | InputMediaDocument]] = {
+    "photo": InputMediaPhoto,
+    "video": InputMediaVideo,
+    "document": InputMediaDocument,
+}
+_REUPLOADABLE_MEDIA_TYPES = frozenset(_SENDERS)
 
 
 async def send_post(bot: ExtBot, *, telegram_channel_id: str, post: dict[str, Any]) -> bool:
@@ -76,7 +87,7 @@ async def send_post(bot: ExtBot, *, telegram_channel_id: str, post: dict[str, An
         if (
             file_id
             and not file_path
-            and media_type in {"photo", "video", "document"}
+            and media_type in _REUPLOADABLE_MEDIA_TYPES
             and _looks_like_file_id_error(e)
         ):
             ok = await _retry_with_download(
@@ -116,101 +127,55 @@ async def _send_post_once(
     entities = _decode_entities(caption_entities)
     parse_mode = None if entities else _to_parse_mode(caption_parse_mode)
 
-    match media_type:
-        case "photo":
-            payload = _resolve_file_ref(file_id=file_id, file_path=file_path)
+    sender = _SENDERS.get(media_type)  # type: ignore[arg-type]
+    if sender is not None:
+        method_name, kw_name = sender
+        send = getattr(bot, method_name)
+        payload = _resolve_file_ref(file_id=file_id, file_path=file_path)
+        with ExitStack() as stack:
             if isinstance(payload, Path):
-                with payload.open("rb") as f:
-                    await bot.send_photo(
-                        chat_id=telegram_channel_id,
-                        photo=f,
-                        caption=caption,
-                        parse_mode=parse_mode,
-                        caption_entities=entities,
-                    )
-            else:
-                await bot.send_photo(
-                    chat_id=telegram_channel_id,
-                    photo=payload,
-                    caption=caption,
-                    parse_mode=parse_mode,
-                    caption_entities=entities,
-                )
-            return True
-
-        case "video":
-            payload = _resolve_file_ref(file_id=file_id, file_path=file_path)
-            if isinstance(payload, Path):
-                with payload.open("rb") as f:
-                    await bot.send_video(
-                        chat_id=telegram_channel_id,
-                        video=f,
-                        caption=caption,
-                        parse_mode=parse_mode,
-                        caption_entities=entities,
-                    )
-            else:
-                await bot.send_video(
-                    chat_id=telegram_channel_id,
-                    video=payload,
-                    caption=caption,
-                    parse_mode=parse_mode,
-                    caption_entities=entities,
-                )
-            return True
-
-        case "document":
-            payload = _resolve_file_ref(file_id=file_id, file_path=file_path)
-            if isinstance(payload, Path):
-                with payload.open("rb") as f:
-                    await bot.send_document(
-                        chat_id=telegram_channel_id,
-                        document=f,
-                        caption=caption,
-                        parse_mode=parse_mode,
-                        caption_entities=entities,
-                    )
-            else:
-                await bot.send_document(
-                    chat_id=telegram_channel_id,
-                    document=payload,
-                    caption=caption,
-                    parse_mode=parse_mode,
-                    caption_entities=entities,
-                )
-            return True
-
-        case "media_group":
-            media_group_data = post.get("media_group_data")
-            if not media_group_data:
-                raise ValueError("media_group_data missing")
-
-            forward_refs = _parse_media_group_forward_refs(media_group_data)
-            if forward_refs is not None:
-                from_chat_id, message_ids = forward_refs
-                # Use forward_messages so Telegram can preserve grouping/attribution as much as possible.
-                result = await bot.forward_messages(
-                    chat_id=telegram_channel_id,
-                    from_chat_id=from_chat_id,
-                    message_ids=message_ids,
-                )
-                if len(result) != len(message_ids):
-                    raise RuntimeError("forward_messages returned fewer results than requested")
-                return True
+                payload = stack.enter_context(payload.open("rb"))
+            await send(
+                chat_id=telegram_channel_id,
+                caption=caption,
+                parse_mode=parse_mode,
+                caption_entities=entities,
+                **{kw_name: payload},
+            )
+        return True
 
-            with ExitStack() as stack:
-                media = _parse_media_group(media_group_data, stack=stack)
-                await bot.send_media_group(chat_id=telegram_channel_id, media=media)
-            return True
+    if media_type != "media_group":
+        raise ValueError(f"Unsupported media_type: {media_type}")
+
+    media_group_data = post.get("media_group_data")
+    if not media_group_data:
+        raise ValueError("media_group_data missing")
+
+    # Decode once; both the forward check and the InputMedia build read the items.
+    items = _load_media_group_items(media_group_data)
+    forward_refs = _parse_media_group_forward_refs(items)
+    if forward_refs is not None:
+        from_chat_id, message_ids = forward_refs
+        # Use forward_messages so Telegram can preserve grouping/attribution as much as possible.
+        result = await bot.forward_messages(
+            chat_id=telegram_channel_id,
+            from_chat_id=from_chat_id,
+            message_ids=message_ids,
+        )
+        if len(result) != len(message_ids):
+            raise RuntimeError("forward_messages returned fewer results than requested")
+        return True
 
-        case _:
-            raise ValueError(f"Unsupported media_type: {media_type}")
+    with ExitStack() as stack:
+        media = _parse_media_group(items, stack=stack)
+        await bot.send_media_group(chat_id=telegram_channel_id, media=media)
+    return True
 
 
 def _looks_like_file_id_error(exc: Exception) -> bool:
-    if isinstance(exc, BadRequest):
-        return bool(_FILE_ID_ERROR_RE.search(str(exc)))
-    return bool(_FILE_ID_ERROR_RE.search(str(exc)))
+    # TelegramError keeps the API description on .message; skip __str__ for it.
+    message = (exc.message if isinstance(exc, TelegramError) else str(exc)).lower()
+    return any(token in message for token in _FILE_ID_ERROR_TOKENS)
 
 
 async def _retry_with_download(
@@ -225,57 +190,35 @@ async def _retry_with_download(
 ) -> bool:
     """Download by file_id and retry sending once.
 
-    This is a best-effort fallback when a stored file_id becomes invalid.
+    This is a best-effort fallback when a stored file_id becomes invalid. The
+    Bot API caps getFile downloads at 20 MB, so the file is buffered in memory
+    and re-uploaded directly instead of round-tripping through a temp file.
     """
-    temp_dir = Path(os.getenv("DOWNLOAD_TEMP_DIR", "data/temp"))
-    temp_dir.mkdir(parents=True, exist_ok=True)
-
-    tmp_path = temp_dir / f"tg_{uuid.uuid4().hex}"
-
     try:
         tg_file = await bot.get_file(file_id)
-        await tg_file.download_to_drive(str(tmp_path))
-
-        with tmp_path.open("rb") as f:
-            entities = _decode_entities(caption_entities)
-            parse_mode = None if entities else _to_parse_mode(caption_parse_mode)
-            if media_type == "photo":
-                await bot.send_photo(
-                    chat_id=telegram_channel_id,
-                    photo=f,
-                    caption=caption,
-                    parse_mode=parse_mode,
-                    caption_entities=entities,
-                )
-            elif media_type == "video":
-                await bot.send_video(
-                    chat_id=telegram_channel_id,
-                    video=f,
-                    caption=caption,
-                    parse_mode=parse_mode,
-                    caption_entities=entities,
-                )
-            elif media_type == "document":
-                await bot.send_document(
-                    chat_id=telegram_channel_id,
-                    document=f,
-                    caption=caption,
-                    parse_mode=parse_mode,
-                    caption_entities=entities,
-                )
-            else:
-                return False
+        # Keep Telegram's server-side file name so re-uploaded documents retain their extension.
+        filename = PurePosixPath(tg_file.file_path).name if tg_file.file_path else None
+        data = InputFile(bytes(await tg_file.download_as_bytearray()), filename=filename)
+
+        entities = _decode_entities(caption_entities)
+        parse_mode = None if entities else _to_parse_mode(caption_parse_mode)
+        sender = _SENDERS.get(media_type)
+        if sender is None:
+            return False
+        method_name, kw_name = sender
+        await getattr(bot, method_name)(
+            chat_id=telegram_channel_id,
+            caption=caption,
+            parse_mode=parse_mode,
+            caption_entities=entities,
+            **{kw_name: data},
+        )
 
         logger.info("Recovered by downloading and re-uploading media_type=%s", media_type)
         return True
     except Exception as e:
         logger.error("Download fallback failed for media_type=%s: %s", media_type, e, exc_info=True)
         return False
-    finally:
-        try:
-            tmp_path.unlink(missing_ok=True)
-        except Exception:
-            pass
 
 
 def _resolve_file_ref(*, file_id: str | None, file_path: str | None) -> str | Path:
@@ -286,8 +229,16 @@ def _resolve_file_ref(*, file_id: str | None, file_path: str | None) -> str | Pa
     raise ValueError("No file_id or file_path available")
 
 
+def _load_media_group_items(media_group_data: str | list[Any]) -> list[Any]:
+    """Decode media_group_data (JSON text or an already-decoded list)."""
+    items = json.loads(media_group_data) if isinstance(media_group_data, str) else media_group_data
+    if not isinstance(items, list) or not items:
+        raise ValueError("media_group_data must be a non-empty list")
+    return items
+
+
 def _parse_media_group(
-    media_group_data: str,
+    media_group_data: str | list[Any],
     *,
     stack: ExitStack,
 ) -> list[InputMediaPhoto | InputMediaVideo | InputMediaDocument]:
@@ -300,9 +251,7 @@ def _parse_media_group(
     - caption_parse_mode (optional): NULL (plain), 'markdownv2', or 'html'
     - caption_entities (optional): JSON list or list of Telegram MessageEntity dicts
     """
-    items = json.loads(media_group_data)
-    if not isinstance(items, list) or not items:
-        raise ValueError("media_group_data must be a non-empty list")
+    items = _load_media_group_items(media_group_data)
 
     media: list[InputMediaPhoto | InputMediaVideo | InputMediaDocument] = []
     for item in items:
@@ -313,33 +262,26 @@ def _parse_media_group(
         caption = item.get("caption")
         caption_parse_mode = item.get("caption_parse_mode")
         caption_entities = item.get("caption_entities")
-        payload = _resolve_file_ref(file_id=item.get("file_id"), file_path=item.get("file_path"))
-        if isinstance(payload, Path):
-            payload = stack.enter_context(payload.open("rb"))
+        # Telegram-sourced groups are file_id-backed; only local files need opening.
+        payload: Any = item.get("file_id")
+        if not payload:
+            path = _resolve_file_ref(file_id=None, file_path=item.get("file_path"))
+            payload = stack.enter_context(path.open("rb"))  # type: ignore[union-attr]
 
         entities = _decode_entities(caption_entities)
         parse_mode = None if entities else _to_parse_mode(caption_parse_mode)
 
-        match media_type:
-            case "photo":
-                media.append(
-                    InputMediaPhoto(media=payload, caption=caption, parse_mode=parse_mode, caption_entities=entities)
-                )
-            case "video":
-                media.append(
-                    InputMediaVideo(media=payload, caption=caption, parse_mode=parse_mode, caption_entities=entities)
-                )
-            case "document":
-                media.append(
-                    InputMediaDocument(media=payload, caption=caption, parse_mode=parse_mode, caption_entities=entities)
-                )
-            case _:
-                raise ValueError(f"Unsupported media_type in media group: {media_type}")
+        input_media_cls = _INPUT_MEDIA.get(media_type) if isinstance(media_type, str) else None
+        if input_media_cls is None:
+            raise ValueError(f"Unsupported media_type in media group: {media_type}")
+        media.append(
+            input_media_cls(media=payload, caption=caption, parse_mode=parse_mode, caption_entities=entities)
+        )
 
     return media
 
 
-def _parse_media_group_forward_refs(media_group_data: str) -> tuple[int, list[int]] | None:
+def _parse_media_group_forward_refs(media_group_data: str | list[Any]) -> tuple[int, list[int]] | None:
     """Parse media_group_data for forwarding metadata.
 
     Returns (from_chat_id, message_ids) if every item has:
@@ -349,7 +291,7 @@ def _parse_media_group_forward_refs(media_group_data: str) -> tuple[int, list[in
     Otherwise returns None (meaning: send as a copied media group).
     """
     try:
-        items = json.loads(media_group_data)
+        items = json.loads(media_group_data) if isinstance(media_group_data, str) else media_group_data
     except Exception:
         return None
 
@@ -386,23 +328,37 @@ def _to_parse_mode(value: str | None) -> str | None:
     return None
 
 
-def _decode_entities(value: Any) -> list[MessageEntity] | None:
-    """Decode caption entities from DB/JSON into MessageEntity objects."""
-    if value is None:
-        return None
+def _decode_entities(value: Any) -> tuple[MessageEntity, ...] | None:
+    """Decode caption entities from DB/JSON into MessageEntity objects.
 
-    data: Any
-    if isinstance(value, str) and value.strip():
+    Results are cached by raw JSON text; MessageEntity objects are immutable,
+    so the returned tuple is shared between calls.
+    """
+    if isinstance(value, str):
+        return _decode_entities_json(value)
+    if isinstance(value, list):
         try:
-            data = json.loads(value)
-        except Exception:
-            return None
-    else:
-        data = value
+            key = json.dumps(value, sort_keys=True)
+        except (TypeError, ValueError):
+            return _build_entities(value)
+        return _decode_entities_json(key)
+    return None
+
 
-    if not isinstance(data, list) or not data:
+@functools.lru_cache(maxsize=1024)
+def _decode_entities_json(raw: str) -> tuple[MessageEntity, ...] | None:
+    if not raw.strip():
         return None
+    try:
+        data = json.loads(raw)
+    except Exception:
+        return None
+    if not isinstance(data, list):
+        return None
+    return _build_entities(data)
 
+
+def _build_entities(data: list[Any]) -> tuple[MessageEntity, ...] | None:
     entities: list[MessageEntity] = []
     for raw in data:
         if not isinstance(raw, dict):
@@ -415,5 +371,4 @@ def _decode_entities(value: Any) -> list[MessageEntity] | None:
             except Exception:
                 continue
 
-    return entities or None
-
+    return tuple(entities) or None
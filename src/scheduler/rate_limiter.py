@@ -4,8 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections import defaultdict
-from datetime import datetime, timezone
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -15,22 +14,22 @@ class RateLimiter:
 
     def __init__(self, *, min_interval_seconds: float = 3.0) -> None:
         self._min_interval_seconds = float(min_interval_seconds)
-        self._last_post_at: dict[str, datetime | None] = defaultdict(lambda: None)
+        # Monotonic clock readings; only differences matter here.
+        self._last_post_at: dict[str, float] = {}
 
     async def wait_if_needed(self, telegram_channel_id: str) -> None:
         """Wait if posting too quickly to the same channel."""
         last = self._last_post_at.get(telegram_channel_id)
-        now = datetime.now(timezone.utc)
+        now = time.monotonic()
         if last is not None:
-            elapsed = (now - last).total_seconds()
-            if elapsed < self._min_interval_seconds:
-                wait_time = self._min_interval_seconds - elapsed
+            wait_time = self._min_interval_seconds - (now - last)
+            if wait_time > 0:
                 logger.debug(
                     "Rate limit: waiting %.2fs for channel %s",
                     wait_time,
                     telegram_channel_id,
                 )
                 await asyncio.sleep(wait_time)
+                now = time.monotonic()
 
-        self._last_post_at[telegram_channel_id] = datetime.now(timezone.utc)
-
+        self._last_post_at[telegram_channel_id] = now
@@ -5,8 +5,14 @@ All returned datetimes are timezone-aware and in UTC.
 
 from __future__ import annotations
 
+import bisect
+import functools
+import itertools
+import json
 import logging
 import os
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, tzinfo
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -22,14 +28,26 @@ WEEKDAY_NAME_TO_INT: dict[str, int] = {
     "saturday": 5,
     "sunday": 6,
 }
+_UTC_NAMES = frozenset({"UTC", "ETC/UTC"})
+
+
+@functools.cache
+def default_timezone_name() -> str:
+    """DEFAULT_TIMEZONE from the environment, or UTC."""
+    # Resolved lazily: main() loads .env after this module is imported.
+    return os.getenv("DEFAULT_TIMEZONE", "UTC") or "UTC"
 
 
 def _get_timezone(tz_name: str | None) -> tzinfo:
-    if not tz_name:
-        tz_name = os.getenv("DEFAULT_TIMEZONE", "UTC")
+    return _resolve_timezone(tz_name or default_timezone_name())
+
 
+@functools.lru_cache(maxsize=128)
+def _resolve_timezone(tz_name: str) -> tzinfo:
+    # Cached including fallbacks, so a misspelled zone is looked up (and
+    # warned about) once rather than on every tick.
     # Always support UTC even if system tzdata is missing.
-    if str(tz_name).upper() in {"UTC", "ETC/UTC"}:
+    if str(tz_name).upper() in _UTC_NAMES:
         return timezone.utc
 
     try:
@@ -45,16 +63,45 @@ def _get_timezone(tz_name: str | None) -> tzinfo:
         return timezone.utc
 
 
+@functools.lru_cache(maxsize=1024)
+def is_valid_timezone(tz_name: str) -> bool:
+    """Whether tz_name is UTC or an IANA zone available to ZoneInfo.
+
+    Memoized, including misses, so repeated names don't hit tzdata on disk.
+    """
+    if tz_name.upper() in _UTC_NAMES:
+        return True
+    try:
+        ZoneInfo(tz_name)
+        return True
+    except Exception:
+        return False
+
+
 def _ensure_aware_utc(dt: datetime) -> datetime:
     if dt.tzinfo is None:
         return dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
 
+@functools.lru_cache(maxsize=1024)
 def parse_time_string(value: str) -> tuple[int, int] | None:
-    """Parse HH:MM into (hour, minute)."""
+    """Parse HH:MM into (hour, minute).
+
+    Memoized: schedules reuse a handful of time strings on every validation
+    and next-run calculation.
+    """
+    value = value.strip()
+    if len(value) == 5 and value[2] == ":" and value.isascii():
+        # Canonical "HH:MM": digit arithmetic, no split/int.
+        h1, h2, m1, m2 = (ord(c) - 48 for c in (value[0], value[1], value[3], value[4]))
+        if 0 <= h1 <= 9 and 0 <= h2 <= 9 and 0 <= m1 <= 9 and 0 <= m2 <= 9:
+            hour = h1 * 10 + h2
+            minute = m1 * 10 + m2
+            return (hour, minute) if hour <= 23 and minute <= 59 else None
+
     try:
-        hour_str, minute_str = value.strip().split(":")
+        hour_str, minute_str = value.split(":")
         hour = int(hour_str)
         minute = int(minute_str)
     except Exception:
@@ -100,27 +147,34 @@ def validate_schedule_pattern(pattern: dict) -> tuple[bool, str]:
     return False, "Unknown schedule type. Supported types: interval, daily, weekly."
 
 
-def calculate_next_run(
-    schedule: dict,
-    *,
-    after: datetime | None = None,
-) -> datetime:
-    """Calculate when a schedule should run next.
+@dataclass(frozen=True)
+class CompiledSchedule:
+    """A validated schedule pattern with its timezone and times pre-parsed."""
 
-    Args:
-        schedule: Schedule dict including keys: pattern, timezone (optional).
-        after: Base time. If omitted, uses current UTC time.
+    kind: str
+    tz: tzinfo
+    interval: timedelta = timedelta(0)
+    times: tuple[tuple[int, int], ...] = ()
+    # Bit n set => weekday n (Monday = 0) is a posting day.
+    day_mask: int = 0
+
+    def next_after(self, after_utc: datetime) -> datetime:
+        """Next run strictly after `after_utc` (aware UTC)."""
+        match self.kind:
+            case "interval":
+                return after_utc + self.interval
+            case "daily":
+                return _next_daily_at(after_utc, self.times, self.tz)
+            case _:
+                return _next_weekly_at(after_utc, self.day_mask, self.times, self.tz)
 
-    Returns:
-        Next run time (UTC, timezone-aware).
+
+def compile_schedule(schedule: dict) -> CompiledSchedule:
+    """Validate a schedule's pattern and pre-parse it for next-run calculations.
 
     Raises:
         ValueError: If the schedule pattern is invalid.
     """
-    if after is None:
-        after = datetime.now(timezone.utc)
-    after_utc = _ensure_aware_utc(after)
-
     pattern = schedule.get("pattern") or {}
     ok, reason = validate_schedule_pattern(pattern)
     if not ok:
@@ -135,29 +189,114 @@ def calculate_next_run(
             delta = timedelta(hours=hours, minutes=minutes)
             if delta.total_seconds() <= 0:
                 raise ValueError("Interval must be greater than 0.")
-            return after_utc + delta
+            return CompiledSchedule("interval", tz, interval=delta)
 
         case "daily":
-            return _next_daily_occurrence(after_utc, pattern["times"], tz)
+            return CompiledSchedule("daily", tz, times=_sorted_times(pattern["times"], "Daily"))
 
         case "weekly":
-            return _next_weekly_occurrence(after_utc, pattern["days"], pattern["times"], tz)
+            day_mask = 0
+            for day in pattern["days"]:
+                day_mask |= 1 << WEEKDAY_NAME_TO_INT[day.lower()]
+            return CompiledSchedule("weekly", tz, times=_sorted_times(pattern["times"], "Weekly"), day_mask=day_mask)
 
         case _:
             raise ValueError("Unknown schedule type.")
 
 
-def _next_daily_occurrence(after_utc: datetime, times: list[str], tz: tzinfo) -> datetime:
-    after_local = after_utc.astimezone(tz)
-    parsed_times = sorted({parse_time_string(t) for t in times if parse_time_string(t)})
+@functools.lru_cache(maxsize=4096)
+def compile_pattern_json(pattern_json: str, timezone_name: str | None) -> CompiledSchedule:
+    """Memoized compile_schedule for a JSON-serialized pattern (sort_keys=True).
+
+    Raises:
+        ValueError: If the schedule pattern is invalid.
+    """
+    return compile_schedule({"pattern": json.loads(pattern_json), "timezone": timezone_name})
+
+
+def calculate_next_run(
+    schedule: dict,
+    *,
+    after: datetime | None = None,
+) -> datetime:
+    """Calculate when a schedule should run next.
+
+    Args:
+        schedule: Schedule dict including keys: pattern, timezone (optional).
+        after: Base time. If omitted, uses current UTC time.
+
+    Returns:
+        Next run time (UTC, timezone-aware).
+
+    Raises:
+        ValueError: If the schedule pattern is invalid.
+    """
+    if after is None:
+        after = datetime.now(timezone.utc)
+    return compile_schedule(schedule).next_after(_ensure_aware_utc(after))
+
+
+def iter_next_runs(
+    schedule: dict,
+    *,
+    after: datetime | None = None,
+    count: int,
+) -> list[datetime]:
+    """Return the next `count` run times for a schedule (UTC, timezone-aware).
+
+    Equivalent to chaining `calculate_next_run` `count` times, but validates the
+    pattern and resolves the timezone only once.
+
+    Raises:
+        ValueError: If the schedule pattern is invalid.
+    """
+    if count <= 0:
+        return []
+    return list(itertools.islice(iter_runs(schedule, after=after), count))
+
+
+def iter_runs(schedule: dict, *, after: datetime | None = None) -> Iterator[datetime]:
+    """Lazily yield successive run times for a schedule (UTC, timezone-aware).
+
+    The pattern is validated and pre-parsed once, up front; each step then
+    only advances the cursor. The iterator is unbounded, so callers slice it.
+
+    Raises:
+        ValueError: If the schedule pattern is invalid.
+    """
+    if after is None:
+        after = datetime.now(timezone.utc)
+    cursor = _ensure_aware_utc(after)
+
+    compiled = compile_schedule(schedule)
+    if compiled.kind == "interval":
+        return (cursor + compiled.interval * k for k in itertools.count(1))
+    return _iterate(cursor, compiled.next_after)
+
+
+def _iterate(cursor: datetime, step: Callable[[datetime], datetime]) -> Iterator[datetime]:
+    while True:
+        cursor = step(cursor)
+        yield cursor
+
+
+def _sorted_times(times: list[str], kind: str) -> tuple[tuple[int, int], ...]:
+    parsed_times = tuple(sorted({p for p in map(parse_time_string, times) if p}))
     if not parsed_times:
-        raise ValueError("Daily schedule has no valid times.")
+        raise ValueError(f"{kind} schedule has no valid times.")
+    return parsed_times
+
 
-    # Check remaining times today.
-    for hour, minute in parsed_times:
+def _next_daily_at(after_utc: datetime, parsed_times: tuple[tuple[int, int], ...], tz: tzinfo) -> datetime:
+    after_local = after_utc.astimezone(tz)
+
+    # First time today strictly after the current wall-clock minute (a slot
+    # at the current minute has already passed once seconds tick over).
+    i = bisect.bisect_right(parsed_times, (after_local.hour, after_local.minute))
+    if i < len(parsed_times):
+        hour, minute = parsed_times[i]
         candidate_local = after_local.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if candidate_local > after_local:
-            return candidate_local.astimezone(timezone.utc)
+        return candidate_local.astimezone(timezone.utc)
 
     # Otherwise, earliest time tomorrow.
     next_day = (after_local + timedelta(days=1)).date()
@@ -166,35 +305,28 @@ def _next_daily_occurrence(after_utc: datetime, times: list[str], tz: tzinfo) ->
     return candidate_local.astimezone(timezone.utc)
 
 
-def _next_weekly_occurrence(
+def _next_weekly_at(
     after_utc: datetime,
-    days: list[str],
-    times: list[str],
+    day_mask: int,
+    parsed_times: tuple[tuple[int, int], ...],
     tz: tzinfo,
 ) -> datetime:
     after_local = after_utc.astimezone(tz)
-    day_set = {WEEKDAY_NAME_TO_INT[d.lower()] for d in days}
-
-    parsed_times = sorted({parse_time_string(t) for t in times if parse_time_string(t)})
-    if not parsed_times:
-        raise ValueError("Weekly schedule has no valid times.")
-
-    # Search up to 14 days ahead to handle sparse weekly patterns.
-    for offset in range(0, 14):
-        candidate_date = (after_local + timedelta(days=offset)).date()
-        if candidate_date.weekday() not in day_set:
-            continue
-
-        for hour, minute in parsed_times:
-            candidate_local = datetime(
-                candidate_date.year,
-                candidate_date.month,
-                candidate_date.day,
-                hour,
-                minute,
-                tzinfo=tz,
-            )
-            if candidate_local > after_local:
-                return candidate_local.astimezone(timezone.utc)
-
-    raise ValueError("Could not compute next weekly occurrence.")
+    weekday = after_local.weekday()
+
+    offset = 0
+    i = bisect.bisect_right(parsed_times, (after_local.hour, after_local.minute))
+    if not (day_mask >> weekday) & 1 or i == len(parsed_times):
+        # No slot left today: rotate the mask so bit 0 is tomorrow and take
+        # the lowest set bit; offset 7 is the same weekday next week.
+        start = (weekday + 1) % 7
+        rotated = ((day_mask >> start) | (day_mask << (7 - start))) & 0x7F
+        if not rotated:
+            raise ValueError("Could not compute next weekly occurrence.")
+        offset = (rotated & -rotated).bit_length()
+        i = 0
+
+    candidate_date = after_local.date() + timedelta(days=offset)
+    hour, minute = parsed_times[i]
+    candidate_local = datetime(candidate_date.year, candidate_date.month, candidate_date.day, hour, minute, tzinfo=tz)
+    return candidate_local.astimezone(timezone.utc)
@@ -12,6 +12,9 @@ from telegram import MessageEntity
 
 def utf16_len(text: str) -> int:
     """Length in UTF-16 code units (Telegram entity offsets use this)."""
+    if text.isascii():
+        # Most segments; ASCII is one code unit per character.
+        return len(text)
     return len(text.encode("utf-16-le")) // 2
 
 
@@ -21,11 +24,13 @@ class Segment:
     code: bool = False
 
 
-def render(segments: list[Segment]) -> tuple[str, list[MessageEntity] | None]:
-    """Render segments into text + entities list (or None)."""
+def render(segments: list[Segment], *, offset: int = 0) -> tuple[str, list[MessageEntity] | None]:
+    """Render segments into text + entities list (or None).
+
+    `offset` shifts entity offsets, for text that will follow a prefix.
+    """
     parts: list[str] = []
     entities: list[MessageEntity] = []
-    offset = 0
 
     for seg in segments:
         parts.append(seg.text)
@@ -36,3 +41,28 @@ def render(segments: list[Segment]) -> tuple[str, list[MessageEntity] | None]:
 
     return "".join(parts), (entities or None)
 
+
+def render_after(
+    prefix: tuple[str, list[MessageEntity] | None],
+    segments: list[Segment],
+    suffix: tuple[str, list[MessageEntity] | None] | None = None,
+) -> tuple[str, list[MessageEntity] | None]:
+    """Render segments between an already rendered prefix and (optional) suffix.
+
+    Lets the constant parts of a message be rendered once at import time;
+    only the dynamic middle is rendered per call, and suffix entities are
+    shifted by its length.
+    """
+    prefix_text, prefix_entities = prefix
+    prefix_len = utf16_len(prefix_text)
+    middle_text, middle_entities = render(segments, offset=prefix_len)
+    text = prefix_text + middle_text
+    entities = [*(prefix_entities or ()), *(middle_entities or ())]
+    if suffix is not None:
+        suffix_text, suffix_entities = suffix
+        delta = prefix_len + utf16_len(middle_text)
+        entities += [
+            MessageEntity(type=e.type, offset=e.offset + delta, length=e.length) for e in (suffix_entities or ())
+        ]
+        text += suffix_text
+    return text, (entities or None)
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import shutil
 import sys
+from collections.abc import Awaitable, Callable
 from pathlib import Path
+from typing import Any
 
 import pytest
-import pytest_asyncio
+
+
+# Tests don't need durability: skip fsyncs and keep rollback journals in memory.
+_TEST_SQLITE_PRAGMAS = "journal_mode=MEMORY;synchronous=OFF;temp_store=MEMORY"
 
 
 def pytest_configure() -> None:
@@ -15,20 +22,87 @@ def pytest_configure() -> None:
     sys.path.insert(0, str(src))
 
 
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run async tests on uvloop when it is installed (optional; not a requirement)."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
 @pytest.fixture
 def db_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
     """Set DATABASE_PATH to a temporary sqlite file for this test."""
     db_path = tmp_path / "scheduler_test.db"
     monkeypatch.setenv("DATABASE_PATH", str(db_path))
+    monkeypatch.setenv("SQLITE_PRAGMAS", _TEST_SQLITE_PRAGMAS)
     monkeypatch.setenv("DEFAULT_TIMEZONE", os.getenv("DEFAULT_TIMEZONE", "UTC") or "UTC")
+
+    # Fresh database per test: forget users upserted (and cached) by earlier tests.
+    from handlers import common
+
+    common._ensured_user_ids.clear()
     return db_path
 
 
-@pytest_asyncio.fixture
-async def initialized_db(db_env: Path) -> Path:
-    """Initialize schema in a fresh temp database."""
+@pytest.fixture(scope="session")
+def schema_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the schema once per session into a template database file."""
     from database import init_database
 
-    await init_database()
+    template = tmp_path_factory.mktemp("schema") / "template.db"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DATABASE_PATH", str(template))
+        mp.setenv("SQLITE_PRAGMAS", _TEST_SQLITE_PRAGMAS)
+        asyncio.run(init_database())
+    return template
+
+
+@pytest.fixture
+def initialized_db(db_env: Path, schema_template: Path) -> Path:
+    """Initialize schema in a fresh temp database (a copy of the session template)."""
+    shutil.copyfile(schema_template, db_env)
     return db_env
 
+
+@pytest.fixture
+def make_schedule(initialized_db: Path) -> Callable[..., Awaitable[tuple[dict[str, Any], dict[str, Any]]]]:
+    """Factory: create a user, a verified channel and a schedule (optionally selected); return (channel, schedule) rows."""
+    from database import queries as db
+
+    async def _make(
+        *,
+        user_id: int,
+        telegram_channel_id: str,
+        pattern: dict[str, Any],
+        name: str = "S",
+        state: str = "paused",
+        selected: bool = False,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+        channel = await db.create_channel(user_id=user_id, telegram_channel_id=telegram_channel_id, channel_name="C")
+        if selected:
+            schedule, _ = await db.create_and_select_schedule(
+                user_id=user_id,
+                channel_db_id=int(channel["id"]),
+                name=name,
+                pattern=pattern,
+                timezone_name="UTC",
+                state=state,
+            )
+            return channel, schedule
+        schedule = await db.create_schedule(
+            channel_db_id=int(channel["id"]),
+            name=name,
+            pattern=pattern,
+            timezone_name="UTC",
+            state=state,
+        )
+        return channel, schedule
+
+    return _make
@@ -0,0 +1,41 @@
+"""Minimal stand-ins for the PTB objects the command handlers touch."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class FakeUser:
+    id: int
+    username: str | None = "u"
+    first_name: str | None = "f"
+    last_name: str | None = "l"
+
+
+class FakeMessage:
+    def __init__(self) -> None:
+        self.replies: list[dict] = []
+
+    async def reply_text(self, text: str, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        self.replies.append({"text": text, "kwargs": kwargs})
+
+
+class TextMessage(FakeMessage):
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self.text = text
+
+
+@dataclass
+class FakeUpdate:
+    message: FakeMessage
+    effective_user: FakeUser | None = None
+    effective_chat: object | None = None
+
+
+class FakeContext:
+    def __init__(self, *, args: list[str] | None = None) -> None:
+        self.args = args or []
+        self.user_data: dict = {}
+        self.bot = None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 from telegram import MessageEntity
 
@@ -37,3 +39,64 @@ def test_extract_command_payload_none_when_missing_message() -> None:
     assert payload_text is None
     assert payload_entities is None
 
+
+class _ReplyMessage(_FakeMessage):
+    def __init__(self, *, text: str, entities: list[MessageEntity] | None = None) -> None:
+        super().__init__(text=text, entities=entities)
+        self.replies: list[str] = []
+
+    async def reply_text(self, text: str, **_kwargs) -> None:  # type: ignore[no-untyped-def]
+        self.replies.append(text)
+
+
+class _FakeBot:
+    def __init__(self) -> None:
+        self.sent: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send_message(self, *, chat_id: int, text: str, entities) -> None:  # type: ignore[no-untyped-def]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if chat_id == 3:
+            raise RuntimeError("blocked")
+        self.sent.append(chat_id)
+
+
+class _FakeUser:
+    id = 9001
+    username = "admin"
+    first_name = "A"
+    last_name = None
+
+
+class _FakeUpdate:
+    def __init__(self, message: _ReplyMessage) -> None:
+        self.message = message
+        self.effective_user = _FakeUser()
+
+
+class _FakeContext:
+    def __init__(self, bot: _FakeBot) -> None:
+        self.bot = bot
+
+
+@pytest.mark.asyncio
+async def test_broadcast_sends_concurrently_and_counts_failures(initialized_db, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ADMIN_USER_ID", str(_FakeUser.id))
+
+    async def fake_active_users(*, since):  # type: ignore[no-untyped-def]
+        return [{"id": i} for i in range(1, 6)]
+
+    monkeypatch.setattr(admin.db, "get_active_users", fake_active_users)
+    monkeypatch.setattr(admin, "BROADCAST_CONCURRENCY", 2)
+
+    msg = _ReplyMessage(text="/broadcast hi", entities=[MessageEntity(type="bot_command", offset=0, length=10)])
+    bot = _FakeBot()
+    await admin.broadcast_command(_FakeUpdate(msg), _FakeContext(bot))  # type: ignore[arg-type]
+
+    assert sorted(bot.sent) == [1, 2, 4, 5]
+    assert bot.max_in_flight == 2
+    assert msg.replies[-1] == "Broadcast complete. Success: 4. Failed: 1."
@@ -11,7 +11,7 @@ from database import queries as db
 from handlers import bulk_upload
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUser:
     id: int
     username: str | None = "u"
@@ -37,13 +37,13 @@ class _FakeMessage:
         self.replies.append(text)
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeChat:
     id: int
     type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUpdate:
     message: _FakeMessage
     effective_user: _FakeUser | None = None
@@ -56,22 +56,17 @@ class _FakeContext:
 
 
 class _FakePhoto:
+    __slots__ = ("file_id",)
+
     def __init__(self, file_id: str) -> None:
         self.file_id = file_id
 
 
 @pytest.mark.asyncio
-async def test_bulk_confirm_inserts_posts_and_unpauses_empty_paused(initialized_db) -> None:
+async def test_bulk_confirm_inserts_posts_and_unpauses_empty_paused(make_schedule) -> None:
     user = _FakeUser(id=111)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-4004", channel_name="Channel 4")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="BulkSchedule",
-        pattern={"type": "interval", "minutes": 10},
-        timezone_name="UTC",
-        state="empty_paused",
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-4004", pattern={"type": "interval", "minutes": 10}, name="BulkSchedule", state="empty_paused"
     )
     schedule_id = int(schedule["id"])
 
@@ -217,17 +212,10 @@ async def test_media_group_records_forward_metadata_per_item_for_allowlisted_ori
 
 
 @pytest.mark.asyncio
-async def test_media_group_collected_and_flushed_on_done(initialized_db) -> None:
+async def test_media_group_collected_and_flushed_on_done(make_schedule) -> None:
     user = _FakeUser(id=222)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-5005", channel_name="Channel 5")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="MG",
-        pattern={"type": "interval", "minutes": 10},
-        timezone_name="UTC",
-        state="paused",
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-5005", pattern={"type": "interval", "minutes": 10}, name="MG"
     )
     schedule_id = int(schedule["id"])
 
@@ -264,17 +252,10 @@ async def test_media_group_collected_and_flushed_on_done(initialized_db) -> None
 
 
 @pytest.mark.asyncio
-async def test_single_markdown_caption_sets_parse_mode_for_posts(initialized_db) -> None:
+async def test_single_markdown_caption_sets_parse_mode_for_posts(make_schedule) -> None:
     user = _FakeUser(id=333)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-6006", channel_name="Channel 6")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="MD",
-        pattern={"type": "interval", "minutes": 10},
-        timezone_name="UTC",
-        state="paused",
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-6006", pattern={"type": "interval", "minutes": 10}, name="MD"
     )
     schedule_id = int(schedule["id"])
 
@@ -307,17 +288,10 @@ async def test_single_markdown_caption_sets_parse_mode_for_posts(initialized_db)
 
 
 @pytest.mark.asyncio
-async def test_single_markdown_caption_sets_parse_mode_for_media_groups(initialized_db) -> None:
+async def test_single_markdown_caption_sets_parse_mode_for_media_groups(make_schedule) -> None:
     user = _FakeUser(id=444)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-7007", channel_name="Channel 7")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="MDG",
-        pattern={"type": "interval", "minutes": 10},
-        timezone_name="UTC",
-        state="paused",
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-7007", pattern={"type": "interval", "minutes": 10}, name="MDG"
     )
     schedule_id = int(schedule["id"])
 
@@ -359,17 +333,10 @@ async def test_single_markdown_caption_sets_parse_mode_for_media_groups(initiali
 
 
 @pytest.mark.asyncio
-async def test_single_caption_keeps_telegram_entities_when_present(initialized_db) -> None:
+async def test_single_caption_keeps_telegram_entities_when_present(make_schedule) -> None:
     user = _FakeUser(id=555)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-8008", channel_name="Channel 8")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="Ent",
-        pattern={"type": "interval", "minutes": 10},
-        timezone_name="UTC",
-        state="paused",
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-8008", pattern={"type": "interval", "minutes": 10}, name="Ent"
     )
     schedule_id = int(schedule["id"])
 
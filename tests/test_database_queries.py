@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -9,8 +10,15 @@ from database import queries as db
 from database.time import to_sqlite_timestamp
 from scheduler.engine import _parse_timestamp
 
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(scope="module")
+def frozen_now() -> datetime:
+    """One whole-second UTC reference time shared by this module's tests."""
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
 
-@pytest.mark.asyncio
 async def test_add_queued_posts_bulk_appends_and_compacts_positions(initialized_db) -> None:
     user_id = 123
     await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
@@ -52,7 +60,6 @@ async def test_add_queued_posts_bulk_appends_and_compacts_positions(initialized_
     assert [int(p["position"]) for p in posts2] == [0, 1]
 
 
-@pytest.mark.asyncio
 async def test_add_queued_posts_bulk_persists_forward_metadata(initialized_db) -> None:
     user_id = 777
     await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
@@ -89,7 +96,6 @@ async def test_add_queued_posts_bulk_persists_forward_metadata(initialized_db) -
     assert int(posts[0]["forward_origin_message_id"]) == 207
 
 
-@pytest.mark.asyncio
 async def test_forward_origin_allowlist_roundtrip(initialized_db) -> None:
     user_id = 888
     await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
@@ -109,8 +115,7 @@ async def test_forward_origin_allowlist_roundtrip(initialized_db) -> None:
     assert await db.get_forward_origin_allowlist(user_id) == []
 
 
-@pytest.mark.asyncio
-async def test_scheduled_for_helpers_and_earliest(initialized_db) -> None:
+async def test_scheduled_for_helpers_and_earliest(initialized_db, frozen_now: datetime) -> None:
     user_id = 456
     await db.upsert_user(user_id=user_id, username="u2", first_name="f2", last_name="l2", is_admin=False)
     channel = await db.create_channel(user_id=user_id, telegram_channel_id="-2002", channel_name="Channel 2")
@@ -134,7 +139,7 @@ async def test_scheduled_for_helpers_and_earliest(initialized_db) -> None:
     posts = await db.get_queued_posts(schedule_id, limit=10)
     assert len(posts) == 3
 
-    base = datetime.now(timezone.utc).replace(microsecond=0)
+    base = frozen_now
     t1 = base + timedelta(seconds=30)
     t2 = base + timedelta(seconds=10)
     t3 = base + timedelta(seconds=20)
@@ -157,18 +162,17 @@ async def test_scheduled_for_helpers_and_earliest(initialized_db) -> None:
     assert unscheduled == []
 
 
-@pytest.mark.asyncio
-async def test_active_users_and_delivery_stats_daily(initialized_db) -> None:
-    now = datetime.now(timezone.utc).replace(microsecond=0)
+async def test_active_users_and_delivery_stats_daily(initialized_db, frozen_now: datetime) -> None:
+    now = frozen_now
     old = now - timedelta(days=120)
 
-    # Create two users; only one is active since 90 days.
-    await db.upsert_user(user_id=1, username="u1", first_name="f", last_name="l", is_admin=False)
-    await db.upsert_user(user_id=2, username="u2", first_name="f", last_name="l", is_admin=False)
-
-    # Force user 2 to look inactive by pushing last_active_at back.
+    # Create two users in one transaction; user 2's last_active_at is pushed back so
+    # only user 1 is active since 90 days.
     async with transaction() as conn:
-        await conn.execute("UPDATE users SET last_active_at = ? WHERE id = ?", (to_sqlite_timestamp(old), 2))
+        await conn.executemany(
+            "INSERT INTO users (id, username, first_name, last_name, is_admin, last_active_at) VALUES (?, ?, 'f', 'l', 0, ?)",
+            [(1, "u1", to_sqlite_timestamp(now)), (2, "u2", to_sqlite_timestamp(old))],
+        )
 
     active = await db.get_active_users(since=now - timedelta(days=90))
     assert [int(u["id"]) for u in active] == [1]
@@ -186,7 +190,6 @@ async def test_active_users_and_delivery_stats_daily(initialized_db) -> None:
     assert summed["send_failures"] == 1
 
 
-@pytest.mark.asyncio
 async def test_user_context_selection_roundtrip(initialized_db) -> None:
     user_id = 999
     await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
@@ -227,3 +230,186 @@ async def test_user_context_selection_roundtrip(initialized_db) -> None:
     assert ctx2["selected_channel_id"] is None
     assert ctx2["selected_schedule_id"] is None
 
+
+async def test_get_queued_posts_caption_preview(initialized_db) -> None:
+    user_id = 777
+    await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    channel = await db.create_channel(user_id=user_id, telegram_channel_id="-1777", channel_name="C")
+    schedule = await db.create_schedule(
+        channel_db_id=int(channel["id"]),
+        name="S",
+        pattern={"type": "interval", "hours": 1},
+        timezone_name="UTC",
+        state="paused",
+    )
+    schedule_id = int(schedule["id"])
+
+    long_caption = "  " + "x" * 500 + "\n"
+    await db.add_queued_posts_bulk(
+        schedule_id,
+        [
+            {"media_type": "photo", "file_id": "a", "caption": long_caption},
+            {"media_type": "photo", "file_id": "b", "caption": " short "},
+            {"media_type": "photo", "file_id": "c", "caption": None},
+            {"media_type": "photo", "file_id": "d", "caption": "\xa0\u2028nbsp\u3000"},
+        ],
+    )
+
+    posts = await db.get_queued_posts(schedule_id, limit=10, caption_preview_len=40)
+    assert [p["caption"] for p in posts] == ["x" * 40, "short", None, "nbsp"]
+    assert [p["caption_length"] for p in posts] == [500, 5, None, 4]
+    assert [p["file_id"] for p in posts] == ["a", "b", "c", "d"]
+    # The SQL trim set must stay in line with str.strip().
+    assert set(db._WHITESPACE) == {ch for ch in map(chr, range(sys.maxunicode + 1)) if ch.isspace()}
+
+    full = await db.get_queued_posts(schedule_id, limit=10)
+    assert full[0]["caption"] == long_caption
+
+
+async def test_schedule_state_and_delete_for_user_check_ownership(initialized_db) -> None:
+    owner_id, other_id = 801, 802
+    for uid in (owner_id, other_id):
+        await db.upsert_user(user_id=uid, username="u", first_name="f", last_name="l", is_admin=False)
+    channel = await db.create_channel(user_id=owner_id, telegram_channel_id="-1801", channel_name="C")
+    schedule = await db.create_schedule(
+        channel_db_id=int(channel["id"]),
+        name="S",
+        pattern={"type": "interval", "hours": 1},
+        timezone_name="UTC",
+        state="paused",
+    )
+    schedule_id = int(schedule["id"])
+
+    assert await db.update_schedule_state_for_user(other_id, schedule_id, "active", select=True) is None
+    assert (await db.get_schedule(schedule_id))["state"] == "paused"
+
+    details = await db.update_schedule_state_for_user(owner_id, schedule_id, "active", select=True)
+    assert details is not None
+    assert int(details["selected_schedule_id"]) == schedule_id
+    assert details["schedule_state"] == "active"
+
+    assert await db.delete_schedule_for_user(other_id, schedule_id) is None
+    details = await db.delete_schedule_for_user(owner_id, schedule_id)
+    assert details is not None
+    assert details["selected_schedule_id"] is None
+    assert int(details["selected_channel_id"]) == int(channel["id"])
+    assert await db.get_schedule(schedule_id) is None
+
+
+async def test_create_and_select_schedule_sets_selection(initialized_db) -> None:
+    user_id = 811
+    await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    channel = await db.create_channel(user_id=user_id, telegram_channel_id="-1811", channel_name="C")
+
+    schedule, details = await db.create_and_select_schedule(
+        user_id=user_id,
+        channel_db_id=int(channel["id"]),
+        name="S",
+        pattern={"type": "daily", "times": ["09:00"]},
+        timezone_name="UTC",
+    )
+    assert schedule["pattern"] == {"type": "daily", "times": ["09:00"]}
+    assert schedule["state"] == "paused"
+    assert int(details["selected_schedule_id"]) == int(schedule["id"])
+    assert int(details["selected_channel_id"]) == int(channel["id"])
+    assert details["schedule_name"] == "S"
+
+
+async def test_upsert_user_reports_has_selection(initialized_db) -> None:
+    user_id = 821
+    user = await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    assert user["has_selection"] is False
+
+    channel = await db.create_channel(user_id=user_id, telegram_channel_id="-1821", channel_name="C")
+    details = await db.set_user_context(user_id=user_id, selected_channel_id=int(channel["id"]), selected_schedule_id=None)
+    assert details == await db.get_user_context_details(user_id)
+    assert details["channel_name"] == "C"
+    user = await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    assert user["has_selection"] is True
+
+    await db.clear_user_context(user_id)
+    user = await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    assert user["has_selection"] is False
+
+
+async def test_verify_codes_bulk_matches_first_live_candidate_once(initialized_db) -> None:
+    user_id = 831
+    await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    code = await db.create_verification_code(user_id=user_id, telegram_channel_id="-1831")
+
+    assert await db.verify_codes_bulk(["nope" * 4, code], telegram_channel_id="-1999") is None
+    assert await db.verify_codes_bulk(["nope" * 4, code, code], telegram_channel_id="-1831") == (code, user_id)
+    # Codes are single-use.
+    assert await db.verify_codes_bulk([code], telegram_channel_id="-1831") is None
+    assert await db.verify_codes_bulk([], telegram_channel_id="-1831") is None
+
+
+async def test_get_next_queued_posts_bulk_returns_queue_heads(initialized_db) -> None:
+    user_id = 841
+    await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    channel = await db.create_channel(user_id=user_id, telegram_channel_id="-1841", channel_name="C")
+    ids = []
+    for name in ("A", "B", "Empty"):
+        schedule = await db.create_schedule(
+            channel_db_id=int(channel["id"]),
+            name=name,
+            pattern={"type": "interval", "hours": 1},
+            timezone_name="UTC",
+            state="active",
+        )
+        ids.append(int(schedule["id"]))
+    a, b, empty = ids
+
+    await db.add_queued_posts_bulk(a, [{"media_type": "photo", "file_id": "a1"}, {"media_type": "photo", "file_id": "a2"}])
+    await db.add_queued_posts_bulk(b, [{"media_type": "photo", "file_id": "b1"}])
+
+    heads = await db.get_next_queued_posts_bulk(ids)
+    assert set(heads) == {a, b}
+    for schedule_id in (a, b):
+        assert heads[schedule_id] == await db.get_next_queued_post(schedule_id)
+    assert heads[a]["file_id"] == "a1"
+    assert await db.get_next_queued_posts_bulk([]) == {}
+
+
+async def test_get_active_schedules_excludes_paused_and_empty_paused(initialized_db) -> None:
+    user_id = 851
+    await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    channel = await db.create_channel(user_id=user_id, telegram_channel_id="-1851", channel_name="C")
+    by_state = {}
+    for state in ("active", "paused", "empty_paused"):
+        schedule = await db.create_schedule(
+            channel_db_id=int(channel["id"]),
+            name=state,
+            pattern={"type": "interval", "hours": 1},
+            timezone_name="UTC",
+            state=state,
+        )
+        by_state[state] = int(schedule["id"])
+
+    active_ids = {int(s["id"]) for s in await db.get_active_schedules()}
+    assert by_state["active"] in active_ids
+    assert by_state["paused"] not in active_ids
+    assert by_state["empty_paused"] not in active_ids
+
+
+async def test_get_queued_posts_unscheduled_bulk_limits_per_schedule(initialized_db) -> None:
+    user_id = 861
+    await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
+    channel = await db.create_channel(user_id=user_id, telegram_channel_id="-1861", channel_name="C")
+    ids = []
+    for name in ("A", "B"):
+        schedule = await db.create_schedule(
+            channel_db_id=int(channel["id"]),
+            name=name,
+            pattern={"type": "interval", "hours": 1},
+            timezone_name="UTC",
+            state="active",
+        )
+        ids.append(int(schedule["id"]))
+        await db.add_queued_posts_bulk(ids[-1], [{"media_type": "photo", "file_id": f"{name}{i}"} for i in range(4)])
+
+    posts = await db.get_queued_posts_unscheduled_bulk(ids, per_schedule_limit=3)
+    for schedule_id in ids:
+        assert posts[schedule_id] == await db.get_queued_posts_unscheduled(schedule_id, limit=3)
+    assert await db.get_queued_posts_unscheduled_bulk([], per_schedule_limit=3) == {}
+
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from telegram import InputFile
 from telegram.error import BadRequest
 
 from scheduler import executor
@@ -43,3 +44,107 @@ async def test_send_post_does_not_retry_on_non_file_id_errors(monkeypatch: pytes
     ok = await executor.send_post(bot, telegram_channel_id="-1", post=post)  # type: ignore[arg-type]
     assert ok is False
 
+
+@pytest.mark.asyncio
+async def test_retry_with_download_reuploads_from_memory() -> None:
+    sent: dict[str, object] = {}
+
+    class _FakeFile:
+        file_path = "documents/file_7.pdf"
+
+        async def download_as_bytearray(self) -> bytearray:
+            return bytearray(b"payload")
+
+    class _FakeBot:
+        async def get_file(self, file_id: str) -> _FakeFile:
+            assert file_id == "abc"
+            return _FakeFile()
+
+        async def send_document(self, **kwargs):  # type: ignore[no-untyped-def]
+            sent.update(kwargs)
+
+    ok = await executor._retry_with_download(
+        _FakeBot(),  # type: ignore[arg-type]
+        telegram_channel_id="-1",
+        media_type="document",
+        file_id="abc",
+        caption="hi",
+        caption_parse_mode=None,
+        caption_entities=None,
+    )
+    assert ok is True
+    document = sent["document"]
+    assert isinstance(document, InputFile)
+    assert document.input_file_content == b"payload"
+    assert document.filename == "file_7.pdf"
+    assert sent["chat_id"] == "-1"
+
+
+def test_decode_entities_caches_by_json_text() -> None:
+    raw = '[{"type": "bold", "offset": 0, "length": 2}, "junk"]'
+    first = executor._decode_entities(raw)
+    assert first is not None and len(first) == 1
+    assert first[0].type == "bold"
+    assert executor._decode_entities(raw) is first
+    assert executor._decode_entities([{"length": 2, "offset": 0, "type": "bold"}]) == first
+    assert executor._decode_entities("  ") is None
+    assert executor._decode_entities("[]") is None
+    assert executor._decode_entities("not json") is None
+
+
+@pytest.mark.asyncio
+async def test_send_post_dispatches_single_media_by_type() -> None:
+    calls: list[tuple[str, dict[str, object]]] = []
+
+    class _FakeBot:
+        def __getattr__(self, name: str):  # type: ignore[no-untyped-def]
+            async def _send(**kwargs):  # type: ignore[no-untyped-def]
+                calls.append((name, kwargs))
+
+            return _send
+
+    for media_type in ("photo", "video", "document"):
+        post = {"id": 3, "media_type": media_type, "file_id": f"fid-{media_type}", "file_path": None, "caption": "c"}
+        assert await executor.send_post(_FakeBot(), telegram_channel_id="-1", post=post) is True  # type: ignore[arg-type]
+
+    assert [(name, kwargs[name.removeprefix("send_")]) for name, kwargs in calls] == [
+        ("send_photo", "fid-photo"),
+        ("send_video", "fid-video"),
+        ("send_document", "fid-document"),
+    ]
+
+    post = {"id": 4, "media_type": "audio", "file_id": "x", "file_path": None, "caption": None}
+    assert await executor.send_post(_FakeBot(), telegram_channel_id="-1", post=post) is False  # type: ignore[arg-type]
+
+
+def test_parse_media_group_opens_only_local_files(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    from contextlib import ExitStack
+
+    local = tmp_path / "doc.bin"
+    local.write_bytes(b"x")
+    data = (
+        '[{"media_type": "photo", "file_id": "fid-1", "caption": "c"},'
+        f' {{"media_type": "document", "file_path": "{local.as_posix()}"}}]'
+    )
+    with ExitStack() as stack:
+        media = executor._parse_media_group(data, stack=stack)
+        assert media[0].media == "fid-1"
+        assert media[0].caption == "c"
+        assert media[1].media.input_file_content == b"x"
+
+
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("Bad Request: wrong file_id specified", True),
+        ("Bad Request: wrong remote file identifier specified", True),
+        ("Bad Request: invalid FILE ID", True),
+        ("Bad Request: fileid is empty", True),
+        ("Bad Request: wrong file type", True),
+        ("Bad Request: chat not found", False),
+        ("Forbidden: bot was kicked from the channel chat", False),
+    ],
+)
+def test_looks_like_file_id_error(message: str, expected: bool) -> None:
+    assert executor._looks_like_file_id_error(BadRequest(message)) is expected
+    assert executor._looks_like_file_id_error(RuntimeError(message)) is expected
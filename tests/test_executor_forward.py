@@ -5,6 +5,8 @@ from telegram.error import BadRequest
 
 from scheduler import executor
 
+pytestmark = pytest.mark.asyncio
+
 
 class _FakeBot:
     def __init__(self) -> None:
@@ -27,14 +29,17 @@ class _FakeBot:
         return tuple(range(len(message_ids)))
 
 
-@pytest.mark.asyncio
-async def test_send_post_forwards_when_forward_metadata_present(monkeypatch: pytest.MonkeyPatch) -> None:
+@pytest.fixture
+def bot() -> _FakeBot:
+    return _FakeBot()
+
+
+async def test_send_post_forwards_when_forward_metadata_present(bot: _FakeBot, monkeypatch: pytest.MonkeyPatch) -> None:
     async def fail_send_once(*_args, **_kwargs):  # type: ignore[no-untyped-def]
         raise AssertionError("_send_post_once should not be called when forwarding succeeds")
 
     monkeypatch.setattr(executor, "_send_post_once", fail_send_once)
 
-    bot = _FakeBot()
     post = {
         "id": 1,
         "media_type": "photo",
@@ -50,14 +55,12 @@ async def test_send_post_forwards_when_forward_metadata_present(monkeypatch: pyt
     assert bot.forward_calls == [("-1", 111, 42)]
 
 
-@pytest.mark.asyncio
-async def test_send_post_returns_false_if_forward_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_send_post_returns_false_if_forward_fails(bot: _FakeBot, monkeypatch: pytest.MonkeyPatch) -> None:
     async def fail_send_once(*_args, **_kwargs) -> bool:  # type: ignore[no-untyped-def]
         raise AssertionError("_send_post_once should not be called when forwarding fails")
 
     monkeypatch.setattr(executor, "_send_post_once", fail_send_once)
 
-    bot = _FakeBot()
     bot.should_fail = True
     post = {
         "id": 2,
@@ -73,9 +76,7 @@ async def test_send_post_returns_false_if_forward_fails(monkeypatch: pytest.Monk
     assert ok is False
 
 
-@pytest.mark.asyncio
-async def test_send_post_forwards_media_group_when_media_group_data_has_forward_refs() -> None:
-    bot = _FakeBot()
+async def test_send_post_forwards_media_group_when_media_group_data_has_forward_refs(bot: _FakeBot) -> None:
     post = {
         "id": 3,
         "media_type": "media_group",
@@ -97,9 +98,7 @@ async def test_send_post_forwards_media_group_when_media_group_data_has_forward_
     assert bot.forward_messages_calls == [("-1", 111, [42, 43])]
 
 
-@pytest.mark.asyncio
-async def test_send_post_returns_false_if_media_group_forward_fails() -> None:
-    bot = _FakeBot()
+async def test_send_post_returns_false_if_media_group_forward_fails(bot: _FakeBot) -> None:
     bot.should_fail = True
     post = {
         "id": 4,
@@ -118,3 +117,31 @@ async def test_send_post_returns_false_if_media_group_forward_fails() -> None:
     ok = await executor.send_post(bot, telegram_channel_id="-1", post=post)  # type: ignore[arg-type]
     assert ok is False
 
+
+async def test_send_post_sends_media_group_from_decoded_items(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent: list[list[object]] = []
+    loads = {"count": 0}
+    real_loads = executor.json.loads
+
+    def counting_loads(*args, **kwargs):  # type: ignore[no-untyped-def]
+        loads["count"] += 1
+        return real_loads(*args, **kwargs)
+
+    class _GroupBot:
+        async def send_media_group(self, *, chat_id: str, media: list[object], **_kwargs) -> None:  # type: ignore[no-untyped-def]
+            sent.append(media)
+
+    monkeypatch.setattr(executor.json, "loads", counting_loads)
+    post = {
+        "id": 5,
+        "media_type": "media_group",
+        "file_id": None,
+        "file_path": None,
+        "caption": None,
+        "media_group_data": '[{"media_type":"photo","file_id":"x"},{"media_type":"video","file_id":"y"}]',
+    }
+
+    ok = await executor.send_post(_GroupBot(), telegram_channel_id="-1", post=post)  # type: ignore[arg-type]
+    assert ok is True
+    assert loads["count"] == 1
+    assert [m.media for m in sent[0]] == ["x", "y"]  # type: ignore[attr-defined]
@@ -8,7 +8,7 @@ from database import queries as db
 from handlers.forwarding import addforward_command, clearforward_command, forwarding_command, removeforward_command
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUser:
     id: int
     username: str | None = "u"
@@ -17,6 +17,8 @@ class _FakeUser:
 
 
 class _FakeMessage:
+    __slots__ = ("replies",)
+
     def __init__(self) -> None:
         self.replies: list[dict] = []
 
@@ -24,7 +26,7 @@ class _FakeMessage:
         self.replies.append({"text": text, "kwargs": kwargs})
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUpdate:
     message: _FakeMessage
     effective_user: _FakeUser | None = None
@@ -32,6 +34,8 @@ class _FakeUpdate:
 
 
 class _FakeContext:
+    __slots__ = ("args", "user_data", "bot")
+
     def __init__(self, *, args: list[str] | None = None) -> None:
         self.args = args or []
         self.user_data: dict = {}
@@ -74,3 +78,22 @@ async def test_forwarding_commands_roundtrip(initialized_db) -> None:
     await clearforward_command(_FakeUpdate(message=msg4, effective_user=user), _FakeContext())  # type: ignore[arg-type]
     assert await db.get_forward_origin_allowlist(user.id) == []
 
+
+@pytest.mark.asyncio
+async def test_requires_user_skips_repeat_upserts(initialized_db, monkeypatch) -> None:
+    user = _FakeUser(id=3031)
+    calls: list[int] = []
+    real_upsert = db.upsert_user
+
+    async def _counting_upsert(**kwargs):  # type: ignore[no-untyped-def]
+        calls.append(int(kwargs["user_id"]))
+        return await real_upsert(**kwargs)
+
+    monkeypatch.setattr(db, "upsert_user", _counting_upsert)
+
+    for _ in range(3):
+        msg = _FakeMessage()
+        await forwarding_command(_FakeUpdate(message=msg, effective_user=user), _FakeContext())  # type: ignore[arg-type]
+        assert msg.replies
+
+    assert calls == [user.id]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from database import queries as db
+from handler_fakes import FakeContext, FakeMessage, FakeUpdate, FakeUser
+from handlers import queue_management
+
+
+async def _queue_two_posts(schedule_id: int) -> None:
+    await db.add_queued_posts_bulk(
+        schedule_id,
+        [
+            {"media_type": "photo", "file_id": "a", "caption": "y" * 100},
+            {"media_type": "video", "file_id": "b", "caption": "short"},
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_view_queue_lists_posts_with_truncated_caption(make_schedule) -> None:
+    user = FakeUser(id=4040)
+    _channel, schedule = await make_schedule(user_id=user.id, telegram_channel_id="-104040", pattern={"type": "interval", "hours": 1})
+    schedule_id = int(schedule["id"])
+    await _queue_two_posts(schedule_id)
+
+    msg = FakeMessage()
+    await queue_management.view_queue_command(FakeUpdate(message=msg, effective_user=user), FakeContext(args=[str(schedule_id)]))  # type: ignore[arg-type]
+
+    text = msg.replies[0]["text"]
+    assert f"caption='{'y' * 37}...'" in text
+    assert "caption='short'" in text
+    assert ": photo at " in text and ": video at " in text
+    assert "Current selection" in text
+
+    # The explicit id became the default selection.
+    msg2 = FakeMessage()
+    await queue_management.view_queue_command(FakeUpdate(message=msg2, effective_user=user), FakeContext())  # type: ignore[arg-type]
+    # Planned times follow the wall clock between the two calls; compare the rest.
+    without_times = re.compile(r" at \S+")
+    assert without_times.sub(" at", msg2.replies[0]["text"]) == without_times.sub(" at", text)
+
+
+@pytest.mark.asyncio
+async def test_test_schedule_pairs_runs_with_queued_posts(make_schedule) -> None:
+    user = FakeUser(id=4041)
+    _channel, schedule = await make_schedule(user_id=user.id, telegram_channel_id="-104041", pattern={"type": "interval", "hours": 1})
+    schedule_id = int(schedule["id"])
+    await _queue_two_posts(schedule_id)
+    posts = await db.get_queued_posts(schedule_id, limit=10)
+
+    msg = FakeMessage()
+    await queue_management.test_schedule_command(
+        FakeUpdate(message=msg, effective_user=user),
+        FakeContext(args=[str(schedule_id), "3"]),
+    )  # type: ignore[arg-type]
+
+    lines = [line for line in msg.replies[0]["text"].splitlines() if line.startswith("- run ")]
+    assert len(lines) == 3
+    assert lines[0].endswith(f"post {posts[0]['id']} (photo)")
+    assert lines[1].endswith(f"post {posts[1]['id']} (video)")
+    assert lines[2].endswith("no post")
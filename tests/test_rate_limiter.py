@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from scheduler import rate_limiter
+from scheduler.rate_limiter import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_wait_if_needed_spaces_sends_per_channel(monkeypatch) -> None:
+    limiter = RateLimiter(min_interval_seconds=0.05)
+    real_sleep = asyncio.sleep
+    sleeps: list[float] = []
+
+    async def recording_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        await real_sleep(delay)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", recording_sleep)
+
+    start = time.monotonic()
+    await limiter.wait_if_needed("-1")
+    await limiter.wait_if_needed("-2")
+    assert sleeps == []  # first send per channel never waits
+
+    await limiter.wait_if_needed("-1")
+    assert len(sleeps) == 1
+    assert time.monotonic() - start >= 0.05
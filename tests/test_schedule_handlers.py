@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import pytest
+
+from database import queries as db
+from handler_fakes import FakeContext, FakeMessage, FakeUpdate, FakeUser, TextMessage
+from handlers import schedule_management
+from handlers.selection import selection_segments
+from utils.tg_text import render
+
+
+@pytest.mark.asyncio
+async def test_list_schedules_footer_matches_stored_selection(make_schedule) -> None:
+    user = FakeUser(id=5050)
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-105050", pattern={"type": "interval", "hours": 1}, selected=True
+    )
+
+    msg = FakeMessage()
+    await schedule_management.list_schedules_command(FakeUpdate(message=msg, effective_user=user), FakeContext())  # type: ignore[arg-type]
+
+    footer, _ = render(selection_segments(await db.get_user_context_details(user.id)))
+    text = msg.replies[0]["text"]
+    assert f"/selectschedule {schedule['id']}" in text
+    assert text.endswith(footer)
+    assert "[paused]" in footer
+
+
+@pytest.mark.asyncio
+async def test_set_type_prompts_and_states(initialized_db) -> None:
+    user = FakeUser(id=5051)
+
+    ctx = FakeContext()
+    ctx.user_data["ns_timezone"] = "Europe/Amsterdam"
+    msg = TextMessage(" Daily ")
+    state = await schedule_management.newschedule_set_type(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+    assert state == schedule_management.NS_WAIT_DAILY_TIMES
+    assert msg.replies[0]["text"].startswith("Enter times in Europe/Amsterdam (HH:MM)")
+    assert ctx.user_data["ns_type"] == "daily"
+
+    msg = TextMessage("bogus")
+    state = await schedule_management.editschedule_set_type(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+    assert state == schedule_management.ES_WAIT_TYPE
+    assert "es_type" not in ctx.user_data
+
+    msg = TextMessage("25:00")
+    state = await schedule_management.editschedule_set_daily_times(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+    assert state == schedule_management.ES_WAIT_DAILY_TIMES
+    assert msg.replies[0]["text"] == "Invalid times. Use HH:MM separated by commas (interpreted in UTC)."
+
+
+@pytest.mark.asyncio
+async def test_weekly_days_with_times_line_finishes_edit(make_schedule) -> None:
+    user = FakeUser(id=5052)
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-105052", pattern={"type": "interval", "hours": 1}, selected=True
+    )
+
+    ctx = FakeContext()
+    ctx.user_data.update({"es_schedule_id": int(schedule["id"]), "es_timezone": "UTC"})
+    msg = TextMessage("monday, Friday\n9:00,18:30")
+    state = await schedule_management.editschedule_set_weekly_days(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+
+    assert state == schedule_management.ConversationHandler.END
+    updated = await db.get_schedule(int(schedule["id"]))
+    assert updated["pattern"] == {"type": "weekly", "days": ["monday", "friday"], "times": ["09:00", "18:30"]}
+    assert len(msg.replies) == 1
+
+
+@pytest.mark.asyncio
+async def test_weekly_days_split_across_lines_prompts_for_times(initialized_db) -> None:
+    user = FakeUser(id=5053)
+
+    ctx = FakeContext()
+    ctx.user_data["ns_timezone"] = "UTC"
+    msg = TextMessage("monday,\nfriday")
+    state = await schedule_management.newschedule_set_weekly_days(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+
+    assert state == schedule_management.NS_WAIT_WEEKLY_TIMES
+    assert ctx.user_data["ns_days"] == ["monday", "friday"]
+    assert msg.replies[0]["text"].startswith("Enter times in UTC")
+
+
+@pytest.mark.asyncio
+async def test_weekly_days_with_invalid_times_line_keeps_days(initialized_db) -> None:
+    user = FakeUser(id=5054)
+    ctx = FakeContext()
+    ctx.user_data["ns_timezone"] = "UTC"
+    msg = TextMessage("monday,friday\n25:00")
+    state = await schedule_management.newschedule_set_weekly_days(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+
+    assert state == schedule_management.NS_WAIT_WEEKLY_TIMES
+    assert ctx.user_data["ns_days"] == ["monday", "friday"]
+    assert msg.replies[0]["text"] == "Invalid times. Use HH:MM separated by commas (interpreted in UTC)."
+
+
+def test_parse_times_and_weekdays_csv() -> None:
+    assert schedule_management._parse_times_csv(" 9:05 , ,16:00,") == ("09:05", "16:00")
+    assert schedule_management._parse_times_csv("09:00 10:00") is None
+    assert schedule_management._parse_times_csv("24:00") is None
+    assert schedule_management._parse_times_csv(" , ") is None
+
+    assert schedule_management._parse_weekdays_csv("Monday, friday,monday") == ("monday", "friday")
+    assert schedule_management._parse_weekdays_csv("monday tuesday") is None
+    assert schedule_management._parse_weekdays_csv("mon") is None
+
+
+@pytest.mark.asyncio
+async def test_edit_interval_step_reprompts_then_updates(make_schedule) -> None:
+    user = FakeUser(id=5053)
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-105053", pattern={"type": "daily", "times": ["09:00"]}, selected=True
+    )
+
+    ctx = FakeContext()
+    ctx.user_data.update({"es_schedule_id": int(schedule["id"]), "es_timezone": "UTC"})
+
+    msg = TextMessage("soon")
+    state = await schedule_management.editschedule_set_interval(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+    assert state == schedule_management.ES_WAIT_INTERVAL
+    assert msg.replies[0]["text"] == "Invalid interval. Try: 1h, 30m, or 90"
+
+    msg = TextMessage("2h")
+    state = await schedule_management.editschedule_set_interval(FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+    assert state == schedule_management.ConversationHandler.END
+    updated = await db.get_schedule(int(schedule["id"]))
+    assert updated["pattern"] == {"type": "interval", "hours": 2, "minutes": 0}
@@ -8,7 +8,7 @@ from database import queries as db
 from handlers.schedule_management import setscheduletimezone_command
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUser:
     id: int
     username: str | None = "u"
@@ -17,6 +17,8 @@ class _FakeUser:
 
 
 class _FakeMessage:
+    __slots__ = ("replies",)
+
     def __init__(self) -> None:
         self.replies: list[dict] = []
 
@@ -24,7 +26,7 @@ class _FakeMessage:
         self.replies.append({"text": text, "kwargs": kwargs})
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUpdate:
     message: _FakeMessage
     effective_user: _FakeUser | None = None
@@ -32,23 +34,18 @@ class _FakeUpdate:
 
 
 class _FakeContext:
+    __slots__ = ("args", "user_data")
+
     def __init__(self, *, args: list[str] | None = None) -> None:
         self.args = args or []
         self.user_data: dict = {}
 
 
 @pytest.mark.asyncio
-async def test_setscheduletimezone_updates_selected_schedule(initialized_db) -> None:
+async def test_setscheduletimezone_updates_selected_schedule(make_schedule) -> None:
     user = _FakeUser(id=202)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-20202", channel_name="C")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="S",
-        pattern={"type": "interval", "minutes": 1},
-        timezone_name="UTC",
-        state="paused",
+    channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-20202", pattern={"type": "interval", "minutes": 1}
     )
     schedule_id = int(schedule["id"])
 
@@ -68,17 +65,10 @@ async def test_setscheduletimezone_updates_selected_schedule(initialized_db) ->
 
 
 @pytest.mark.asyncio
-async def test_setscheduletimezone_updates_by_explicit_id(initialized_db) -> None:
+async def test_setscheduletimezone_updates_by_explicit_id(make_schedule) -> None:
     user = _FakeUser(id=203)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-20303", channel_name="C")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="S",
-        pattern={"type": "interval", "minutes": 1},
-        timezone_name="UTC",
-        state="paused",
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-20303", pattern={"type": "interval", "minutes": 1}
     )
     schedule_id = int(schedule["id"])
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -10,16 +11,12 @@ from scheduler import engine
 
 
 @pytest.mark.asyncio
-async def test_catch_up_sets_scheduled_for_with_spacing(initialized_db) -> None:
-    user_id = 1000
-    await db.upsert_user(user_id=user_id, username="u", first_name="f", last_name="l", is_admin=False)
-    channel = await db.create_channel(user_id=user_id, telegram_channel_id="-3003", channel_name="Channel 3")
-
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="CatchUp",
+async def test_catch_up_sets_scheduled_for_with_spacing(make_schedule) -> None:
+    _channel, schedule = await make_schedule(
+        user_id=1000,
+        telegram_channel_id="-3003",
         pattern={"type": "interval", "hours": 1},
-        timezone_name="UTC",
+        name="CatchUp",
         state="active",
     )
     schedule_id = int(schedule["id"])
@@ -60,3 +57,120 @@ async def test_catch_up_sets_scheduled_for_with_spacing(initialized_db) -> None:
     sleep_s = await engine._get_sleep_seconds(60)
     assert 1.0 <= sleep_s <= 60.0
 
+
+@pytest.mark.asyncio
+async def test_process_due_schedules_runs_channels_concurrently_in_order(monkeypatch) -> None:
+    schedules = [
+        {"id": 1, "telegram_channel_id": "-1"},
+        {"id": 2, "telegram_channel_id": "-2"},
+        {"id": 3, "telegram_channel_id": "-1"},
+    ]
+
+    async def fake_active_schedules():  # type: ignore[no-untyped-def]
+        return schedules
+
+    started: list[int] = []
+    release = asyncio.Event()
+
+    async def fake_next_posts(schedule_ids):  # type: ignore[no-untyped-def]
+        return {}
+
+    async def fake_process(bot, schedule, *, post, now, rate_limiter):  # type: ignore[no-untyped-def]
+        started.append(int(schedule["id"]))
+        if schedule["id"] == 1:
+            # Channel -2 must not wait for channel -1's slow send.
+            await release.wait()
+        elif schedule["id"] == 2:
+            release.set()
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(engine.db, "get_active_schedules", fake_active_schedules)
+    monkeypatch.setattr(engine.db, "get_next_queued_posts_bulk", fake_next_posts)
+    monkeypatch.setattr(engine, "_process_schedule", fake_process)
+
+    await asyncio.wait_for(engine._process_due_schedules(None, rate_limiter=None), timeout=2)  # type: ignore[arg-type]
+    assert started == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_process_due_schedules_skips_head_deleted_after_fetch(make_schedule, monkeypatch) -> None:
+    _channel, schedule = await make_schedule(
+        user_id=1001,
+        telegram_channel_id="-3004",
+        pattern={"type": "interval", "hours": 1},
+        name="Race",
+        state="active",
+    )
+    schedule_id = int(schedule["id"])
+    await db.add_queued_posts_bulk(
+        schedule_id,
+        [{"media_type": "photo", "file_id": "f1"}, {"media_type": "photo", "file_id": "f2"}],
+    )
+    past = (datetime.now(timezone.utc) - timedelta(hours=2)).strftime("%Y-%m-%d %H:%M:%S")
+    async with get_db() as conn:
+        await conn.execute("UPDATE schedules SET created_at = ?, last_run_at = NULL WHERE id = ?", (past, schedule_id))
+        await conn.commit()
+
+    real_next_posts = db.get_next_queued_posts_bulk
+
+    async def next_posts_then_delete_head(schedule_ids):  # type: ignore[no-untyped-def]
+        # The user clears the head between the tick's bulk fetch and the send.
+        heads = await real_next_posts(schedule_ids)
+        await db.delete_queued_post(int(heads[schedule_id]["id"]))
+        return heads
+
+    sent: list[str] = []
+
+    async def fake_send_post(bot, *, telegram_channel_id, post):  # type: ignore[no-untyped-def]
+        sent.append(str(post["file_id"]))
+        return True
+
+    monkeypatch.setattr(engine.db, "get_next_queued_posts_bulk", next_posts_then_delete_head)
+    monkeypatch.setattr(engine, "send_post", fake_send_post)
+
+    await engine._process_due_schedules(
+        None,  # type: ignore[arg-type]
+        rate_limiter=engine.RateLimiter(min_interval_seconds=0),
+        schedules=await db.get_active_schedules(),
+    )
+
+    assert sent == []
+    remaining = await db.get_queued_posts(schedule_id, limit=10)
+    assert [p["file_id"] for p in remaining] == ["f2"]
+
+
+@pytest.mark.asyncio
+async def test_process_due_schedules_does_not_pause_queue_filled_after_fetch(make_schedule, monkeypatch) -> None:
+    _channel, schedule = await make_schedule(
+        user_id=1002,
+        telegram_channel_id="-3005",
+        pattern={"type": "interval", "hours": 1},
+        name="Refill",
+        state="active",
+    )
+    schedule_id = int(schedule["id"])
+
+    real_next_posts = db.get_next_queued_posts_bulk
+
+    async def next_posts_then_queue_post(schedule_ids):  # type: ignore[no-untyped-def]
+        # The owner queues a post between the tick's bulk fetch and the empty-queue check.
+        heads = await real_next_posts(schedule_ids)
+        await db.add_queued_posts_bulk(schedule_id, [{"media_type": "photo", "file_id": "f1"}])
+        return heads
+
+    notified: list[int] = []
+
+    async def fake_notify_user(bot, user_id, *args, **kwargs):  # type: ignore[no-untyped-def]
+        notified.append(user_id)
+
+    monkeypatch.setattr(engine.db, "get_next_queued_posts_bulk", next_posts_then_queue_post)
+    monkeypatch.setattr(engine, "_notify_user", fake_notify_user)
+
+    await engine._process_due_schedules(
+        None,  # type: ignore[arg-type]
+        rate_limiter=engine.RateLimiter(min_interval_seconds=0),
+        schedules=await db.get_active_schedules(),
+    )
+
+    assert notified == []
+    assert (await db.get_schedule(schedule_id))["state"] == "active"
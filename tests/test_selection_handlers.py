@@ -5,10 +5,10 @@ from dataclasses import dataclass
 import pytest
 
 from database import queries as db
-from handlers.selection import selectschedule_command, selection_command
+from handlers.selection import selectchannel_command, selectschedule_command, selection_command
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUser:
     id: int
     username: str | None = "u"
@@ -17,6 +17,8 @@ class _FakeUser:
 
 
 class _FakeMessage:
+    __slots__ = ("replies",)
+
     def __init__(self) -> None:
         self.replies: list[dict] = []
 
@@ -24,7 +26,7 @@ class _FakeMessage:
         self.replies.append({"text": text, "kwargs": kwargs})
 
 
-@dataclass
+@dataclass(slots=True)
 class _FakeUpdate:
     message: _FakeMessage
     effective_user: _FakeUser | None = None
@@ -32,6 +34,8 @@ class _FakeUpdate:
 
 
 class _FakeContext:
+    __slots__ = ("args", "user_data", "bot")
+
     def __init__(self, *, args: list[str] | None = None) -> None:
         self.args = args or []
         self.user_data: dict = {}
@@ -39,17 +43,10 @@ class _FakeContext:
 
 
 @pytest.mark.asyncio
-async def test_selectschedule_sets_context_and_selection_command_shows_it(initialized_db) -> None:
+async def test_selectschedule_sets_context_and_selection_command_shows_it(make_schedule) -> None:
     user = _FakeUser(id=101)
-    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
-
-    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-10101", channel_name="C")
-    schedule = await db.create_schedule(
-        channel_db_id=int(channel["id"]),
-        name="S",
-        pattern={"type": "interval", "minutes": 5},
-        timezone_name="UTC",
-        state="paused",
+    _channel, schedule = await make_schedule(
+        user_id=user.id, telegram_channel_id="-10101", pattern={"type": "interval", "minutes": 5}
     )
 
     msg1 = _FakeMessage()
@@ -68,3 +65,38 @@ async def test_selectschedule_sets_context_and_selection_command_shows_it(initia
     assert msg2.replies
     assert "Current selection" in msg2.replies[0]["text"]
 
+    # The footer built from the schedule row matches the stored selection.
+    assert msg1.replies[0]["text"] == "Selected schedule.\n\n" + msg2.replies[0]["text"]
+
+
+@pytest.mark.asyncio
+async def test_selectchannel_numeric_id_skips_bot_api(initialized_db) -> None:
+    user = _FakeUser(id=102)
+    await db.upsert_user(user_id=user.id, username=user.username, first_name=user.first_name, last_name=user.last_name, is_admin=False)
+    channel = await db.create_channel(user_id=user.id, telegram_channel_id="-10102", channel_name="C")
+
+    class _NoCallBot:
+        async def get_chat(self, chat_id):  # type: ignore[no-untyped-def]
+            raise AssertionError("numeric ids should not need get_chat")
+
+    msg = _FakeMessage()
+    ctx = _FakeContext(args=[" -10102"])
+    ctx.bot = _NoCallBot()
+    await selectchannel_command(_FakeUpdate(message=msg, effective_user=user), ctx)  # type: ignore[arg-type]
+
+    assert msg.replies[0]["text"].startswith("Selected channel.")
+    details = await db.get_user_context_details(user.id)
+    assert int(details["selected_channel_id"]) == int(channel["id"])
+
+
+@pytest.mark.asyncio
+async def test_selectschedule_rejects_non_integer_id(initialized_db) -> None:
+    user = _FakeUser(id=103)
+
+    for raw in ("abc", "1.5", "-", "12x"):
+        msg = _FakeMessage()
+        await selectschedule_command(_FakeUpdate(message=msg, effective_user=user), _FakeContext(args=[raw]))  # type: ignore[arg-type]
+        assert msg.replies[-1]["text"] == "Invalid schedule id."
+
+    details = await db.get_user_context_details(user.id)
+    assert details.get("selected_schedule_id") is None
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from utils.tg_text import Segment, render, render_after, utf16_len
+
+
+def test_render_after_matches_single_render() -> None:
+    head = [Segment("Usage: "), Segment("/cmd", code=True), Segment(" ✓ ")]
+    tail = [Segment("🙂 "), Segment("value", code=True), Segment(".")]
+
+    assert render_after(render(head), tail) == render([*head, *tail])
+    assert render_after(render([Segment("plain ")]), tail) == render([Segment("plain "), *tail])
+    assert render_after(render([Segment("plain")]), [Segment(" text")]) == ("plain text", None)
+
+
+def test_render_after_shifts_suffix_entities() -> None:
+    head = [Segment("Unknown timezone: ")]
+    middle = [Segment("Mars/Olympus_Mons🙂", code=True)]
+    tail = [Segment("\nTry "), Segment("UTC", code=True), Segment(".")]
+
+    assert render_after(render(head), middle, render(tail)) == render([*head, *middle, *tail])
+
+
+def test_utf16_len_counts_surrogate_pairs() -> None:
+    assert utf16_len("") == 0
+    assert utf16_len("plain") == 5
+    assert utf16_len("é") == 1
+    assert utf16_len("🙂x") == 3
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime, timezone
 
 import pytest
 
-from scheduler.timing import calculate_next_run, parse_time_string, validate_schedule_pattern
+from scheduler.timing import (
+    calculate_next_run,
+    compile_pattern_json,
+    iter_next_runs,
+    iter_runs,
+    parse_time_string,
+    validate_schedule_pattern,
+)
 
 
 def test_parse_time_string_valid() -> None:
     assert parse_time_string("09:00") == (9, 0)
     assert parse_time_string("23:59") == (23, 59)
     assert parse_time_string("0:5") == (0, 5)
+    assert parse_time_string(" 07:05 ") == (7, 5)
 
 
 def test_parse_time_string_invalid() -> None:
@@ -18,6 +27,8 @@ def test_parse_time_string_invalid() -> None:
     assert parse_time_string("abc") is None
     assert parse_time_string("24:00") is None
     assert parse_time_string("12:60") is None
+    assert parse_time_string("1a:00") is None
+    assert parse_time_string("12-30") is None
 
 
 def test_validate_schedule_pattern_interval_requires_positive() -> None:
@@ -31,69 +42,97 @@ def test_validate_schedule_pattern_interval_requires_positive() -> None:
     assert ok is True
 
 
-def test_calculate_next_run_interval() -> None:
-    schedule = {"pattern": {"type": "interval", "hours": 2}, "timezone": "UTC"}
-    after = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
-    assert calculate_next_run(schedule, after=after) == datetime(2026, 1, 1, 14, 0, tzinfo=timezone.utc)
-
-
-def test_calculate_next_run_daily_today_future() -> None:
-    schedule = {"pattern": {"type": "daily", "times": ["09:00", "16:00"]}, "timezone": "UTC"}
-    after = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
-    assert calculate_next_run(schedule, after=after) == datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
-
-
-def test_calculate_next_run_daily_rollover() -> None:
-    schedule = {"pattern": {"type": "daily", "times": ["09:00", "16:00"]}, "timezone": "UTC"}
-    after = datetime(2026, 1, 1, 17, 0, tzinfo=timezone.utc)
-    assert calculate_next_run(schedule, after=after) == datetime(2026, 1, 2, 9, 0, tzinfo=timezone.utc)
-
+_UTC = timezone.utc
+_DAILY_9_16 = {"type": "daily", "times": ["09:00", "16:00"]}
+_WEEKLY_MON_WED = {"type": "weekly", "days": ["monday", "wednesday"], "times": ["12:00"]}
+
+
+@pytest.mark.parametrize(
+    ("pattern", "tz", "after", "expected"),
+    [
+        ({"type": "interval", "hours": 2}, "UTC", datetime(2026, 1, 1, 12, 0, tzinfo=_UTC), datetime(2026, 1, 1, 14, 0, tzinfo=_UTC)),
+        (_DAILY_9_16, "UTC", datetime(2026, 1, 1, 8, 0, tzinfo=_UTC), datetime(2026, 1, 1, 9, 0, tzinfo=_UTC)),
+        (_DAILY_9_16, "UTC", datetime(2026, 1, 1, 17, 0, tzinfo=_UTC), datetime(2026, 1, 2, 9, 0, tzinfo=_UTC)),
+        # Monday 11:00 -> Monday 12:00 (2024-01-01 is a Monday).
+        (_WEEKLY_MON_WED, "UTC", datetime(2024, 1, 1, 11, 0, tzinfo=_UTC), datetime(2024, 1, 1, 12, 0, tzinfo=_UTC)),
+        # Monday 12:00 (exact) -> Wednesday 12:00 (strictly after).
+        (_WEEKLY_MON_WED, "UTC", datetime(2024, 1, 1, 12, 0, tzinfo=_UTC), datetime(2024, 1, 3, 12, 0, tzinfo=_UTC)),
+        # Daily schedules stay anchored to local time across DST. Before EU DST
+        # starts (CET, UTC+1) the next 09:00 local falls on the CEST day: 07:00 UTC.
+        ({"type": "daily", "times": ["09:00"]}, "Europe/Amsterdam", datetime(2026, 3, 28, 12, 0, tzinfo=_UTC), datetime(2026, 3, 29, 7, 0, tzinfo=_UTC)),
+        # Before EU DST ends (CEST, UTC+2): the next day is CET again.
+        ({"type": "daily", "times": ["09:00"]}, "Europe/Amsterdam", datetime(2026, 10, 24, 12, 0, tzinfo=_UTC), datetime(2026, 10, 25, 8, 0, tzinfo=_UTC)),
+        # EU DST start day 2026-03-29: local time jumps 02:00 -> 03:00, so 02:30 doesn't
+        # exist; the nonexistent time resolves to the next valid instant (~03:30 local).
+        ({"type": "daily", "times": ["02:30"]}, "Europe/Amsterdam", datetime(2026, 3, 29, 0, 0, tzinfo=_UTC), datetime(2026, 3, 29, 1, 30, tzinfo=_UTC)),
+    ],
+    ids=[
+        "interval",
+        "daily_today_future",
+        "daily_rollover",
+        "weekly_same_day",
+        "weekly_exact_slot_moves_on",
+        "daily_dst_start_europe_amsterdam",
+        "daily_dst_end_europe_amsterdam",
+        "daily_dst_gap_europe_amsterdam",
+    ],
+)
+def test_calculate_next_run(pattern: dict, tz: str, after: datetime, expected: datetime) -> None:
+    schedule = {"pattern": pattern, "timezone": tz}
+    assert calculate_next_run(schedule, after=after) == expected
 
-def test_calculate_next_run_weekly() -> None:
-    schedule = {
-        "pattern": {"type": "weekly", "days": ["monday", "wednesday"], "times": ["12:00"]},
-        "timezone": "UTC",
-    }
-    # Monday 11:00 -> Monday 12:00
-    after = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)  # Monday
-    assert calculate_next_run(schedule, after=after) == datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
 
-    # Monday 12:00 (exact) -> Wednesday 12:00 (strictly after)
-    after2 = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
-    assert calculate_next_run(schedule, after=after2) == datetime(2024, 1, 3, 12, 0, tzinfo=timezone.utc)
+def test_validate_custom_is_rejected() -> None:
+    ok, _ = validate_schedule_pattern({"type": "custom", "cron": "0 */2 * * *"})
+    assert ok is False
 
 
-def test_calculate_next_run_daily_timezone_dst_shift_europe_amsterdam() -> None:
-    """Daily schedules should stay anchored to local time across DST."""
-    schedule = {"pattern": {"type": "daily", "times": ["09:00"]}, "timezone": "Europe/Amsterdam"}
+def test_calculate_next_run_rejects_custom() -> None:
+    schedule = {"pattern": {"type": "custom", "cron": "0 */2 * * *"}, "timezone": "UTC"}
+    after = datetime(2026, 1, 1, 0, 0, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        _ = calculate_next_run(schedule, after=after)
 
-    # Before EU DST starts (CET, UTC+1): 09:00 local == 08:00 UTC.
-    after_winter = datetime(2026, 3, 28, 12, 0, tzinfo=timezone.utc)
-    assert calculate_next_run(schedule, after=after_winter) == datetime(2026, 3, 29, 7, 0, tzinfo=timezone.utc)
 
-    # Before EU DST ends (CEST, UTC+2): next day may be CET again.
-    after_summer = datetime(2026, 10, 24, 12, 0, tzinfo=timezone.utc)
-    assert calculate_next_run(schedule, after=after_summer) == datetime(2026, 10, 25, 8, 0, tzinfo=timezone.utc)
+def test_iter_next_runs_matches_chained_calculate_next_run() -> None:
+    after = datetime(2026, 3, 27, 12, 0, tzinfo=timezone.utc)
+    schedules = [
+        {"pattern": {"type": "interval", "hours": 1, "minutes": 30}, "timezone": "UTC"},
+        {"pattern": {"type": "daily", "times": ["09:00", "18:30"]}, "timezone": "Europe/Amsterdam"},
+        {"pattern": {"type": "weekly", "days": ["monday", "friday"], "times": ["08:00"]}, "timezone": "UTC"},
+    ]
+    for schedule in schedules:
+        expected = []
+        cursor = after
+        for _ in range(6):
+            cursor = calculate_next_run(schedule, after=cursor)
+            expected.append(cursor)
+        assert iter_next_runs(schedule, after=after, count=6) == expected
 
 
-def test_calculate_next_run_daily_dst_gap_is_handled_europe_amsterdam() -> None:
-    """Nonexistent local times (spring-forward gap) should schedule to the next valid instant."""
-    schedule = {"pattern": {"type": "daily", "times": ["02:30"]}, "timezone": "Europe/Amsterdam"}
+def test_iter_next_runs_zero_count_is_empty() -> None:
+    schedule = {"pattern": {"type": "interval", "hours": 2}, "timezone": "UTC"}
+    assert iter_next_runs(schedule, count=0) == []
 
-    # EU DST start day 2026-03-29: local time jumps 02:00 -> 03:00, so 02:30 doesn't exist.
-    # The implementation returns a UTC instant that corresponds to ~03:30 local time.
-    after = datetime(2026, 3, 29, 0, 0, tzinfo=timezone.utc)
-    assert calculate_next_run(schedule, after=after) == datetime(2026, 3, 29, 1, 30, tzinfo=timezone.utc)
 
+def test_iter_runs_is_lazy_and_matches_iter_next_runs() -> None:
+    after = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    schedule = {"pattern": {"type": "weekly", "days": ["monday", "friday"], "times": ["09:00", "18:30"]}, "timezone": "Europe/Berlin"}
+    runs = iter_runs(schedule, after=after)
+    assert [next(runs) for _ in range(5)] == iter_next_runs(schedule, after=after, count=5)
 
-def test_validate_custom_is_rejected() -> None:
-    ok, _ = validate_schedule_pattern({"type": "custom", "cron": "0 */2 * * *"})
-    assert ok is False
+    with pytest.raises(ValueError):
+        iter_runs({"pattern": {"type": "daily", "times": []}}, after=after)
 
 
-def test_calculate_next_run_rejects_custom() -> None:
-    schedule = {"pattern": {"type": "custom", "cron": "0 */2 * * *"}, "timezone": "UTC"}
-    after = datetime(2026, 1, 1, 0, 0, tzinfo=timezone.utc)
-    with pytest.raises(ValueError):
-        _ = calculate_next_run(schedule, after=after)
+def test_compile_pattern_json_is_memoized_and_matches_calculate_next_run() -> None:
+    pattern = {"type": "weekly", "days": ["sunday", "wednesday"], "times": ["23:30", "07:15"]}
+    key = json.dumps(pattern, sort_keys=True)
+    compiled = compile_pattern_json(key, "America/New_York")
+    assert compiled is compile_pattern_json(key, "America/New_York")
+    assert compiled.day_mask == (1 << 6) | (1 << 2)
+    assert compiled.times == ((7, 15), (23, 30))
 
+    after = datetime(2026, 3, 7, 12, 0, tzinfo=timezone.utc)
+    schedule = {"pattern": pattern, "timezone": "America/New_York"}
+    assert compiled.next_after(after) == calculate_next_run(schedule, after=after)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from bot import PerChatUpdateProcessor
+
+
+@dataclass
+class _FakeChat:
+    id: int
+
+
+@dataclass
+class _FakeUpdate:
+    effective_chat: _FakeChat | None = None
+    effective_user: object | None = None
+
+
+@pytest.mark.asyncio
+async def test_per_chat_processor_orders_within_chat_and_overlaps_across_chats() -> None:
+    processor = PerChatUpdateProcessor(8)
+    events: list[str] = []
+    release_a1 = asyncio.Event()
+
+    async def handle(name: str, gate: asyncio.Event | None = None) -> None:
+        events.append(f"start {name}")
+        if gate is not None:
+            await gate.wait()
+        events.append(f"end {name}")
+
+    chat_a, chat_b = _FakeUpdate(_FakeChat(1)), _FakeUpdate(_FakeChat(2))
+    tasks = [
+        asyncio.create_task(processor.process_update(chat_a, handle("a1", release_a1))),
+        asyncio.create_task(processor.process_update(chat_a, handle("a2"))),
+        asyncio.create_task(processor.process_update(chat_b, handle("b1"))),
+    ]
+    await asyncio.sleep(0.01)
+    # a1 is blocked: a2 waits behind it, b1 is not held up.
+    assert "end b1" in events
+    assert "start a2" not in events
+
+    release_a1.set()
+    await asyncio.gather(*tasks)
+    assert events.index("end a1") < events.index("start a2")
+    assert processor._chat_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_per_chat_processor_flooding_chat_does_not_starve_other_chats() -> None:
+    processor = PerChatUpdateProcessor(2)
+    release_a = asyncio.Event()
+    done: list[str] = []
+
+    async def handle(name: str, gate: asyncio.Event | None = None) -> None:
+        if gate is not None:
+            await gate.wait()
+        done.append(name)
+
+    chat_a, chat_b = _FakeUpdate(_FakeChat(1)), _FakeUpdate(_FakeChat(2))
+    # More queued chat-A updates than the processor's concurrency cap.
+    tasks = [asyncio.create_task(processor.process_update(chat_a, handle(f"a{i}", release_a))) for i in range(4)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(processor.process_update(chat_b, handle("b1"))))
+
+    await asyncio.wait_for(tasks[-1], timeout=1)
+    assert done == ["b1"]
+
+    release_a.set()
+    await asyncio.gather(*tasks)
+    assert done == ["b1", "a0", "a1", "a2", "a3"]
+    assert processor._chat_locks == {}
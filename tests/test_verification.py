@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+from handlers import verification
+
+
+class _FakeChat:
+    def __init__(self, chat_id: int) -> None:
+        self.id = chat_id
+
+
+class _FakeBot:
+    def __init__(self) -> None:
+        self.lookups: list[str] = []
+
+    async def get_chat(self, raw: str) -> _FakeChat:
+        self.lookups.append(raw)
+        if raw == "@known":
+            return _FakeChat(-100777)
+        raise ValueError("chat not found")
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.bot = _FakeBot()
+
+
+def test_code_candidates_dedups_in_order_and_caps() -> None:
+    a, b = "a" * 15, "b" * 20
+    assert verification._code_candidates(f"{a} {b} {a} short") == [a, b]
+    assert verification._code_candidates("x" * 14) == []
+
+    many = " ".join(str(i) * 15 for i in range(10, 40))
+    assert len(verification._code_candidates(many)) == 10
+
+
+def test_iter_code_tokens_matches_regex_scan() -> None:
+    samples = [
+        "code: Abcdefghij_klmnopqrstu12, thanks!",
+        "x" * 150 + " " + "y" * 14,
+        "привет Abcdefghij_klmnopqrstu12 ok",
+        "",
+    ]
+    for text in samples:
+        expected = [m.group(0) for m in verification._CODE_CANDIDATE_RE.finditer(text)]
+        assert list(verification._iter_code_tokens(text)) == expected
+
+
+@pytest.mark.asyncio
+async def test_resolve_channel_id_numeric_and_malformed_inputs() -> None:
+    context = _FakeContext()
+
+    assert await verification.resolve_channel_id(context, " -1001234567890 ") == "-1001234567890"  # type: ignore[arg-type]
+    assert await verification.resolve_channel_id(context, "@known") == "-100777"  # type: ignore[arg-type]
+    assert context.bot.lookups == ["@known"]
+
+    # Not integers: fall through to get_chat (which fails) instead of raising.
+    for raw in ("--5", "\u00b2", "-"):
+        assert await verification.resolve_channel_id(context, raw) is None  # type: ignore[arg-type]
+    assert context.bot.lookups == ["@known", "--5", "\u00b2", "-"]